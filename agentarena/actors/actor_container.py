@@ -13,8 +13,12 @@ from agentarena.actors.models import Strategy
 from agentarena.actors.models import StrategyCreate
 from agentarena.actors.models import StrategyPrompt
 from agentarena.actors.models import StrategyPromptCreate
+from agentarena.actors.services.agent_catalog import AgentCatalog
+from agentarena.actors.services.breaker_service import BreakerService
+from agentarena.actors.services.heartbeat_service import HeartbeatService
 from agentarena.actors.services.template_service import TemplateService
 from agentarena.clients.message_broker import MessageBroker
+from agentarena.clients.message_broker import ReconnectListeners
 from agentarena.clients.message_broker import get_message_broker_connection
 from agentarena.core.factories.db_factory import get_engine
 from agentarena.core.factories.environment_factory import get_project_root
@@ -57,10 +61,16 @@ class ActorContainer(containers.DeclarativeContainer):
         logger_levels=config.actor.logging.loggers,
     )
 
+    reconnect_listeners = providers.Singleton(
+        ReconnectListeners,
+        logging=logging,
+    )
+
     message_broker_connection = providers.Resource(
         get_message_broker_connection,
         config.messagebroker.url,
         logging,
+        reconnect_listeners,
     )
 
     uuid_service = providers.Singleton(
@@ -74,6 +84,7 @@ class ActorContainer(containers.DeclarativeContainer):
         client=message_broker_connection,
         uuid_service=uuid_service,
         logging=logging,
+        reconnect_listeners=reconnect_listeners,
     )
 
     db_service = providers.Singleton(
@@ -137,6 +148,9 @@ class ActorContainer(containers.DeclarativeContainer):
         message_broker=message_broker,
         uuid_service=uuid_service,
         logging=logging,
+        hedging=config.actor.hedging,
+        streaming=config.actor.streaming,
+        conversations=config.actor.conversations,
     )
 
     llmmodelpricing_service = providers.Singleton(
@@ -159,10 +173,34 @@ class ActorContainer(containers.DeclarativeContainer):
         logging=logging,
     )
 
+    breaker_service = providers.Singleton(
+        BreakerService,
+        logging=logging,
+        breakers=config.actor.breakers,
+    )
+
+    agent_catalog = providers.Singleton(
+        AgentCatalog,
+        agent_service=agent_service,
+        logging=logging,
+    )
+
+    heartbeat_service = providers.Singleton(
+        HeartbeatService,
+        agent_catalog=agent_catalog,
+        uuid_service=uuid_service,
+        logging=logging,
+        heartbeat=config.actor.heartbeat,
+    )
+
     template_service = providers.Singleton(
         TemplateService,
         strategy_service=strategy_service,
         logging=logging,
+        projectroot=projectroot,
+        cache_dir=config.actor.templates.cache_dir,
+        preload=config.actor.templates.preload,
+        compaction=config.actor.compaction,
     )
 
     # Controllers
@@ -176,6 +214,8 @@ class ActorContainer(containers.DeclarativeContainer):
         template_service=template_service,
         uuid_service=uuid_service,
         logging=logging,
+        breaker_service=breaker_service,
+        agent_catalog=agent_catalog,
     )
 
     generatejob_controller = providers.Singleton(
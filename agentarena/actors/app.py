@@ -51,6 +51,15 @@ async def startup_event():
     broker = await container.message_broker()  # type: ignore
     agent_controller = await container.agent_controller()  # type: ignore
     await agent_controller.subscribe_yourself(broker)
+    template_service = await container.template_service()  # type: ignore
+    await template_service.subscribe_yourself(broker)
+    agent_catalog = await container.agent_catalog()  # type: ignore
+    await agent_catalog.subscribe_yourself(broker)
+    with db.get_session() as session:
+        template_service.warm_prompts(session)
+        agent_catalog.load(session)
+    heartbeat_service = await container.heartbeat_service()  # type: ignore
+    heartbeat_service.start(broker)
 
     # Setup routers after all dependencies are initialized
     await setup_routers()
@@ -60,8 +69,14 @@ async def startup_event():
 
 async def shutdown_event():
     """Shutdown resources on application stop."""
+    heartbeat_service = await container.heartbeat_service()  # type: ignore
+    await heartbeat_service.stop()
     controller = await container.agent_controller()  # type: ignore
     await controller.unsubscribe_yourself()
+    template_service = await container.template_service()  # type: ignore
+    await template_service.unsubscribe_yourself()
+    agent_catalog = await container.agent_catalog()  # type: ignore
+    await agent_catalog.unsubscribe_yourself()
     await container.shutdown_resources()  # type: ignore
 
 
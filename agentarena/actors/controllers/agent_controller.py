@@ -10,12 +10,13 @@ from fastapi import Response
 from nats.aio.msg import Msg
 from sqlmodel import Field
 from sqlmodel import Session
-from sqlmodel import select
 
 from agentarena.actors.models import Agent
 from agentarena.actors.models import AgentCreate
 from agentarena.actors.models import AgentPublic
 from agentarena.actors.models import AgentUpdate
+from agentarena.actors.services.agent_catalog import AgentCatalog
+from agentarena.actors.services.breaker_service import BreakerService
 from agentarena.actors.services.template_service import TemplateService
 from agentarena.clients.message_broker import MessageBroker
 from agentarena.core.controllers.model_controller import ModelController
@@ -23,6 +24,7 @@ from agentarena.core.exceptions import TemplateDataException
 from agentarena.core.exceptions import TemplateRenderingException
 from agentarena.core.factories.logger_factory import ILogger
 from agentarena.core.factories.logger_factory import LoggingService
+from agentarena.core.services.conversation_store import ConversationTurn
 from agentarena.core.services.llm_service import LLMService
 from agentarena.core.services.model_service import ModelService
 from agentarena.core.services.subscribing_service import SubscribingService
@@ -67,6 +69,8 @@ class AgentController(
         template_service: TemplateService = Field(),
         uuid_service: UUIDService = Field(description="UUID Service"),
         logging: LoggingService = Field(description="Logger factory"),
+        breaker_service: BreakerService = Field(description="Breaker Service"),
+        agent_catalog: AgentCatalog = Field(description="Agent Catalog"),
     ):
         super().__init__(
             base_path=base_path,
@@ -89,6 +93,8 @@ class AgentController(
         self.message_broker = message_broker
         self.template_service = template_service
         self.uuid_service = uuid_service
+        self.breaker_service = breaker_service
+        self.agent_catalog = agent_catalog
 
     async def healthcheck_message(self, msg: Msg) -> None:
         """
@@ -110,9 +116,7 @@ class AgentController(
             await self.message_broker.publish_response(channel, response)  # type: ignore
 
     async def healthcheck(self, participant_id: str, session: Session) -> JobResponse:
-        stmt = select(Agent).where(Agent.participant_id == participant_id)
-
-        agent = session.exec(stmt).one_or_none()
+        agent = self.agent_catalog.get(participant_id, session)
 
         uuid = self.uuid_service.make_id()
         self.log.info(
@@ -158,10 +162,9 @@ class AgentController(
         ),
         session: Session,
     ) -> Response:
-        stmt = select(Agent).where(Agent.participant_id == agent_id)
         log = self.log.bind(participant_id=agent_id, job_id=job_id)
         log.debug("agent_prompt", req=req)
-        agent = session.exec(stmt).one_or_none()
+        agent = self.agent_catalog.get(agent_id, session)
         if not agent:
             self.log.error(
                 "no such agent with participant_id",
@@ -293,11 +296,13 @@ class AgentController(
         if job_id == "":
             job_id = self.uuid_service.make_id()
 
-        stmt = select(Agent).where(Agent.participant_id == participant_id)
-        agent = session.exec(stmt).one_or_none()
+        agent = self.agent_catalog.get(participant_id, session)
         log = self.log.bind(job=job_id, cmd=req.command, participant=participant_id)
         response = None
+        headers = None
         job = None
+        prefix_length = 0
+        conversation = None
         if agent is None:
             log.info("No such agent")
             response = JobResponse(
@@ -305,27 +310,73 @@ class AgentController(
                 message=f"no such responder: {participant_id}",
                 job_id=job_id,
             )
+        elif not self.breaker_service.allow_participant(participant_id):
+            log.warn("Participant breaker is open")
+            response = JobResponse(
+                state=JobResponseState.FAIL,
+                message=f"circuit open for responder: {participant_id}",
+                job_id=job_id,
+            )
         else:
-            job = await self.make_generate_job(agent, job_id, req, session, log)
-
-        if job:
-            req.command = prompt_type
-            gen_job = await self.llm_service.execute_job(job.id, session)
-            if not gen_job or gen_job.state != JobState.COMPLETE:
-                log.error("Error executing job", gen_job=gen_job)
+            model = None
+            success = False
+            no_model = False
+            try:
+                parts = await self.template_service.expand_prompt_parts(
+                    agent, job_id, req, session
+                )
+                prefix_length = len(parts.prefix)
+                if prefix_length:
+                    conversation = self.conversation_turn(agent, req)
+                model = self.choose_model(agent, req, session, log)
+                no_model = model is None
+                if model:
+                    job = await self.make_generate_job(
+                        agent, job_id, req, session, log, model, prompt=parts.text
+                    )
+                if job:
+                    req.command = prompt_type
+                    gen_job = await self.llm_service.execute_job(
+                        job.id,
+                        session,
+                        prefix_length=prefix_length,
+                        conversation=conversation,
+                    )
+                    success = (
+                        gen_job is not None
+                        and gen_job.state == JobState.COMPLETE
+                        and bool(gen_job.generated)
+                    )
+                    if not gen_job or gen_job.state != JobState.COMPLETE:
+                        log.error("Error executing job", gen_job=gen_job)
+                        response = JobResponse(
+                            state=JobResponseState.FAIL,
+                            message="Error executing job",
+                            job_id=job_id,
+                        )
+                    else:
+                        log.info("Job completed", gen_job=gen_job)
+                        response = JobResponse(
+                            state=JobResponseState.COMPLETE,
+                            data=gen_job.generated,
+                            job_id=job_id,
+                        )
+                        # lets the arena track latency per model
+                        headers = {"model": gen_job.model}
+            except Exception as e:
+                log.error("Error running job", error=e)
                 response = JobResponse(
                     state=JobResponseState.FAIL,
-                    message="Error executing job",
+                    message=f"Error running job: {e}",
                     job_id=job_id,
                 )
+            # always settle the breakers, or a half-open trial never ends
+            if no_model:
+                # the models' breakers are open, not the participant's fault
+                self.breaker_service.release(participant_id)
             else:
+                self.breaker_service.record(participant_id, model, success)
 
-                log.info("Job completed", gen_job=gen_job)
-                response = JobResponse(
-                    state=JobResponseState.COMPLETE,
-                    data=gen_job.generated,
-                    job_id=job_id,
-                )
         if not response:
             log.warn("Error creating job")
             response = JobResponse(
@@ -334,7 +385,53 @@ class AgentController(
                 job_id=job_id,
             )
         session.commit()
-        await self.message_broker.publish_response(channel, response)
+        await self.message_broker.publish_response(channel, response, headers=headers)
+
+    def conversation_turn(
+        self,
+        agent: Agent,
+        req: (
+            ParticipantContestRequest
+            | ParticipantContestRoundRequest
+            | ParticipantActionRequest
+        ),
+    ) -> Optional[ConversationTurn]:
+        """
+        The conversation turn for agents in conversation mode, one conversation
+        per contest and prompt type, advancing by round.
+        """
+        contest = getattr(req.data, "contest", None)
+        if not agent.conversation or not contest or not contest.rounds:
+            return None
+        return ConversationTurn(
+            key=f"{agent.id}.{contest.id}.{req.command.value}",
+            round_no=contest.rounds[-1].round_no,
+        )
+
+    def choose_model(
+        self,
+        agent: Agent,
+        req: (
+            ParticipantContestRequest
+            | ParticipantContestRoundRequest
+            | ParticipantActionRequest
+        ),
+        session: Session,
+        log: ILogger,
+    ) -> Optional[str]:
+        """
+        The model for the request, or a fallback while its breaker is open.
+        """
+        # Use model override if provided in the request
+        model_override = getattr(req, "model", None)
+        model_to_use = model_override if model_override else agent.model
+        # breakers are keyed by model key, so aliases share state with fallbacks
+        model_to_use = self.breaker_service.choose_model(
+            self.llm_service.resolve_model(model_to_use), session
+        )
+        if not model_to_use:
+            log.error("No healthy model available")
+        return model_to_use
 
     async def make_generate_job(
         self,
@@ -347,16 +444,16 @@ class AgentController(
         ),
         session: Session,
         log: ILogger,
+        model: str,
+        prompt: Optional[str] = None,
     ) -> Optional[GenerateJob]:
-        prompt = await self.template_service.expand_prompt(agent, job_id, req, session)
+        if prompt is None:
+            prompt = await self.template_service.expand_prompt(
+                agent, job_id, req, session
+            )
         prompt_type = req.command
         self.log.debug(f"prompt:\n{prompt}", command=prompt_type.value)
-        # Use model override if provided in the request
-        model_override = getattr(req, "model", None)
-        model_to_use = model_override if model_override else agent.model
-        gc = self.llm_service.make_generate_job(
-            job_id, model_to_use, prompt, prompt_type
-        )
+        gc = self.llm_service.make_generate_job(job_id, model, prompt, prompt_type)
         job, response = await self.job_service.create(gc, session)
         if not response.success or not job:
             self.log.error("error", response=response)
@@ -13,6 +13,8 @@ from agentarena.actors.models import Strategy
 from agentarena.actors.models import StrategyCreate
 from agentarena.actors.models import StrategyPrompt
 from agentarena.actors.models import StrategyPromptCreate
+from agentarena.actors.services.agent_catalog import AgentCatalog
+from agentarena.actors.services.breaker_service import BreakerService
 from agentarena.actors.services.template_service import TemplateService
 from agentarena.core.factories.db_factory import get_engine
 from agentarena.core.factories.environment_factory import get_project_root
@@ -21,7 +23,10 @@ from agentarena.core.services.db_service import DbService
 from agentarena.core.services.llm_service import LLMService
 from agentarena.core.services.model_service import ModelService
 from agentarena.core.services.uuid_service import UUIDService
+from agentarena.models.constants import BreakerState
 from agentarena.models.constants import ContestRoundState
+from agentarena.models.constants import JobResponseState
+from agentarena.models.constants import JobState
 from agentarena.models.constants import PromptType
 from agentarena.models.constants import RoleType
 from agentarena.models.job import GenerateJob
@@ -130,6 +135,16 @@ def logging():
     return LoggingService(True)
 
 
+@pytest.fixture
+def breaker_service(logging):
+    return BreakerService(logging=logging)
+
+
+@pytest.fixture
+def agent_catalog(agent_service, logging):
+    return AgentCatalog(agent_service=agent_service, logging=logging)
+
+
 @pytest.fixture
 def agent_ctrl(
     agent_service,
@@ -139,6 +154,8 @@ def agent_ctrl(
     llm_service,
     job_service,
     logging,
+    breaker_service,
+    agent_catalog,
 ):
     return AgentController(
         agent_service=agent_service,
@@ -148,6 +165,8 @@ def agent_ctrl(
         llm_service=llm_service,
         job_service=job_service,
         logging=logging,
+        breaker_service=breaker_service,
+        agent_catalog=agent_catalog,
     )
 
 
@@ -241,3 +260,126 @@ async def test_generate_feature(
             session,
         )
         assert message_broker.publish_response.call_count == 1
+
+
+def features_request():
+    return ParticipantContestRequest(
+        command=PromptType.ARENA_GENERATE_FEATURES,
+        data=ContestRequestPayload(
+            contest=ContestPublic(
+                arena=ArenaPublic(
+                    id="arena-test-1",
+                    name="Test Arena",
+                    description="",
+                    height=10,
+                    width=10,
+                    rules="",
+                    winning_condition="",
+                ),
+                rounds=[],
+                auto_advance=False,
+                end_time=0,
+                start_time=0,
+            )
+        ),
+        message="test",
+    )
+
+
+async def make_arena_agent(agent_ctrl, strategy_ctrl, session):
+    sc = StrategyCreate(
+        name="Simple Arena",
+        personality="straightforward arena",
+        description="A proving ground for tests and trials",
+        role=RoleType.ARENA,
+        prompts=[
+            StrategyPromptCreate(
+                key=PromptType.ARENA_GENERATE_FEATURES, prompt="Make some features"
+            )
+        ],
+    )
+    strategy = await strategy_ctrl.create_strategy(sc, session)
+    session.flush()
+    ac = AgentCreate(
+        name="Captain Arena", participant_id="external-1", strategy_id=strategy.id
+    )
+    agent = await agent_ctrl.create_model(ac, session)
+    session.commit()
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_provider_error_records_breaker_failure(
+    agent_ctrl, strategy_ctrl, db_service, message_broker, logging
+):
+    agent_ctrl.breaker_service = BreakerService(
+        logging=logging, breakers={"failure_threshold": 1}
+    )
+    agent_ctrl.llm_service.execute_job = AsyncMock(
+        side_effect=RuntimeError("provider down")
+    )
+
+    with db_service.get_session() as session:
+        agent = await make_arena_agent(agent_ctrl, strategy_ctrl, session)
+        model = agent_ctrl.llm_service.resolve_model(agent.model)
+
+        await agent_ctrl.agent_request(
+            "external-1",
+            "job-1",
+            PromptType.ARENA_GENERATE_FEATURES,
+            features_request(),
+            "test.arena_generate_features",
+            session,
+        )
+
+    response = message_broker.publish_response.call_args.args[1]
+    assert response.state == JobResponseState.FAIL
+    breakers = agent_ctrl.breaker_service
+    assert breakers.model_breaker(model).state == BreakerState.OPEN
+    assert breakers.participant_breaker("external-1").state == BreakerState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_failing_model_falls_back(
+    agent_ctrl, strategy_ctrl, db_service, message_broker, logging
+):
+    agent_ctrl.breaker_service = BreakerService(
+        logging=logging,
+        breakers={"failure_threshold": 2, "fallback": ["fallback-model"]},
+    )
+    used = []
+
+    async def execute_job(gen_id, session, **kwargs):
+        job = session.get(GenerateJob, gen_id)
+        used.append(job.model)
+        if job.model == "fallback-model":
+            job.state = JobState.COMPLETE
+            job.generated = "features"
+        else:
+            job.state = JobState.FAIL
+        return job
+
+    agent_ctrl.llm_service.execute_job = execute_job
+
+    with db_service.get_session() as session:
+        agent = await make_arena_agent(agent_ctrl, strategy_ctrl, session)
+        model = agent_ctrl.llm_service.resolve_model(agent.model)
+
+        states = []
+        for n in range(3):
+            await agent_ctrl.agent_request(
+                "external-1",
+                f"job-{n}",
+                PromptType.ARENA_GENERATE_FEATURES,
+                features_request(),
+                "test.arena_generate_features",
+                session,
+            )
+            states.append(message_broker.publish_response.call_args.args[1].state)
+
+    assert used == [model, model, "fallback-model"]
+    assert states == [
+        JobResponseState.FAIL,
+        JobResponseState.FAIL,
+        JobResponseState.COMPLETE,
+    ]
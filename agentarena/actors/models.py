@@ -22,6 +22,10 @@ class AgentBase(SQLModel, table=False):
     Maps to the AGENT_CONFIG entity in the ER diagram.
     """
 
+    conversation: bool = Field(
+        default=False,
+        description="Keep an LLM conversation per contest, sending only new rounds",
+    )
     model: str = Field(
         default=constants.DEFAULT_AGENT_MODEL,
         description="LLM model name or alias",
@@ -55,6 +59,10 @@ class AgentCreate(AgentBase, table=False):
 
 
 class AgentUpdate(SQLModel, table=False):
+    conversation: Optional[bool] = Field(
+        default=None,
+        description="Keep an LLM conversation per contest, sending only new rounds",
+    )
     participant_id: Optional[str] = Field(
         default=None,
         foreign_key="participant.id",
@@ -0,0 +1,135 @@
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from nats.aio.msg import Msg
+from sqlmodel import Session
+from sqlmodel import select
+
+from agentarena.actors.models import Agent
+from agentarena.actors.models import AgentCreate
+from agentarena.actors.models import Strategy
+from agentarena.clients.message_broker import MessageBroker
+from agentarena.core.factories.logger_factory import LoggingService
+from agentarena.core.services.model_service import ModelService
+from agentarena.core.services.subscribing_service import SubscribingService
+
+
+def detach(agent: Agent) -> Agent:
+    """
+    Copy an agent and its strategy out of the session, so the copy can be
+    read after the session is closed.
+    """
+    copy = Agent.model_validate(agent.model_dump())
+    if agent.strategy:
+        copy.strategy = Strategy.model_validate(agent.strategy.model_dump())
+    return copy
+
+
+class AgentCatalog(SubscribingService):
+    """
+    In-memory copy of the agents and their strategies, by participant_id.
+
+    Each actor node keeps its own catalog, loaded at startup and kept current
+    from the sys.actor.agent and sys.actor.strategy change events. The whole
+    catalog is reloaded when the broker reconnects, since events may have been
+    missed while disconnected. Lookups for unknown participants fall through
+    to the database.
+    """
+
+    def __init__(
+        self,
+        agent_service: ModelService[Agent, AgentCreate],
+        logging: LoggingService,
+    ):
+        self.agent_service = agent_service
+        self.log = logging.get_logger("service")
+        self.agents: Dict[str, Agent] = {}
+        self.participants: Dict[str, str] = {}
+        to_subscribe = [
+            ("sys.actor.agent.>", self.agent_changed),
+            ("sys.actor.strategy.>", self.strategy_changed),
+        ]
+        SubscribingService.__init__(self, to_subscribe, self.log)
+
+    async def subscribe_yourself(self, message_broker: MessageBroker):
+        await super().subscribe_yourself(message_broker)
+        message_broker.add_reconnect_listener(self.resync)
+
+    def load(self, session: Session) -> int:
+        """
+        Replace the catalog with every agent in the database.
+        """
+        self.agents.clear()
+        self.participants.clear()
+        for agent in session.exec(select(Agent)).all():
+            self.put(agent)
+        self.log.info("Loaded agent catalog", ct=len(self.agents))
+        return len(self.agents)
+
+    async def resync(self):
+        with self.agent_service.get_session() as session:
+            self.load(session)
+
+    def put(self, agent: Agent) -> Agent:
+        self.remove(agent.id)
+        copy = detach(agent)
+        self.agents[copy.id] = copy
+        self.participants[copy.participant_id] = copy.id
+        return copy
+
+    def remove(self, agent_id: str):
+        agent = self.agents.pop(agent_id, None)
+        if agent and self.participants.get(agent.participant_id) == agent_id:
+            del self.participants[agent.participant_id]
+
+    def get(self, participant_id: str, session: Session) -> Optional[Agent]:
+        """
+        The agent for a participant, from the catalog if it is there.
+        """
+        agent_id = self.participants.get(participant_id)
+        if agent_id:
+            return self.agents[agent_id]
+        stmt = select(Agent).where(Agent.participant_id == participant_id)
+        agent = session.exec(stmt).one_or_none()
+        return self.put(agent) if agent else None
+
+    def by_strategy(self, strategy_id: str) -> List[str]:
+        return [a.id for a in self.agents.values() if a.strategy_id == strategy_id]
+
+    def reload_agents(self, agent_ids: List[str]):
+        with self.agent_service.get_session() as session:
+            for agent_id in agent_ids:
+                agent = session.get(Agent, agent_id)
+                if agent:
+                    self.put(agent)
+                else:
+                    self.remove(agent_id)
+
+    async def agent_changed(self, msg: Msg):
+        """
+        sys.actor.agent.<agent_id>.<action>
+        """
+        parts = msg.subject.split(".")
+        agent_id, action = parts[3], parts[-1]
+        self.log.debug("agent changed", agent_id=agent_id, action=action)
+        if action == "delete":
+            self.remove(agent_id)
+        else:
+            self.reload_agents([agent_id])
+
+    async def strategy_changed(self, msg: Msg):
+        """
+        sys.actor.strategy.<strategy_id>.<action>
+        """
+        parts = msg.subject.split(".")
+        strategy_id, action = parts[3], parts[-1]
+        agent_ids = self.by_strategy(strategy_id)
+        self.log.debug(
+            "strategy changed", strategy_id=strategy_id, action=action, agents=agent_ids
+        )
+        if action == "delete":
+            for agent_id in agent_ids:
+                self.remove(agent_id)
+        else:
+            self.reload_agents(agent_ids)
@@ -0,0 +1,113 @@
+import time
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from sqlmodel import Session
+from sqlmodel import col
+from sqlmodel import select
+
+from agentarena.core.factories.logger_factory import LoggingService
+from agentarena.core.services.circuit_breaker import CircuitBreaker
+from agentarena.models.llm import LlmModel
+from agentarena.models.policies import BreakerPolicy
+
+
+class BreakerService:
+    """
+    Tracks circuit breakers per model and per participant, and picks a
+    healthy model from the fallback chain while a model's breaker is open.
+    """
+
+    def __init__(
+        self,
+        logging: LoggingService,
+        breakers: Optional[Dict[str, Any]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.log = logging.get_logger("service")
+        self.policy = BreakerPolicy.model_validate(breakers or {})
+        self.clock = clock
+        self.models: Dict[str, CircuitBreaker] = {}
+        self.participants: Dict[str, CircuitBreaker] = {}
+
+    def _get_breaker(self, breakers: Dict[str, CircuitBreaker], key: str):
+        if key not in breakers:
+            breakers[key] = CircuitBreaker(self.policy, self.clock)
+        return breakers[key]
+
+    def model_breaker(self, model: str) -> CircuitBreaker:
+        return self._get_breaker(self.models, model)
+
+    def participant_breaker(self, participant_id: str) -> CircuitBreaker:
+        return self._get_breaker(self.participants, participant_id)
+
+    def allow_participant(self, participant_id: str) -> bool:
+        return self.participant_breaker(participant_id).allow()
+
+    def fallback_models(self, session: Session) -> List[str]:
+        """
+        The configured fallback chain, or active models by descending score.
+        """
+        if self.policy.fallback:
+            return self.policy.fallback
+        stmt = (
+            select(LlmModel)
+            .where(LlmModel.active == True)  # noqa: E712
+            .where(LlmModel.score >= self.policy.fallback_min_score)
+            .order_by(col(LlmModel.score).desc())
+        )
+        return [m.model_id for m in session.exec(stmt).all()]
+
+    def choose_model(self, model: str, session: Session) -> Optional[str]:
+        """
+        Returns the model to use, which is `model` unless its breaker is open,
+        or None if neither it nor any fallback is available.
+        """
+        if self.model_breaker(model).allow():
+            return model
+        for candidate in self.fallback_models(session):
+            if candidate != model and self.model_breaker(candidate).allow():
+                self.log.info(
+                    "breaker open, using fallback model",
+                    model=model,
+                    fallback=candidate,
+                )
+                return candidate
+        self.log.warn("breaker open and no fallback model available", model=model)
+        return None
+
+    def record(self, participant_id: str, model: Optional[str], success: bool):
+        """
+        Record the outcome of a generation.
+
+        A failure with a model counts against that model only, so the next
+        request can go to a fallback; one without a model, such as a broken
+        prompt template, counts against the participant.
+        """
+        participant = self.participant_breaker(participant_id)
+        if success:
+            participant.record_success()
+            if model:
+                self.model_breaker(model).record_success()
+            return
+        if model:
+            self.model_breaker(model).record_failure()
+            participant.release()
+        else:
+            participant.record_failure()
+        self.log.debug(
+            "recorded failure",
+            participant_id=participant_id,
+            model=model,
+            participant_state=participant.state.value,
+            model_state=self.model_breaker(model).state.value if model else "",
+        )
+
+    def release(self, participant_id: str):
+        """
+        Settle a request that never reached a model, without counting it.
+        """
+        self.participant_breaker(participant_id).release()
@@ -0,0 +1,70 @@
+import asyncio
+from typing import Any
+from typing import Dict
+from typing import Optional
+
+from agentarena.actors.services.agent_catalog import AgentCatalog
+from agentarena.clients.message_broker import MessageBroker
+from agentarena.core.factories.logger_factory import LoggingService
+from agentarena.core.services.uuid_service import UUIDService
+from agentarena.models.constants import PRESENCE_CHANNEL
+from agentarena.models.policies import HeartbeatPolicy
+from agentarena.models.requests import Heartbeat
+
+
+class HeartbeatService:
+    """
+    Publishes a heartbeat every `interval` seconds, listing the participants
+    in the agent catalog, so the arena knows they are up without asking.
+    """
+
+    def __init__(
+        self,
+        agent_catalog: AgentCatalog,
+        uuid_service: UUIDService,
+        logging: LoggingService,
+        heartbeat: Optional[Dict[str, Any]] = None,
+    ):
+        self.agent_catalog = agent_catalog
+        self.log = logging.get_logger("service")
+        self.policy = HeartbeatPolicy.model_validate(heartbeat or {})
+        self.node_id = uuid_service.make_id()
+        self.task: Optional[asyncio.Task] = None
+
+    def heartbeat(self) -> Heartbeat:
+        return Heartbeat(
+            node_id=self.node_id,
+            participants=sorted(self.agent_catalog.participants),
+            interval=self.policy.interval,
+        )
+
+    async def publish(self, message_broker: MessageBroker):
+        await message_broker.send_message(
+            PRESENCE_CHANNEL, self.heartbeat().model_dump_json()
+        )
+
+    async def run(self, message_broker: MessageBroker):
+        while True:
+            try:
+                await self.publish(message_broker)
+            except Exception as e:
+                self.log.warn("Failed to publish heartbeat", error=e)
+            await asyncio.sleep(self.policy.interval)
+
+    def start(self, message_broker: MessageBroker):
+        if self.policy.enabled and self.task is None:
+            self.log.info(
+                "Starting heartbeats",
+                node_id=self.node_id,
+                interval=self.policy.interval,
+            )
+            self.task = asyncio.create_task(self.run(message_broker))
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
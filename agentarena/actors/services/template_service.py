@@ -1,51 +1,143 @@
 import json
+from collections import OrderedDict
+from typing import Any
+from typing import Dict
+from typing import Optional
+from typing import Tuple
 
 from jinja2 import ChoiceLoader
 from jinja2 import PackageLoader
+from nats.aio.msg import Msg
+from pydantic import BaseModel
+from pydantic import Field
+from pydantic_core import to_jsonable_python
 from sqlmodel import Session
+from sqlmodel import col
+from sqlmodel import or_
 from sqlmodel import select
 
 from agentarena.actors.models import Agent
 from agentarena.actors.models import Strategy
 from agentarena.actors.models import StrategyCreate
 from agentarena.actors.models import StrategyPrompt
+from agentarena.clients.message_broker import MessageBroker
 from agentarena.core.exceptions import InvalidTemplateException
 from agentarena.core.exceptions import TemplateDataException
 from agentarena.core.exceptions import TemplateRenderingException
 from agentarena.core.factories.logger_factory import LoggingService
 from agentarena.core.services.jinja_renderer import JinjaRenderer
 from agentarena.core.services.model_service import ModelService
+from agentarena.core.services.subscribing_service import SubscribingService
 from agentarena.models.constants import PromptType
+from agentarena.models.llm import LlmModel
+from agentarena.models.llm import LlmModelPrice
+from agentarena.models.policies import CompactionPolicy
 from agentarena.models.requests import ParticipantActionRequest
 from agentarena.models.requests import ParticipantContestRequest
 from agentarena.models.requests import ParticipantContestRoundRequest
+from agentarena.util.compaction import compact_contest
 
+JINJA_PREFIX = "#jinja:"
+MAX_PREFIXES = 1024
 
-class TemplateService(JinjaRenderer):
+
+def dump_default(obj: Any):
+    return to_jsonable_python(obj, fallback=str)
+
+
+class CachedPrompt(BaseModel):
+    """
+    A strategy prompt held in the TemplateService cache, detached from its session.
+    """
+
+    id: Optional[str] = Field(default=None, description="StrategyPrompt ID")
+    strategy_id: str = Field(description="Strategy ID")
+    key: PromptType = Field(description="Prompt type")
+    prompt: str = Field(description="Prompt text")
+    template: Optional[str] = Field(
+        default=None, description="Template key, for #jinja: prompts"
+    )
+
+    @classmethod
+    def from_prompt(cls, prompt: StrategyPrompt) -> "CachedPrompt":
+        template = None
+        if prompt.prompt.startswith(JINJA_PREFIX):
+            template = prompt.prompt.replace(JINJA_PREFIX, "")
+        return cls(
+            id=prompt.id,
+            strategy_id=prompt.strategy_id,
+            key=prompt.key,
+            prompt=prompt.prompt,
+            template=template,
+        )
+
+
+class PromptParts(BaseModel):
+    """
+    An expanded prompt, as the stable prefix and the volatile suffix.
+    """
+
+    prefix: str = Field(default="", description="Stable across the round")
+    suffix: str = Field(description="Everything after the prefix")
+
+    @property
+    def text(self) -> str:
+        # the same join llm uses for fragments, so the prompt sent either way
+        # is identical
+        return f"{self.prefix}\n{self.suffix}" if self.prefix else self.suffix
+
+
+class TemplateService(JinjaRenderer, SubscribingService):
     """
     Provides template filling services, using Jinja2
+
+    Strategy prompts are cached by (strategy_id, PromptType), and dropped
+    when a sys.actor.strategy or sys.actor.strategyprompt change event arrives.
     """
 
     def __init__(
         self,
         strategy_service: ModelService[Strategy, StrategyCreate],
         logging: LoggingService,
+        projectroot: str = "",
+        cache_dir: Optional[str] = None,
+        preload: bool = False,
+        compaction: Optional[Dict[str, Any]] = None,
     ):
 
         self.strategy_service = strategy_service
         self.log = logging.get_logger("service")
-        super().__init__(base_path="agentarena.core")
+        super().__init__(
+            base_path="agentarena.core",
+            projectroot=projectroot,
+            cache_dir=cache_dir,
+        )
+        self.preload = preload
 
         # Add support for both template locations
-        self.env.loader = ChoiceLoader(
-            [
-                PackageLoader("agentarena.core", "templates"),
-                PackageLoader("agentarena.actors", "templates"),
-            ]
+        self.set_loader(
+            ChoiceLoader(
+                [
+                    PackageLoader("agentarena.core", "templates"),
+                    PackageLoader("agentarena.actors", "templates"),
+                ]
+            )
         )
 
         self.log.debug("Found templates", templates=self.env.list_templates())
 
+        self.prompts: Dict[Tuple[str, PromptType], CachedPrompt] = {}
+        self.prefixes: OrderedDict[Tuple[str, str, str, str, int], str] = OrderedDict()
+        self.compaction = (
+            CompactionPolicy.model_validate(compaction) if compaction else None
+        )
+        self.context_lengths: Dict[str, Optional[int]] = {}
+        to_subscribe = [
+            ("sys.actor.strategy.>", self.strategy_changed),
+            ("sys.actor.strategyprompt.>", self.strategyprompt_changed),
+        ]
+        SubscribingService.__init__(self, to_subscribe, self.log)
+
     async def expand_prompt(
         self,
         agent: Agent,
@@ -60,18 +152,38 @@ class TemplateService(JinjaRenderer):
         """
         Takes the prompt from the request and expand it using Jinja.
         """
+        parts = await self.expand_prompt_parts(agent, job_id, req, session)
+        return parts.text
+
+    async def expand_prompt_parts(
+        self,
+        agent: Agent,
+        job_id: str,
+        req: (
+            ParticipantContestRequest
+            | ParticipantContestRoundRequest
+            | ParticipantActionRequest
+        ),
+        session: Session,
+    ) -> PromptParts:
+        """
+        Expand the prompt, split into the stable prefix and the rest.
+        """
         strategy_id = agent.strategy_id
         log = self.log.bind(job=job_id, cmd=req.command, agent=agent.id)
         strategy_prompt = await self.get_prompt(strategy_id, req.command, session)
         prompt = strategy_prompt.prompt
-        if prompt.startswith("#jinja:"):
-            key = prompt.replace("#jinja:", "")
-            data = req.data.model_dump()
-            data["agent"] = agent.get_public().model_dump()
+        if strategy_prompt.template:
+            key = strategy_prompt.template
+            data = self.template_context(
+                agent, self.compact_request(agent, req, session)
+            )
             log = log.bind(template=key)
             log.info("Rendering template for prompt")
             try:
-                return self.render_template(key, data)
+                return self.render_parts(
+                    key, agent, data, model=self.request_model(agent, req)
+                )
             except (TemplateRenderingException, TemplateDataException) as e:
                 # Log the structured error information
                 log.error(
@@ -100,7 +212,7 @@ class TemplateService(JinjaRenderer):
                             },
                             f,
                             indent=2,
-                            default=str,
+                            default=dump_default,
                         )
                 except Exception as save_error:
                     log.error("Failed to save error data", save_error=save_error)
@@ -121,18 +233,143 @@ class TemplateService(JinjaRenderer):
                             },
                             f,
                             indent=2,
-                            default=str,
+                            default=dump_default,
                         )
                 except Exception as save_error:
                     log.error("Failed to save error data", save_error=save_error)
                 raise e
         else:
             log.info("Returning raw prompt")
-            return prompt
+            return PromptParts(suffix=prompt)
+
+    def render_parts(
+        self, key: str, agent: Agent, data: Dict[str, Any], model: str = ""
+    ) -> PromptParts:
+        """
+        Render a prompt template, with its `<key>.prefix` template in front if
+        there is one.
+
+        The prefix holds what doesn't change during a round: the strategy,
+        arena, rules, instructions and completed rounds. It is rendered once
+        per agent, model, contest and round, and sent byte for byte the same so
+        providers can cache it. The model is part of the key because it sets
+        the compaction budget, and so which rounds are in the prefix.
+        """
+        suffix = self.render_template(key, data)
+        prefix_key = f"{key}.prefix"
+        if not self.has_template(prefix_key):
+            return PromptParts(suffix=suffix)
+        contest = data.get("contest")
+        if contest is None:
+            return PromptParts(
+                prefix=self.render_template(prefix_key, data), suffix=suffix
+            )
+        round_no = contest.rounds[-1].round_no if contest.rounds else -1
+        memo_key = (prefix_key, agent.id, model, contest.id, round_no)
+        prefix = self.prefixes.get(memo_key)
+        if prefix is None:
+            prefix = self.render_template(prefix_key, data)
+            self.prefixes[memo_key] = prefix
+            if len(self.prefixes) > MAX_PREFIXES:
+                self.prefixes.popitem(last=False)
+        else:
+            self.prefixes.move_to_end(memo_key)
+        return PromptParts(prefix=prefix, suffix=suffix)
+
+    def get_context_length(self, model: str, session: Session) -> Optional[int]:
+        """
+        The context length from the model's pricing, by model key or name.
+        """
+        if model not in self.context_lengths:
+            stmt = (
+                select(LlmModelPrice.context_length)
+                .join(LlmModel, col(LlmModel.id) == LlmModelPrice.llm_model_id)
+                .where(or_(LlmModel.model_id == model, LlmModel.name == model))
+            )
+            self.context_lengths[model] = session.exec(stmt).first()
+        return self.context_lengths[model]
+
+    def request_model(
+        self,
+        agent: Agent,
+        req: (
+            ParticipantContestRequest
+            | ParticipantContestRoundRequest
+            | ParticipantActionRequest
+        ),
+    ) -> str:
+        """
+        The model the request asks for, or the agent's own.
+        """
+        return getattr(req, "model", None) or agent.model
+
+    def compact_request(
+        self,
+        agent: Agent,
+        req: (
+            ParticipantContestRequest
+            | ParticipantContestRoundRequest
+            | ParticipantActionRequest
+        ),
+        session: Session,
+    ):
+        """
+        Replace older rounds of the contest with their summary, so the history
+        fits the budget for the agent's model.
+        """
+        policy = self.compaction
+        if not policy:
+            return req
+        model = self.request_model(agent, req)
+        context_length = (
+            self.get_context_length(model, session) or policy.default_context_length
+        )
+        budget = int(context_length * policy.history_fraction)
+        if policy.max_history_tokens:
+            budget = min(budget, policy.max_history_tokens)
+        contest = req.data.contest
+        compacted = compact_contest(
+            contest, policy.keep_rounds, budget, policy.chars_per_token
+        )
+        if compacted is contest:
+            return req
+        self.log.debug(
+            "compacted contest history",
+            model=model,
+            budget=budget,
+            rounds=len(contest.rounds),
+            kept=len(compacted.rounds),
+        )
+        data = req.data.model_copy(update={"contest": compacted})
+        return req.model_copy(update={"data": data})
+
+    def template_context(
+        self,
+        agent: Agent,
+        req: (
+            ParticipantContestRequest
+            | ParticipantContestRoundRequest
+            | ParticipantActionRequest
+        ),
+    ) -> Dict[str, Any]:
+        """
+        The top level fields of the request payload, plus the agent.
+
+        The validated models are passed to Jinja as they are, rather than
+        dumped to dicts, so rendering doesn't copy the whole contest tree.
+        """
+        data: Dict[str, Any] = {
+            name: getattr(req.data, name) for name in type(req.data).model_fields
+        }
+        data["agent"] = agent.get_public()
+        return data
 
     async def get_prompt(
         self, strategy_id: str, prompt_type: PromptType, session: Session
-    ) -> StrategyPrompt:
+    ) -> CachedPrompt:
+        cached = self.prompts.get((strategy_id, prompt_type))
+        if cached:
+            return cached
         stmt = (
             select(StrategyPrompt)
             .where(StrategyPrompt.strategy_id == strategy_id)
@@ -143,4 +380,50 @@ class TemplateService(JinjaRenderer):
             raise InvalidTemplateException(
                 f"No such template {prompt_type.value} for strategy {strategy_id}"
             )
-        return prompt
+        cached = CachedPrompt.from_prompt(prompt)
+        self.prompts[(strategy_id, prompt_type)] = cached
+        return cached
+
+    def warm_prompts(self, session: Session) -> int:
+        """
+        Load every strategy prompt into the cache.
+        """
+        for prompt in session.exec(select(StrategyPrompt)).all():
+            self.prompts.setdefault(
+                (prompt.strategy_id, prompt.key), CachedPrompt.from_prompt(prompt)
+            )
+        self.log.info("Warmed prompt cache", ct=len(self.prompts))
+        return len(self.prompts)
+
+    def invalidate_strategy(self, strategy_id: str):
+        for key in [k for k in self.prompts if k[0] == strategy_id]:
+            del self.prompts[key]
+
+    def invalidate_prompt(self, prompt_id: str):
+        for key in [k for k, v in self.prompts.items() if v.id == prompt_id]:
+            del self.prompts[key]
+
+    async def subscribe_yourself(self, message_broker: MessageBroker):
+        await super().subscribe_yourself(message_broker)
+        # change events may be missed while disconnected
+        message_broker.add_reconnect_listener(self.clear_prompts)
+
+    async def clear_prompts(self):
+        self.prompts.clear()
+        self.context_lengths.clear()
+
+    async def strategy_changed(self, msg: Msg):
+        """
+        sys.actor.strategy.<strategy_id>.<action>
+        """
+        strategy_id = msg.subject.split(".")[3]
+        self.log.debug("strategy changed, dropping prompts", strategy_id=strategy_id)
+        self.invalidate_strategy(strategy_id)
+
+    async def strategyprompt_changed(self, msg: Msg):
+        """
+        sys.actor.strategyprompt.<prompt_id>.<action>
+        """
+        prompt_id = msg.subject.split(".")[3]
+        self.log.debug("strategy prompt changed", prompt_id=prompt_id)
+        self.invalidate_prompt(prompt_id)
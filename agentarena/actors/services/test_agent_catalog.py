@@ -0,0 +1,105 @@
+from unittest.mock import AsyncMock
+from unittest.mock import MagicMock
+
+import pytest
+
+from agentarena.actors.models import Agent
+from agentarena.actors.models import AgentCreate
+from agentarena.actors.models import Strategy
+from agentarena.actors.services.agent_catalog import AgentCatalog
+from agentarena.core.factories.db_factory import get_engine
+from agentarena.core.factories.environment_factory import get_project_root
+from agentarena.core.factories.logger_factory import LoggingService
+from agentarena.core.services.db_service import DbService
+from agentarena.core.services.model_service import ModelService
+from agentarena.core.services.uuid_service import UUIDService
+
+
+@pytest.fixture
+def logging():
+    return LoggingService(True)
+
+
+@pytest.fixture
+def db_service(logging):
+    service = DbService(
+        str(get_project_root()),
+        dbfile="test.db",
+        get_engine=get_engine,
+        memory=True,
+        prod=False,
+        uuid_service=UUIDService(word_list=[]),
+        logging=logging,
+    )
+    return service.create_db()
+
+
+@pytest.fixture
+def agent_service(db_service, logging):
+    return ModelService[Agent, AgentCreate](
+        model_class=Agent,  # type: ignore
+        db_service=db_service,
+        message_broker=AsyncMock(),
+        uuid_service=UUIDService(word_list=[]),
+        logging=logging,
+    )
+
+
+@pytest.fixture
+def catalog(agent_service, logging):
+    return AgentCatalog(agent_service=agent_service, logging=logging)
+
+
+@pytest.fixture
+def agents(db_service):
+    with db_service.get_session() as session:
+        session.add(Strategy(id="s1", name="Sneaky"))
+        session.add(Strategy(id="s2", name="Bold"))
+        session.add(Agent(id="a1", participant_id="p1", strategy_id="s1", name="one"))
+        session.add(Agent(id="a2", participant_id="p2", strategy_id="s2", name="two"))
+        session.commit()
+
+
+def test_get_from_catalog(catalog, db_service, agents):
+    with db_service.get_session() as session:
+        assert catalog.load(session) == 2
+
+    session = MagicMock()
+    agent = catalog.get("p1", session)
+    assert agent is not None
+    assert agent.get_public().strategy.name == "Sneaky"
+    session.exec.assert_not_called()
+
+
+def test_get_reads_through(catalog, db_service, agents):
+    with db_service.get_session() as session:
+        agent = catalog.get("p2", session)
+        assert agent is not None and agent.name == "two"
+        assert catalog.get("missing", session) is None
+    assert "p2" in catalog.participants
+
+
+@pytest.mark.asyncio
+async def test_change_events(catalog, db_service, agents):
+    with db_service.get_session() as session:
+        catalog.load(session)
+        agent = session.get(Agent, "a1")
+        agent.participant_id = "p3"
+        session.add(agent)
+        session.commit()
+
+    await catalog.agent_changed(MagicMock(subject="sys.actor.agent.a1.update"))
+    assert "p1" not in catalog.participants
+    assert catalog.participants["p3"] == "a1"
+
+    await catalog.agent_changed(MagicMock(subject="sys.actor.agent.a1.delete"))
+    assert "a1" not in catalog.agents
+
+    await catalog.strategy_changed(MagicMock(subject="sys.actor.strategy.s2.delete"))
+    assert catalog.agents == {}
+
+
+@pytest.mark.asyncio
+async def test_resync(catalog, db_service, agents):
+    await catalog.resync()
+    assert set(catalog.participants) == {"p1", "p2"}
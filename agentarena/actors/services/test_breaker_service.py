@@ -0,0 +1,131 @@
+import pytest
+from sqlmodel import Session
+from sqlmodel import SQLModel
+from sqlmodel import create_engine
+
+from agentarena.actors.services.breaker_service import BreakerService
+from agentarena.core.factories.logger_factory import LoggingService
+from agentarena.models.constants import BreakerState
+from agentarena.models.llm import LlmModel
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker_service(clock):
+    return BreakerService(
+        logging=LoggingService(capture=True),
+        breakers={"failure_threshold": 2, "reset_timeout": 30},
+        clock=clock,
+    )
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(LlmModel(id="m1", name="Best", model_id="best", score=10))
+        session.add(LlmModel(id="m2", name="Good", model_id="good", score=5))
+        session.add(
+            LlmModel(id="m3", name="Off", model_id="off", score=20, active=False)
+        )
+        session.add(LlmModel(id="m4", name="Unscored", model_id="unscored"))
+        session.commit()
+        yield session
+
+
+def test_breaker_opens_after_threshold(breaker_service):
+    breaker_service.record("p1", "best", False)
+    assert breaker_service.model_breaker("best").state == BreakerState.CLOSED
+    breaker_service.record("p1", "best", False)
+    assert breaker_service.model_breaker("best").state == BreakerState.OPEN
+    # the model failed, not the participant, which may still use a fallback
+    assert breaker_service.allow_participant("p1")
+
+
+def test_participant_breaker_counts_failures_without_a_model(breaker_service):
+    breaker_service.record("p1", None, False)
+    breaker_service.record("p1", None, False)
+    assert breaker_service.participant_breaker("p1").state == BreakerState.OPEN
+    assert not breaker_service.allow_participant("p1")
+
+
+def test_success_resets_failures(breaker_service):
+    breaker_service.record("p1", "best", False)
+    breaker_service.record("p1", "best", True)
+    breaker_service.record("p1", "best", False)
+    assert breaker_service.model_breaker("best").state == BreakerState.CLOSED
+
+
+def test_half_open_allows_one_trial(breaker_service, clock):
+    breaker_service.record("p1", None, False)
+    breaker_service.record("p1", None, False)
+    clock.now = 31
+    assert breaker_service.allow_participant("p1")
+    assert not breaker_service.allow_participant("p1")
+
+    breaker_service.record("p1", None, False)
+    assert breaker_service.participant_breaker("p1").state == BreakerState.OPEN
+
+    clock.now = 62
+    assert breaker_service.allow_participant("p1")
+    breaker_service.record("p1", None, True)
+    assert breaker_service.participant_breaker("p1").state == BreakerState.CLOSED
+
+
+def test_unrecorded_trial_is_released(breaker_service, clock):
+    breaker_service.record("p1", None, False)
+    breaker_service.record("p1", None, False)
+    clock.now = 31
+    assert breaker_service.allow_participant("p1")
+    clock.now = 45
+    assert not breaker_service.allow_participant("p1")
+    # the trial never reported back, so another one may go
+    clock.now = 62
+    assert breaker_service.allow_participant("p1")
+    assert not breaker_service.allow_participant("p1")
+
+
+def test_fallback_by_score(breaker_service, session):
+    assert breaker_service.fallback_models(session) == ["best", "good"]
+    assert breaker_service.choose_model("best", session) == "best"
+
+    breaker_service.record("p1", "best", False)
+    breaker_service.record("p1", "best", False)
+    assert breaker_service.choose_model("best", session) == "good"
+
+    breaker_service.record("p2", "good", False)
+    breaker_service.record("p2", "good", False)
+    assert breaker_service.choose_model("best", session) is None
+
+
+def test_configured_fallback(clock, session):
+    service = BreakerService(
+        logging=LoggingService(capture=True),
+        breakers={"failure_threshold": 1, "fallback": ["cheap"]},
+        clock=clock,
+    )
+    service.record("p1", "best", False)
+    assert service.choose_model("best", session) == "cheap"
+
+
+def test_model_failure_releases_participant_trial(breaker_service, clock):
+    breaker_service.record("p1", None, False)
+    breaker_service.record("p1", None, False)
+    clock.now = 31
+    assert breaker_service.allow_participant("p1")
+    breaker_service.record("p1", "best", False)
+    assert breaker_service.participant_breaker("p1").state == BreakerState.HALF_OPEN
+    assert breaker_service.allow_participant("p1")
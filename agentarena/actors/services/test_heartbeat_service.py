@@ -0,0 +1,55 @@
+import asyncio
+from unittest.mock import AsyncMock
+from unittest.mock import MagicMock
+
+import pytest
+
+from agentarena.actors.services.heartbeat_service import HeartbeatService
+from agentarena.core.factories.logger_factory import LoggingService
+from agentarena.core.services.uuid_service import UUIDService
+from agentarena.models.constants import PRESENCE_CHANNEL
+from agentarena.models.requests import Heartbeat
+
+
+def make_service(heartbeat=None):
+    catalog = MagicMock(participants={"p2": "a2", "p1": "a1"})
+    return HeartbeatService(
+        agent_catalog=catalog,
+        uuid_service=UUIDService(word_list=[]),
+        logging=LoggingService(True),
+        heartbeat=heartbeat,
+    )
+
+
+@pytest.mark.asyncio
+async def test_publishes_catalog_participants():
+    service = make_service({"interval": 5})
+    broker = MagicMock(send_message=AsyncMock())
+
+    await service.publish(broker)
+
+    channel, payload = broker.send_message.call_args.args
+    assert channel == PRESENCE_CHANNEL
+    heartbeat = Heartbeat.model_validate_json(payload)
+    assert heartbeat.participants == ["p1", "p2"]
+    assert heartbeat.interval == 5
+    assert heartbeat.node_id == service.node_id
+
+
+@pytest.mark.asyncio
+async def test_start_and_stop():
+    service = make_service({"interval": 0.01})
+    broker = MagicMock(send_message=AsyncMock())
+
+    service.start(broker)
+    await asyncio.sleep(0.05)
+    await service.stop()
+
+    assert service.task is None
+    assert broker.send_message.await_count >= 2
+
+
+def test_disabled_does_not_start():
+    service = make_service({"enabled": False})
+    service.start(MagicMock())
+    assert service.task is None
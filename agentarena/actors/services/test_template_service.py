@@ -3,17 +3,22 @@ from unittest.mock import AsyncMock
 from unittest.mock import MagicMock
 
 import pytest
+from jinja2 import DictLoader
 from jinja2 import Template
 from jinja2 import TemplateNotFound
 from sqlmodel import Session
 
 from agentarena.actors.models import Agent
 from agentarena.actors.models import StrategyPrompt
+from agentarena.actors.services.template_service import CachedPrompt
 from agentarena.actors.services.template_service import InvalidTemplateException
 from agentarena.actors.services.template_service import TemplateService
+from agentarena.models.constants import ContestRoundState
 from agentarena.models.constants import PromptType
+from agentarena.models.policies import CompactionPolicy
 from agentarena.models.public import ArenaPublic
 from agentarena.models.public import ContestPublic
+from agentarena.models.public import ContestRoundPublic
 from agentarena.models.requests import ContestRequestPayload
 from agentarena.models.requests import ParticipantContestRequest
 
@@ -68,7 +73,8 @@ async def test_expand_prompt_raw(template_service, mock_session):
 
     # Mock get_prompt to return a raw prompt
     template_service.get_prompt = AsyncMock(
-        return_value=StrategyPrompt(
+        return_value=CachedPrompt(
+            id="prompt1",
             strategy_id="strategy1",
             key=PromptType.PLAYER_PLAYER_ACTION,
             prompt="Hello World",
@@ -95,10 +101,12 @@ async def test_expand_prompt_jinja(template_service, mock_session):
 
     # Mock get_prompt to return a Jinja prompt
     template_service.get_prompt = AsyncMock(
-        return_value=StrategyPrompt(
+        return_value=CachedPrompt(
+            id="prompt1",
             strategy_id="strategy1",
             key=PromptType.PLAYER_PLAYER_ACTION,
             prompt="#jinja:greeting",
+            template="greeting",
         )
     )
 
@@ -121,10 +129,12 @@ async def test_expand_prompt_invalid_template(template_service, mock_session):
     )
 
     template_service.get_prompt = AsyncMock(
-        return_value=StrategyPrompt(
+        return_value=CachedPrompt(
+            id="prompt1",
             strategy_id="strategy1",
             key=PromptType.PLAYER_PLAYER_ACTION,
             prompt="#jinja:invalid_template",
+            template="invalid_template",
         )
     )
     template_service.render_template = MagicMock(
@@ -153,6 +163,58 @@ async def test_get_prompt_success(template_service, mock_session):
     mock_session.exec.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_get_prompt_cached(template_service, mock_session):
+    """Test that prompts are only queried once, with the template key parsed"""
+    stmt_mock = MagicMock()
+    mock_session.exec.return_value = stmt_mock
+    stmt_mock.first.return_value = StrategyPrompt(
+        id="prompt1",
+        strategy_id="strategy1",
+        key=PromptType.PLAYER_PLAYER_ACTION,
+        prompt="#jinja:player.base.player_action",
+    )
+
+    for _ in range(3):
+        result = await template_service.get_prompt(
+            "strategy1", PromptType.PLAYER_PLAYER_ACTION, mock_session
+        )
+    assert result.template == "player.base.player_action"
+    mock_session.exec.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_prompt_cache_invalidation(template_service, mock_session):
+    """Test that change events drop cached prompts"""
+    mock_session.exec.return_value.all.return_value = [
+        StrategyPrompt(
+            id="prompt1",
+            strategy_id="strategy1",
+            key=PromptType.PLAYER_PLAYER_ACTION,
+            prompt="one",
+        ),
+        StrategyPrompt(
+            id="prompt2",
+            strategy_id="strategy2",
+            key=PromptType.PLAYER_PLAYER_ACTION,
+            prompt="two",
+        ),
+    ]
+    assert template_service.warm_prompts(mock_session) == 2
+
+    await template_service.strategyprompt_changed(
+        MagicMock(subject="sys.actor.strategyprompt.prompt1.update")
+    )
+    assert list(template_service.prompts) == [
+        ("strategy2", PromptType.PLAYER_PLAYER_ACTION)
+    ]
+
+    await template_service.strategy_changed(
+        MagicMock(subject="sys.actor.strategy.strategy2.delete")
+    )
+    assert template_service.prompts == {}
+
+
 @pytest.mark.asyncio
 async def test_get_prompt_not_found(template_service, mock_session):
     """Test error when prompt not found"""
@@ -179,7 +241,12 @@ def test_get_template_success(template_service):
     template = template_service.get_template("valid_template")
     assert template == mock_template
     template_service.env.select_template.assert_called_with(
-        ["valid_template", "valid_template.md", "valid_template.md.j2"]
+        [
+            "valid_template",
+            "valid_template.j2",
+            "valid_template.md",
+            "valid_template.md.j2",
+        ]
     )
 
 
@@ -206,3 +273,121 @@ def test_render_template(template_service):
     data = {"test": "there, you sexy tester"}
     result = template_service.render_template("test", data)
     assert result == "Hello there, you sexy tester"
+
+
+def test_template_context_passes_models(template_service):
+    """Test that the request models are passed to the template, not copies"""
+    arena = ArenaPublic(
+        id="arena1",
+        name="Arena",
+        description="",
+        height=5,
+        width=5,
+        rules="",
+        winning_condition="",
+    )
+    contest = ContestPublic(
+        id="contest1",
+        arena=arena,
+        auto_advance=False,
+        rounds=[],
+        end_time=0,
+        start_time=0,
+    )
+    req = ParticipantContestRequest(
+        command=PromptType.PLAYER_PLAYER_ACTION,
+        data=ContestRequestPayload(contest=contest),
+    )
+    agent = Agent(id="agent1", strategy_id="strategy1", participant_id="participant1")
+
+    data = template_service.template_context(agent, req)
+    assert data["contest"] is contest
+    assert data["agent"].participant_id == "participant1"
+
+    tpl = template_service.env.from_string(
+        "{{ contest.arena.name }} {{ [contest] | get_attr_by_id('contest1', 'id') }}"
+    )
+    assert tpl.render(data) == "Arena contest1"
+
+
+def test_render_parts_memoizes_prefix(template_service):
+    """Test that the stable prefix is rendered once per round and reused"""
+    template_service.set_loader(
+        DictLoader(
+            {
+                "game.md.j2": "round {{ contest.rounds|length }}",
+                "game.prefix.md.j2": "rules for {{ contest.id }}",
+            }
+        )
+    )
+    rounds = [MagicMock(round_no=0), MagicMock(round_no=1)]
+    contest = MagicMock(id="contest1", rounds=rounds[:1])
+    agent = Agent(id="agent1", strategy_id="strategy1", participant_id="participant1")
+    render = MagicMock(wraps=template_service.render_template)
+    template_service.render_template = render
+
+    first = template_service.render_parts("game", agent, {"contest": contest})
+    second = template_service.render_parts("game", agent, {"contest": contest})
+    assert first.text == "rules for contest1\nround 1"
+    assert second.prefix is first.prefix
+    assert render.call_count == 3
+
+    contest.rounds = rounds
+    third = template_service.render_parts("game", agent, {"contest": contest})
+    assert third.text == "rules for contest1\nround 2"
+    assert render.call_count == 5
+
+    # another model may compact the history differently
+    template_service.render_parts("game", agent, {"contest": contest}, model="other")
+    assert render.call_count == 7
+
+    # templates without a prefix are sent whole
+    template_service.set_loader(DictLoader({"game.md.j2": "just this"}))
+    assert template_service.render_parts("game", agent, {}).text == "just this"
+
+
+def test_compact_request_uses_model_context(template_service, mock_session):
+    """Test that older rounds are summarized to fit the model's context"""
+    template_service.compaction = CompactionPolicy(keep_rounds=2)
+    mock_session.exec.return_value.first.return_value = 8000
+    rounds = [
+        ContestRoundPublic(
+            round_no=i,
+            narrative=f"round {i}",
+            state=ContestRoundState.COMPLETE,
+            summary=f"to {i}",
+        )
+        for i in range(5)
+    ]
+    arena = ArenaPublic(
+        id="arena1",
+        name="Arena",
+        description="",
+        height=10,
+        width=10,
+        rules="",
+        winning_condition="",
+    )
+    contest = ContestPublic(
+        id="contest1",
+        arena=arena,
+        auto_advance=True,
+        start_time=0,
+        end_time=0,
+        rounds=rounds,
+    )
+    req = ParticipantContestRequest(
+        command=PromptType.PLAYER_PLAYER_ACTION,
+        message="",
+        data=ContestRequestPayload(contest=contest),
+    )
+    agent = Agent(id="agent1", strategy_id="s1", participant_id="p1", model="m1")
+
+    compacted = template_service.compact_request(agent, req, mock_session)
+    assert [r.round_no for r in compacted.data.contest.rounds] == [3, 4]
+    assert compacted.data.contest.summary == "to 2"
+    assert req.data.contest.rounds == rounds
+
+    # the context length is looked up once per model
+    template_service.compact_request(agent, req, mock_session)
+    assert mock_session.exec.call_count == 1
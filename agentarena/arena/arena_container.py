@@ -24,9 +24,18 @@ from agentarena.arena.models import PlayerAction
 from agentarena.arena.models import PlayerActionCreate
 from agentarena.arena.models import PlayerState
 from agentarena.arena.models import PlayerStateCreate
+from agentarena.arena.services.contest_scheduler import ContestScheduler
+from agentarena.arena.services.effects_engine import EffectsEngine
+from agentarena.arena.services.feature_pool import FeaturePool
+from agentarena.arena.services.narration_tracker import NarrationTracker
+from agentarena.arena.services.presence_registry import PresenceRegistry
+from agentarena.arena.services.prestage_service import PrestageService
+from agentarena.arena.services.role_dispatcher import RoleDispatcher
 from agentarena.arena.services.round_service import RoundService
+from agentarena.arena.services.timeout_service import TimeoutService
 from agentarena.arena.services.view_service import ViewService
 from agentarena.clients.message_broker import MessageBroker
+from agentarena.clients.message_broker import ReconnectListeners
 from agentarena.clients.message_broker import get_message_broker_connection
 from agentarena.core.controllers.model_controller import ModelController
 from agentarena.core.factories.db_factory import get_engine
@@ -86,10 +95,16 @@ class ArenaContainer(containers.DeclarativeContainer):
         logger_levels=config.arena.logging.loggers,
     )
 
+    reconnect_listeners = providers.Singleton(
+        ReconnectListeners,
+        logging=logging,
+    )
+
     message_broker_connection = providers.Resource(
         get_message_broker_connection,
         config.messagebroker.url,
         logging,
+        reconnect_listeners,
     )
 
     uuid_service = providers.Singleton(
@@ -103,6 +118,7 @@ class ArenaContainer(containers.DeclarativeContainer):
         client=message_broker_connection,
         uuid_service=uuid_service,
         logging=logging,
+        reconnect_listeners=reconnect_listeners,
     )
 
     db_service = providers.Singleton(
@@ -219,11 +235,57 @@ class ArenaContainer(containers.DeclarativeContainer):
 
     template_service = providers.Singleton(
         JinjaRenderer,
+        projectroot=projectroot,
+        cache_dir=config.arena.templates.cache_dir,
+        preload=config.arena.templates.preload,
     )
 
     view_service = providers.Singleton(
         ViewService,
         logging=logging,
+        visibility=config.arena.visibility,
+    )
+
+    scheduler = providers.Singleton(
+        ContestScheduler,
+        scheduler=config.arena.scheduler,
+    )
+
+    timeout_service = providers.Singleton(
+        TimeoutService,
+        timeouts=config.arena.timeouts,
+        scheduler=scheduler,
+    )
+
+    effects_engine = providers.Singleton(
+        EffectsEngine,
+        effects=config.arena.effects,
+    )
+
+    narration_tracker = providers.Singleton(
+        NarrationTracker,
+        narration=config.arena.narration,
+    )
+
+    dispatcher = providers.Singleton(
+        RoleDispatcher,
+        dispatch=config.arena.dispatch,
+        timeout_service=timeout_service,
+    )
+
+    presence = providers.Singleton(
+        PresenceRegistry,
+        presence=config.arena.presence,
+    )
+
+    feature_pool = providers.Singleton(
+        FeaturePool,
+        feature_pool=config.arena.feature_pool,
+    )
+
+    prestage_service = providers.Singleton(
+        PrestageService,
+        prestage=config.arena.prestage,
     )
 
     # controllers
@@ -263,9 +325,18 @@ class ArenaContainer(containers.DeclarativeContainer):
         view_service=view_service,
         logging=logging,
         judge_result_service=judge_result_service,
+        timeout_service=timeout_service,
+        effects_engine=effects_engine,
+        narration_tracker=narration_tracker,
+        dispatcher=dispatcher,
+        presence=presence,
+        feature_pool=feature_pool,
+        prestage_service=prestage_service,
+        scheduler=scheduler,
     )
 
     debug_controller = providers.Singleton(
         DebugController,
         logging=logging,
+        feature_pool=feature_pool,
     )
@@ -3,9 +3,12 @@ ContestDTO controller for the Agent Arena application.
 Handles HTTP requests for contest operations.
 """
 
+import asyncio
+from codecs import decode
 from datetime import datetime
 from typing import Dict
 from typing import List
+from typing import Set
 
 from fastapi import APIRouter
 from fastapi import Body
@@ -30,7 +33,16 @@ from agentarena.arena.models import PlayerAction
 from agentarena.arena.models import PlayerActionCreate
 from agentarena.arena.models import PlayerState
 from agentarena.arena.models import PlayerStateCreate
+from agentarena.arena.services.contest_scheduler import ContestScheduler
+from agentarena.arena.services.contest_scheduler import QueueEntry
+from agentarena.arena.services.effects_engine import EffectsEngine
+from agentarena.arena.services.feature_pool import FeaturePool
+from agentarena.arena.services.narration_tracker import NarrationTracker
+from agentarena.arena.services.presence_registry import PresenceRegistry
+from agentarena.arena.services.prestage_service import PrestageService
+from agentarena.arena.services.role_dispatcher import RoleDispatcher
 from agentarena.arena.services.round_service import RoundService
+from agentarena.arena.services.timeout_service import TimeoutService
 from agentarena.arena.services.view_service import ViewService
 from agentarena.arena.statemachines.contest_machine import ContestMachine
 from agentarena.clients.message_broker import MessageBroker
@@ -40,6 +52,7 @@ from agentarena.core.factories.logger_factory import LoggingService
 from agentarena.core.services.jinja_renderer import JinjaRenderer
 from agentarena.core.services.model_service import ModelService
 from agentarena.core.services.subscribing_service import SubscribingService
+from agentarena.models.constants import PRESENCE_CHANNEL
 from agentarena.models.constants import ContestRoundState
 from agentarena.models.constants import PromptType
 from agentarena.models.constants import RoleType
@@ -47,6 +60,7 @@ from agentarena.models.job import JobLock
 from agentarena.models.requests import ActionRequestPayload
 from agentarena.models.requests import ContestRequestPayload
 from agentarena.models.requests import ContestRoundPayload
+from agentarena.models.requests import Heartbeat
 from agentarena.models.requests import ParticipantActionRequest
 from agentarena.models.requests import ParticipantContestRequest
 from agentarena.models.requests import ParticipantContestRoundRequest
@@ -83,6 +97,16 @@ class ContestController(
         template_service: JinjaRenderer = Field(description="The template service"),
         view_service: ViewService = Field(description="The view service"),
         logging: LoggingService = Field(description="Logger factory"),
+        timeout_service: TimeoutService = Field(description="The timeout service"),
+        effects_engine: EffectsEngine = Field(description="The effects engine"),
+        narration_tracker: NarrationTracker = Field(
+            description="The narration tracker"
+        ),
+        dispatcher: RoleDispatcher = Field(description="The role dispatcher"),
+        presence: PresenceRegistry = Field(description="The presence registry"),
+        feature_pool: FeaturePool = Field(description="The feature pool"),
+        prestage_service: PrestageService = Field(description="The prestage service"),
+        scheduler: ContestScheduler = Field(description="The contest scheduler"),
     ):
         self.feature_service = feature_service
         self.participant_service = participant_service
@@ -93,11 +117,21 @@ class ContestController(
         self.message_broker = message_broker
         self.view_service = view_service
         self.judge_result_service = judge_result_service
+        self.timeout_service = timeout_service
+        self.effects_engine = effects_engine
+        self.narration_tracker = narration_tracker
+        self.dispatcher = dispatcher
+        self.presence = presence
+        self.feature_pool = feature_pool
+        self.prestage_service = prestage_service
+        self.scheduler = scheduler
+        self.flow_tasks: Set[asyncio.Task] = set()
         to_subscribe = [
             (
                 "arena.contest.*.contestflow.*.*",
                 self.handle_flow,
             ),  # arena.contest.contest_id.contestflow.state.job_id
+            (PRESENCE_CHANNEL, self.handle_heartbeat),
         ]
         super().__init__(
             base_path=base_path,
@@ -261,8 +295,31 @@ class ContestController(
             contest.participants.append(p)
 
         session.commit()
+        if self.prestage_service.wants(req.prestage):
+            contest_id = contest.id
+            log = self.log.bind(contest_id=contest_id, method="prestage")
+            log.info("prestaging contest")
+            self.prestage_service.start(
+                contest_id,
+                lambda: self.run_contest_machine(contest_id, log, prestage=True),
+            )
         return contest
 
+    async def handle_heartbeat(self, msg: Msg):
+        """
+        Record the participants in an actor node's heartbeat as present.
+
+        channel is sys.actor.presence
+        """
+        try:
+            heartbeat = Heartbeat.model_validate_json(
+                decode(msg.data, "utf-8", "unicode_escape")
+            )
+        except Exception as e:
+            self.log.warn("Invalid heartbeat", error=e)
+            return
+        self.presence.record(heartbeat)
+
     async def handle_flow(self, msg: Msg):
         """
         Handle incoming messages for contest flow updates.
@@ -315,8 +372,11 @@ class ContestController(
                 if not contest or not response.success:
                     return
 
-                # Create and run the contest machine in the current event loop
-                await self.run_contest_machine(contest_id, log)
+                # nats runs callbacks one at a time, so the step runs in its own
+                # task, or one contest waiting its turn would hold up the rest
+                task = asyncio.create_task(self.run_flow_step(contest_id, log))
+                self.flow_tasks.add(task)
+                task.add_done_callback(self.flow_tasks.discard)
 
             else:
                 log.info("Contest is in fail state, ignoring")
@@ -456,44 +516,90 @@ class ContestController(
         )
         return req
 
-    async def run_contest_machine(self, contest_id: str, log: ILogger):
-        """Run the contest machine in the current event loop context"""
+    async def run_flow_step(self, contest_id: str, log: ILogger):
+        """
+        Run the contest machine for a flow message, once any prestage of the
+        contest has finished.
+        """
+        try:
+            await self.prestage_service.wait(contest_id)
+            await self.run_contest_machine(contest_id, log)
+        except Exception as e:
+            log.error("Contest flow step failed", error=e)
+
+    async def run_contest_machine(
+        self, contest_id: str, log: ILogger, prestage: bool = False
+    ):
+        """Run the contest machine in the current event loop context.
+
+        The machine runs once the scheduler gives the contest a turn. A
+        prestage runs the setup without pausing, whatever the contest's
+        auto_advance, and stops when the first round is ready.
+        """
         with self.model_service.get_session() as session:
             contest, response = await self.model_service.get(contest_id, session)
             if not contest or not response.success:
                 log.error("Failed to get contest", error=response.validation)
                 return
 
-            machine = ContestMachine(
-                contest=contest,
-                message_broker=self.message_broker,
-                feature_service=self.feature_service,
-                judge_result_service=self.judge_result_service,
-                playeraction_service=self.playeraction_service,
-                player_state_service=self.player_state_service,
-                round_service=self.round_service,
-                session=session,
-                uuid_service=self.model_service.uuid_service,
-                view_service=self.view_service,
-                log=log,
-                auto_advance=contest.auto_advance,
-            )
-            await machine.activate_initial_state()  # type: ignore
-            log = log.bind(state=machine.current_state.id)
-            if machine.current_state in [
-                ContestState.COMPLETE.value,
-                ContestState.FAIL.value,
-            ]:
-                log.info("Machine already in final state, not advancing")
-            else:
-                log.info("Machine is not in final state, advancing")
-                await machine.advance_state("controller")
+            weight = self.scheduler.weight_for(contest.arena.name)
+            async with self.scheduler.turn(contest_id, contest.arena_id, weight):
+                # another step may have run while this one waited
+                session.refresh(contest)
+                await self.step_contest_machine(contest, session, log, prestage)
+
+    async def step_contest_machine(
+        self, contest: Contest, session: Session, log: ILogger, prestage: bool
+    ):
+        machine = ContestMachine(
+            contest=contest,
+            message_broker=self.message_broker,
+            feature_service=self.feature_service,
+            judge_result_service=self.judge_result_service,
+            playeraction_service=self.playeraction_service,
+            player_state_service=self.player_state_service,
+            round_service=self.round_service,
+            session=session,
+            uuid_service=self.model_service.uuid_service,
+            view_service=self.view_service,
+            log=log,
+            auto_advance=contest.auto_advance or prestage,
+            timeout_service=self.timeout_service,
+            effects_engine=self.effects_engine,
+            narration_tracker=self.narration_tracker,
+            dispatcher=self.dispatcher,
+            presence=self.presence,
+            feature_pool=self.feature_pool,
+            prestage=prestage,
+            scheduler=self.scheduler,
+        )
+        await machine.activate_initial_state()  # type: ignore
+        log = log.bind(state=machine.current_state.id)
+        if machine.current_state in [
+            ContestState.COMPLETE.value,
+            ContestState.FAIL.value,
+        ]:
+            log.info("Machine already in final state, not advancing")
+        else:
+            log.info("Machine is not in final state, advancing")
+            await machine.advance_state("controller")
+
+        log.info(
+            "advanced contest machine",
+            contest_id=contest.id,
+            state=machine.current_state.id,
+        )
 
-            log.info(
-                "advanced contest machine",
-                contest_id=contest_id,
-                state=machine.current_state.id,
+    async def get_queue_position(self, contest_id: str) -> QueueEntry:
+        """
+        Get a contest's place in the scheduler queue.
+        """
+        entry = self.scheduler.position(contest_id)
+        if entry is None:
+            raise HTTPException(
+                status_code=404, detail=f"Contest {contest_id} is not queued"
             )
+        return entry
 
     # @router.post("/contest/{contest_id}/start", response_model=Dict[str, str])
     async def advance_contest(self, contest_id: str, session: Session) -> ContestPublic:
@@ -537,8 +643,8 @@ class ContestController(
 
         # sanity check done, let's start
 
-        # If Contest is CREATED update start time
-        if contest.state == ContestState.STARTING:
+        # Set the start time on the first advance, which may follow a prestage
+        if contest.state == ContestState.STARTING or not contest.start_time:
             contest.start_time = int(datetime.now().timestamp())
             await self.model_service.update(contest_id, contest, session)
 
@@ -629,6 +735,14 @@ class ContestController(
             with self.model_service.get_session() as session:
                 return await self.advance_contest(contest_id, session)
 
+        @router.get("/queue", response_model=List[QueueEntry])
+        async def queue():
+            return self.scheduler.queue()
+
+        @router.get("/{contest_id}/queue", response_model=QueueEntry)
+        async def queue_position(contest_id: str):
+            return await self.get_queue_position(contest_id)
+
         @router.get("/{obj_id}.{format}", response_model=str)
         async def get_md(obj_id: str, format: str = "md"):
             with self.model_service.get_session() as session:
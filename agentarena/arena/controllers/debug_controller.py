@@ -1,7 +1,11 @@
+from typing import List
+
 from fastapi import APIRouter
 from nats.aio.client import Client as NatsClient
 from sqlmodel import Field
 
+from agentarena.arena.services.feature_pool import FeaturePool
+from agentarena.arena.services.feature_pool import FeaturePoolStats
 from agentarena.core.factories.logger_factory import LoggingService
 from agentarena.models.constants import JobResponseState
 from agentarena.models.public import JobResponse
@@ -18,9 +22,11 @@ class DebugController:
         base_path: str = "/api",
         message_broker: NatsClient = Field(description="Message broker client"),
         logging: LoggingService = Field(description="Logger factory"),
+        feature_pool: FeaturePool = Field(description="Feature pool"),
     ):
         self.base_path = f"{base_path}/debug"
         self.message_broker = message_broker
+        self.feature_pool = feature_pool
         self.log = logging.get_logger("controller", path=self.base_path)
 
     async def healthOK(self):
@@ -42,4 +48,8 @@ class DebugController:
         async def health():
             return await self.healthOK()
 
+        @router.get("/feature_pool", response_model=List[FeaturePoolStats])
+        async def feature_pool():
+            return self.feature_pool.stats()
+
         return router
@@ -11,6 +11,7 @@ from agentarena.core.factories.db_factory import get_engine
 from agentarena.core.factories.environment_factory import get_project_root
 from agentarena.core.factories.logger_factory import LoggingService
 from agentarena.core.services.db_service import DbService
+from agentarena.core.services.jinja_renderer import JinjaRenderer
 from agentarena.core.services.model_service import ModelService
 from agentarena.core.services.uuid_service import UUIDService
 
@@ -78,6 +79,7 @@ def ctrl(arena_service, feature_service, logging):
     return ArenaController(
         arena_service=arena_service,
         feature_service=feature_service,
+        template_service=JinjaRenderer(),
         logging=logging,
     )
 
@@ -105,4 +107,25 @@ async def test_create_arena_success(ctrl, db_service):
         assert result.height == 10
 
 
+@pytest.mark.asyncio
+async def test_get_arena_as_markdown(ctrl, db_service):
+    req = ArenaCreate(
+        name="Markdown Arena",
+        description="testing",
+        height=10,
+        width=10,
+        rules="",
+        winning_condition="",
+        max_random_features=1,
+        features=[],
+    )
+
+    with db_service.get_session() as session:
+        arena = await ctrl.create_arena(req, session)
+        # renders arena.md, which only exists as arena.md.j2
+        response = await ctrl.get_model_with_format(arena.id, session, format="md")
+        assert response.media_type == "text/markdown"
+        assert "Markdown Arena" in response.body.decode()
+
+
 # Additional tests for error cases, get_arena, get_arena_list, update_arena, delete_arena, etc. should be added similarly.
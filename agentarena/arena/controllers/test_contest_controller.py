@@ -1,7 +1,10 @@
+import asyncio
 from unittest.mock import AsyncMock
+from unittest.mock import MagicMock
 
 import pytest
 
+from agentarena.arena.controllers.contest_controller import ContestController
 from agentarena.arena.models import Arena
 from agentarena.arena.models import ArenaCreate
 from agentarena.arena.models import ArenaUpdate
@@ -186,3 +189,82 @@ async def test_get_contest_list(contest_ctrl, db_service, arena_ctrl):
         assert len(contests) == 10
         assert all(isinstance(c, ContestPublic) for c in contests)
         assert all(c.arena.id == arena.id for c in contests)
+
+
+@pytest.mark.asyncio
+async def test_flow_steps_run_concurrently(
+    contest_ctrl,
+    model_service,
+    template_service,
+    message_broker,
+    db_service,
+    arena_ctrl,
+    logging,
+    timeout_service,
+    effects_engine,
+    narration_tracker,
+    dispatcher,
+    presence,
+    feature_pool,
+    prestage_service,
+    scheduler,
+):
+    ctrl = ContestController(
+        base_path="/api/contest",
+        feature_service=MagicMock(),
+        message_broker=message_broker,
+        model_service=model_service,
+        judge_result_service=MagicMock(),
+        participant_service=MagicMock(),
+        playeraction_service=MagicMock(),
+        player_state_service=MagicMock(),
+        round_service=MagicMock(),
+        template_service=template_service,
+        view_service=MagicMock(),
+        logging=logging,
+        timeout_service=timeout_service,
+        effects_engine=effects_engine,
+        narration_tracker=narration_tracker,
+        dispatcher=dispatcher,
+        presence=presence,
+        feature_pool=feature_pool,
+        prestage_service=prestage_service,
+        scheduler=scheduler,
+    )
+    with db_service.get_session() as session:
+        arena = await get_arena(arena_ctrl, session)
+        contest_ids = []
+        for _ in range(2):
+            contest = await contest_ctrl.create_model(
+                ContestCreate(
+                    arena_id=arena.id,
+                    player_positions="A;B",
+                    player_inventories="[]",
+                    participant_ids=["a", "b"],
+                ),
+                session,
+            )
+            contest_ids.append(contest.id)
+        session.commit()
+
+    started = []
+    finished = []
+    both_started = asyncio.Event()
+
+    async def step(contest, session, log, prestage):
+        started.append(contest.id)
+        if len(started) == 2:
+            both_started.set()
+        # only finishes if the other contest's step runs meanwhile
+        await asyncio.wait_for(both_started.wait(), 1)
+        finished.append(contest.id)
+
+    ctrl.step_contest_machine = step
+    for n, contest_id in enumerate(contest_ids):
+        await ctrl.handle_flow(
+            MagicMock(subject=f"arena.contest.{contest_id}.contestflow.in_round.j{n}")
+        )
+    await asyncio.gather(*ctrl.flow_tasks)
+
+    assert sorted(finished) == sorted(contest_ids)
+    assert not ctrl.flow_tasks
@@ -3,6 +3,7 @@ Arena configuration model for the Agent Arena application.
 """
 
 from enum import Enum
+from typing import Any
 from typing import Dict
 from typing import List
 from typing import Optional
@@ -63,6 +64,11 @@ class ArenaBase(SQLModel, table=False):
     max_random_features: int = Field(
         description="Maximum number of random features", ge=0
     )
+    visibility_radius: Optional[float] = Field(
+        default=None,
+        description="How far players can see, in grid cells, unset to see everything",
+        ge=0,
+    )
 
 
 class Arena(ArenaBase, DbBase, table=True):
@@ -85,6 +91,7 @@ class Arena(ArenaBase, DbBase, table=True):
             width=self.width,
             rules=self.rules,
             max_random_features=self.max_random_features,
+            visibility_radius=self.visibility_radius,
             winning_condition=self.winning_condition,
         )
 
@@ -105,6 +112,9 @@ class ArenaUpdate(SQLModel):
     max_random_features: Optional[int] = Field(
         description="Maximum number of random features", ge=0
     )
+    visibility_radius: Optional[float] = Field(
+        default=None, description="How far players can see, in grid cells", ge=0
+    )
 
 
 # -------- Round Models
@@ -125,6 +135,10 @@ class ContestRoundBase(SQLModel, table=False):
     ending_narrative: Optional[str] = Field(
         default=None, description="Round ending narrative"
     )
+    summary: str = Field(
+        default="",
+        description="Rolling summary of the contest through this round",
+    )
     state: ContestRoundState = Field(description="Round state")
 
 
@@ -174,6 +188,7 @@ class ContestRound(ContestRoundBase, DbBase, table=True):
             players=players,
             state=self.state,
             narrative=self.narrative,
+            summary=self.summary,
         )
 
 
@@ -305,6 +320,13 @@ class ContestCreate(SQLModel, table=False):
     participant_ids: List[str] = Field(
         description="IDs of Participants to load", foreign_key="participant.id"
     )
+    auto_advance: bool = Field(
+        default=False, description="Run the contest to the end once advanced"
+    )
+    prestage: Optional[bool] = Field(
+        default=None,
+        description="Set the contest up in the background once created, defaults to the arena config",
+    )
 
 
 class ContestUpdate(ContestBase):
@@ -394,9 +416,18 @@ class JudgeResultBase(SQLModel, table=False):
     memories: str = Field(description="Private memories not shared with players")
     result: str = Field(description="Result description")
     reason: str = Field(default="", description="Reason for the result")
+    effects: Optional[Dict[str, Any]] = Field(
+        default=None,
+        sa_column=Column(JSON),
+        description="Structured effects of the action, see ActionEffects",
+    )
 
 
 class JudgeResult(JudgeResultBase, DbBase, table=True):
+    effects_applied: bool = Field(
+        default=False,
+        description="Whether the effects engine has applied the effects",
+    )
     contestround: ContestRound = Relationship(back_populates="judge_results")
 
     def get_public(self) -> JudgeResultPublic:
@@ -0,0 +1,192 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any
+from typing import AsyncIterator
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Literal
+from typing import Optional
+
+from pydantic import BaseModel
+from pydantic import Field
+
+from agentarena.models.policies import SchedulerPolicy
+
+
+class QueueEntry(BaseModel):
+    """
+    A contest's place in the scheduler.
+    """
+
+    contest_id: str = Field(description="Contest ID")
+    arena_id: str = Field(description="Arena ID")
+    state: Literal["running", "waiting"] = Field(description="Running or waiting")
+    position: int = Field(description="0 while running, else the place in line")
+    seconds: float = Field(description="Seconds running or waiting so far")
+
+
+class Turn:
+    """
+    A contest's claim on the scheduler, waiting or running.
+    """
+
+    def __init__(
+        self, contest_id: str, arena_id: str, weight: float, sequence: int, since: float
+    ):
+        self.contest_id = contest_id
+        self.arena_id = arena_id
+        self.weight = weight
+        self.sequence = sequence
+        self.since = since
+        self.granted: asyncio.Future = asyncio.get_running_loop().create_future()
+
+
+class ContestScheduler:
+    """
+    Shares the arena between contests, one state machine step at a time.
+
+    A contest runs a step while it holds a turn. Turns are limited to
+    `max_contests` overall and `max_per_arena` per arena, and go to the
+    waiting contest with the lowest pass, stride scheduling style: each turn
+    adds 1/weight to the contest's pass, so a contest with a long run of
+    steps gives way to the others by calling `yield_turn` between them.
+    """
+
+    def __init__(
+        self,
+        scheduler: Optional[Dict[str, Any]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.policy = SchedulerPolicy.model_validate(scheduler or {})
+        self.clock = clock
+        self.requests = asyncio.Semaphore(self.policy.max_requests)
+        self.running: Dict[str, Turn] = {}
+        self.waiting: List[Turn] = []
+        self.passes: Dict[str, float] = {}
+        self.sequence = 0
+
+    def weight_for(self, arena_name: str) -> float:
+        if self.policy.strategy == "weighted":
+            return self.policy.weights.get(arena_name, 1.0)
+        return 1.0
+
+    def can_run(self, turn: Turn) -> bool:
+        if turn.contest_id in self.running:
+            return False
+        in_arena = sum(1 for t in self.running.values() if t.arena_id == turn.arena_id)
+        return in_arena < self.policy.max_per_arena
+
+    def in_line(self) -> List[Turn]:
+        """
+        The waiting turns, in the order they would be granted.
+        """
+        return sorted(
+            self.waiting, key=lambda t: (self.passes[t.contest_id], t.sequence)
+        )
+
+    def dispatch(self):
+        while len(self.running) < self.policy.max_contests:
+            turn = next((t for t in self.in_line() if self.can_run(t)), None)
+            if turn is None:
+                return
+            self.waiting.remove(turn)
+            turn.since = self.clock()
+            self.running[turn.contest_id] = turn
+            self.passes[turn.contest_id] += 1.0 / turn.weight
+            turn.granted.set_result(None)
+
+    async def acquire(self, contest_id: str, arena_id: str, weight: float = 1.0):
+        """
+        Wait for a turn for the contest.
+        """
+        if contest_id not in self.passes:
+            # newcomers start level with the others, rather than ahead of them
+            active = [self.passes[t.contest_id] for t in self.waiting] + [
+                self.passes[cid] for cid in self.running
+            ]
+            self.passes[contest_id] = min(active, default=0.0)
+        await self.wait(contest_id, arena_id, weight)
+
+    async def wait(self, contest_id: str, arena_id: str, weight: float):
+        self.sequence += 1
+        turn = Turn(contest_id, arena_id, weight, self.sequence, self.clock())
+        self.waiting.append(turn)
+        self.dispatch()
+        try:
+            await turn.granted
+        except asyncio.CancelledError:
+            if turn in self.waiting:
+                self.waiting.remove(turn)
+            else:
+                self.release(contest_id)
+            raise
+
+    def release(self, contest_id: str):
+        if self.running.pop(contest_id, None) is not None:
+            self.dispatch()
+
+    def forget(self, contest_id: str):
+        if contest_id not in self.running and not any(
+            t.contest_id == contest_id for t in self.waiting
+        ):
+            self.passes.pop(contest_id, None)
+
+    async def yield_turn(self, contest_id: str):
+        """
+        Get back in line if other contests are waiting, and wait for the next
+        turn. Contests call this between the steps of a long run, and keep
+        going at once when theirs is still the lowest pass.
+        """
+        turn = self.running.get(contest_id)
+        if turn is None or not self.waiting:
+            return
+        del self.running[contest_id]
+        await self.wait(contest_id, turn.arena_id, turn.weight)
+
+    @asynccontextmanager
+    async def turn(
+        self, contest_id: str, arena_id: str, weight: float = 1.0
+    ) -> AsyncIterator[None]:
+        await self.acquire(contest_id, arena_id, weight)
+        try:
+            yield
+        finally:
+            self.release(contest_id)
+            self.forget(contest_id)
+
+    @asynccontextmanager
+    async def request_slot(self) -> AsyncIterator[None]:
+        """
+        Hold one of the `max_requests` slots for prompt requests.
+        """
+        async with self.requests:
+            yield
+
+    def queue(self) -> List[QueueEntry]:
+        now = self.clock()
+        entries = [
+            QueueEntry(
+                contest_id=t.contest_id,
+                arena_id=t.arena_id,
+                state="running",
+                position=0,
+                seconds=now - t.since,
+            )
+            for t in self.running.values()
+        ]
+        entries.extend(
+            QueueEntry(
+                contest_id=t.contest_id,
+                arena_id=t.arena_id,
+                state="waiting",
+                position=n,
+                seconds=now - t.since,
+            )
+            for n, t in enumerate(self.in_line(), start=1)
+        )
+        return entries
+
+    def position(self, contest_id: str) -> Optional[QueueEntry]:
+        return next((e for e in self.queue() if e.contest_id == contest_id), None)
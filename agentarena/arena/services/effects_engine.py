@@ -0,0 +1,139 @@
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from pydantic import BaseModel
+from pydantic import Field
+from pydantic import ValidationError
+
+from agentarena.arena.models import Arena
+from agentarena.arena.models import ContestRound
+from agentarena.arena.models import JudgeResult
+from agentarena.arena.models import PlayerState
+from agentarena.models.policies import EffectsPolicy
+from agentarena.models.responses import ActionEffects
+from agentarena.util.spatial import Board
+
+
+class EffectsOutcome(BaseModel):
+    """
+    What the effects engine did with a round.
+    """
+
+    applied: List[str] = Field(default=[], description="Players updated locally")
+    unresolved: List[str] = Field(
+        default=[], description="Players whose effects need the judge"
+    )
+
+
+class EffectsEngine:
+    """
+    Applies structured judge results to player states, deterministically.
+
+    Judges may return `effects` with a judgement: a move, score change, health
+    and items gained or lost. For arenas with an enabled EffectsPolicy, valid
+    effects are applied here, and the judge is only prompted for players whose
+    results have no effects, or effects outside the policy's limits.
+
+    Subclasses can override `resolve` to handle more kinds of outcomes.
+    """
+
+    def __init__(self, effects: Optional[Dict[str, Any]] = None):
+        effects = effects or {}
+        self.default = EffectsPolicy.model_validate(effects.get("default") or {})
+        self.arenas: Dict[str, EffectsPolicy] = {
+            name: EffectsPolicy.model_validate(settings or {})
+            for name, settings in (effects.get("arenas") or {}).items()
+        }
+
+    def policy_for(self, arena: Arena) -> EffectsPolicy:
+        return self.arenas.get(arena.name, self.default)
+
+    def apply(self, contest_round: ContestRound) -> EffectsOutcome:
+        """
+        Apply the effects that can be resolved locally to the round's player
+        states, marking each judge result as applied. The caller commits the
+        session, so a retried step skips the effects it already applied.
+        """
+        arena = contest_round.contest.arena
+        policy = self.policy_for(arena)
+        outcome = EffectsOutcome()
+        if not policy.enabled:
+            outcome.unresolved = [
+                ps.participant_id for ps in contest_round.player_states
+            ]
+            return outcome
+
+        board: Board[str] = Board(arena.width, arena.height)
+        for player_state in contest_round.player_states:
+            board.place_player(player_state.participant_id, player_state.position)
+        results = {jr.participant_id: jr for jr in contest_round.judge_results}
+        for player_state in contest_round.player_states:
+            player_id = player_state.participant_id
+            judge_result = results.get(player_id)
+            if judge_result and judge_result.effects_applied:
+                outcome.applied.append(player_id)
+                continue
+            effects = self.parse_effects(judge_result)
+            if (
+                judge_result
+                and effects
+                and self.resolve(player_state, effects, board, policy)
+            ):
+                judge_result.effects_applied = True
+                outcome.applied.append(player_id)
+            else:
+                outcome.unresolved.append(player_id)
+        return outcome
+
+    def parse_effects(
+        self, judge_result: Optional[JudgeResult]
+    ) -> Optional[ActionEffects]:
+        if not judge_result or not judge_result.effects:
+            return None
+        try:
+            return ActionEffects.model_validate(judge_result.effects)
+        except ValidationError:
+            return None
+
+    def resolve(
+        self,
+        player_state: PlayerState,
+        effects: ActionEffects,
+        board: Board,
+        policy: EffectsPolicy,
+    ) -> bool:
+        """
+        Apply the effects to the player state, if they are all valid. Returns
+        False, leaving the player state unchanged, if any aren't.
+        """
+        position = player_state.position
+        if effects.position:
+            if not board.is_valid(effects.position):
+                return False
+            distance = board.distance(player_state.position, effects.position)
+            if policy.max_move is not None and (
+                distance is None or distance > policy.max_move
+            ):
+                return False
+            position = effects.position
+        if (
+            policy.max_score_change is not None
+            and abs(effects.score) > policy.max_score_change
+        ):
+            return False
+        inventory = list(player_state.inventory or [])
+        for item in effects.remove_items:
+            if item not in inventory:
+                return False
+            inventory.remove(item)
+        inventory.extend(effects.add_items)
+
+        player_state.position = position
+        player_state.score += effects.score
+        if effects.health:
+            player_state.health = effects.health
+        player_state.inventory = inventory
+        board.place_player(player_state.participant_id, position)
+        return True
@@ -0,0 +1,146 @@
+import asyncio
+from collections import Counter
+from collections import deque
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Deque
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from pydantic import BaseModel
+from pydantic import Field
+
+from agentarena.arena.models import Arena
+from agentarena.models.policies import FeaturePoolPolicy
+from agentarena.models.public import ContestPublic
+
+FeatureSet = List[Dict[str, Any]]
+
+
+def pool_request(contest: ContestPublic) -> ContestPublic:
+    """
+    The contest to send when generating a pooled set: only its arena, since
+    the set may be used by any later contest in that arena.
+    """
+    return contest.model_copy(
+        update={"id": "", "participants": [], "rounds": [], "summary": ""}
+    )
+
+
+class FeaturePoolStats(BaseModel):
+    """
+    Pool depth and hit rate for an arena.
+    """
+
+    arena_id: str = Field(description="Arena ID")
+    depth: int = Field(description="Feature sets ready")
+    hits: int = Field(description="Setups served from the pool")
+    misses: int = Field(description="Setups which generated features live")
+    hit_rate: float = Field(description="Hits as a fraction of all setups")
+    refills: int = Field(description="Feature sets generated in the background")
+    failures: int = Field(description="Background generations which failed")
+
+
+class FeaturePool:
+    """
+    Pre-generated random feature sets, per arena.
+
+    Random features only depend on the arena definition, so they can be
+    generated ahead of time. Setup takes a set with `take`, and calls
+    `refill` to top the pool back up in the background. Sets are dropped
+    when the arena is updated, since they may no longer fit it.
+    """
+
+    def __init__(self, feature_pool: Optional[Dict[str, Any]] = None):
+        self.policy = FeaturePoolPolicy.model_validate(feature_pool or {})
+        self.sets: Dict[str, Deque[FeatureSet]] = {}
+        self.versions: Dict[str, Optional[int]] = {}
+        self.refilling: Dict[str, asyncio.Task] = {}
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+        self.refills: Counter[str] = Counter()
+        self.failures: Counter[str] = Counter()
+
+    @property
+    def enabled(self) -> bool:
+        return self.policy.enabled
+
+    def depth(self, arena_id: str) -> int:
+        return len(self.sets.get(arena_id, ()))
+
+    def check_version(self, arena: Arena):
+        if self.versions.get(arena.id) != arena.updated_at:
+            self.sets.pop(arena.id, None)
+            self.versions[arena.id] = arena.updated_at
+
+    def take(self, arena: Arena) -> Optional[FeatureSet]:
+        """
+        A feature set for the arena, or None if the pool is empty.
+        """
+        self.check_version(arena)
+        pool = self.sets.get(arena.id)
+        if pool:
+            self.hits[arena.id] += 1
+            return pool.popleft()
+        self.misses[arena.id] += 1
+        return None
+
+    def refill(
+        self, arena: Arena, generate: Callable[[], Awaitable[Optional[FeatureSet]]]
+    ) -> Optional[asyncio.Task]:
+        """
+        Fill the arena's pool up to depth in the background, one `generate`
+        call per set, unless it is already being refilled.
+        """
+        if not self.enabled:
+            return None
+        self.check_version(arena)
+        task = self.refilling.get(arena.id)
+        if task is None and self.depth(arena.id) < self.policy.depth:
+            task = asyncio.create_task(
+                self._refill(arena.id, arena.updated_at, generate)
+            )
+            self.refilling[arena.id] = task
+        return task
+
+    async def _refill(
+        self,
+        arena_id: str,
+        version: Optional[int],
+        generate: Callable[[], Awaitable[Optional[FeatureSet]]],
+    ):
+        try:
+            while self.depth(arena_id) < self.policy.depth:
+                try:
+                    features = await generate()
+                except Exception:
+                    features = None
+                if not features:
+                    self.failures[arena_id] += 1
+                    return
+                if self.versions.get(arena_id) != version:
+                    return
+                self.sets.setdefault(arena_id, deque()).append(features)
+                self.refills[arena_id] += 1
+        finally:
+            self.refilling.pop(arena_id, None)
+
+    def stats(self) -> List[FeaturePoolStats]:
+        arena_ids = sorted(self.versions)
+        stats = []
+        for arena_id in arena_ids:
+            served = self.hits[arena_id] + self.misses[arena_id]
+            stats.append(
+                FeaturePoolStats(
+                    arena_id=arena_id,
+                    depth=self.depth(arena_id),
+                    hits=self.hits[arena_id],
+                    misses=self.misses[arena_id],
+                    hit_rate=self.hits[arena_id] / served if served else 0.0,
+                    refills=self.refills[arena_id],
+                    failures=self.failures[arena_id],
+                )
+            )
+        return stats
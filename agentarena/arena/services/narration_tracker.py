@@ -0,0 +1,96 @@
+import asyncio
+from typing import Any
+from typing import Awaitable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from agentarena.models.policies import NarrationPolicy
+
+
+class NarrationTracker:
+    """
+    Tracks the announcer narrations running in the background, by contest and
+    round number.
+
+    Round machines start a narration when background narration is on, and move
+    straight on to completing the round. The contest machine waits for the
+    narrations which have fallen more than `max_lag` rounds behind before
+    starting a round, and collects the finished narratives to save them. The
+    narratives are kept here until collected, so they survive the contest
+    machine being rebuilt between steps.
+    """
+
+    def __init__(self, narration: Optional[Dict[str, Any]] = None):
+        self.policy = NarrationPolicy.model_validate(narration or {})
+        self.pending: Dict[str, Dict[int, asyncio.Task]] = {}
+
+    @property
+    def background(self) -> bool:
+        return self.policy.background
+
+    def start(
+        self, contest_id: str, round_no: int, narration: Awaitable[Optional[str]]
+    ) -> asyncio.Task:
+        """
+        Run a narration in the background, resolving to the narrative or None.
+        """
+        task = asyncio.ensure_future(narration)
+        self.pending.setdefault(contest_id, {})[round_no] = task
+        return task
+
+    def pending_rounds(self, contest_id: str) -> List[int]:
+        return sorted(self.pending.get(contest_id, {}))
+
+    async def wait_through(self, contest_id: str, round_no: int):
+        """
+        Wait for the narrations of rounds up to and including `round_no`.
+        """
+        tasks = [
+            task
+            for n, task in self.pending.get(contest_id, {}).items()
+            if n <= round_no
+        ]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def before_round(self, contest_id: str, round_no: int):
+        """
+        Wait until narration is at most `max_lag` rounds behind `round_no`.
+        """
+        await self.wait_through(contest_id, round_no - 1 - self.policy.max_lag)
+
+    async def drain(self, contest_id: str):
+        rounds = self.pending_rounds(contest_id)
+        if rounds:
+            await self.wait_through(contest_id, rounds[-1])
+
+    def cancel(self, contest_id: str):
+        """
+        Cancel and forget the narrations of a contest which won't collect
+        them, such as one which failed.
+        """
+        for task in self.pending.pop(contest_id, {}).values():
+            task.cancel()
+
+    def collect(self, contest_id: str) -> List[Tuple[int, Optional[str]]]:
+        """
+        Remove and return the finished narratives, in round order, stopping
+        at the first round still being narrated so that summaries are always
+        built on the previous round's. Failed narrations return None.
+        """
+        tasks = self.pending.get(contest_id, {})
+        finished: List[Tuple[int, Optional[str]]] = []
+        for round_no in sorted(tasks):
+            task = tasks[round_no]
+            if not task.done():
+                break
+            del tasks[round_no]
+            narrative = None
+            if not task.cancelled() and task.exception() is None:
+                narrative = task.result()
+            finished.append((round_no, narrative))
+        if not tasks:
+            self.pending.pop(contest_id, None)
+        return finished
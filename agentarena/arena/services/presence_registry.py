@@ -0,0 +1,56 @@
+import time
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from agentarena.models.policies import PresencePolicy
+from agentarena.models.requests import Heartbeat
+
+
+class PresenceRegistry:
+    """
+    In-memory map of the participants known to be up, and until when.
+
+    Actor nodes publish a Heartbeat listing their participants every few
+    seconds, so role call can look participants up here, and only probe the
+    ones which are unknown or whose heartbeats have stopped.
+    """
+
+    def __init__(
+        self,
+        presence: Optional[Dict[str, Any]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.policy = PresencePolicy.model_validate(presence or {})
+        self.clock = clock
+        self.expires: Dict[str, float] = {}
+
+    def record(self, heartbeat: Heartbeat):
+        expires = self.clock() + heartbeat.interval * self.policy.missed_beats
+        for participant_id in heartbeat.participants:
+            self.expires[participant_id] = max(
+                expires, self.expires.get(participant_id, 0.0)
+            )
+
+    def mark_present(self, participant_id: str):
+        """
+        Record a successful health probe.
+        """
+        expires = self.clock() + self.policy.probe_ttl
+        self.expires[participant_id] = max(
+            expires, self.expires.get(participant_id, 0.0)
+        )
+
+    def mark_absent(self, participant_id: str):
+        self.expires.pop(participant_id, None)
+
+    def is_present(self, participant_id: str) -> bool:
+        return self.expires.get(participant_id, 0.0) > self.clock()
+
+    def unconfirmed(self, participant_ids: List[str]) -> List[str]:
+        """
+        The participants which are unknown, or whose presence has expired.
+        """
+        return [pid for pid in participant_ids if not self.is_present(pid)]
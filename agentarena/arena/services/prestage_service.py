@@ -0,0 +1,57 @@
+import asyncio
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from agentarena.models.policies import PrestagePolicy
+
+
+class PrestageService:
+    """
+    Runs contest setup in the background, a few contests at a time.
+
+    Contests wait for a slot in creation order. Anything else which runs the
+    contest machine should `wait` for a contest's prestage first, so two
+    machines never run the same contest.
+    """
+
+    def __init__(self, prestage: Optional[Dict[str, Any]] = None):
+        self.policy = PrestagePolicy.model_validate(prestage or {})
+        self.slots = asyncio.Semaphore(self.policy.max_concurrent)
+        self.tasks: Dict[str, asyncio.Task] = {}
+
+    def wants(self, requested: Optional[bool]) -> bool:
+        """
+        Whether to prestage a contest, from its request or the default.
+        """
+        return self.policy.default if requested is None else requested
+
+    def start(
+        self, contest_id: str, setup: Callable[[], Awaitable[Any]]
+    ) -> asyncio.Task:
+        task = self.tasks.get(contest_id)
+        if task is None:
+            task = asyncio.create_task(self._run(contest_id, setup))
+            self.tasks[contest_id] = task
+        return task
+
+    async def _run(self, contest_id: str, setup: Callable[[], Awaitable[Any]]):
+        try:
+            async with self.slots:
+                await setup()
+        finally:
+            self.tasks.pop(contest_id, None)
+
+    def pending(self) -> List[str]:
+        return list(self.tasks)
+
+    async def wait(self, contest_id: str):
+        """
+        Wait for a contest's prestage to finish, if it is running.
+        """
+        task = self.tasks.get(contest_id)
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
@@ -0,0 +1,160 @@
+import time
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+
+from nats.aio.msg import Msg
+
+from agentarena.arena.models import Participant
+from agentarena.arena.services.timeout_service import TimeoutService
+from agentarena.core.services.circuit_breaker import CircuitBreaker
+from agentarena.models.constants import BreakerState
+from agentarena.models.constants import JobResponseState
+from agentarena.models.policies import BreakerPolicy
+from agentarena.models.policies import DispatchPolicy
+from agentarena.util.response_parsers import ResponseKind
+from agentarena.util.response_parsers import parse_response
+
+
+def succeeded(msg: Msg) -> bool:
+    """
+    Whether a response has data and isn't a FAIL job response.
+    """
+    if not msg.data:
+        return False
+    parsed = parse_response(msg.data, ResponseKind.TEXT, save_failures=False)
+    return parsed.state != JobResponseState.FAIL.value
+
+
+class RoleDispatcher:
+    """
+    Spreads requests across all the participants of a role, such as the
+    judges or announcers of a contest.
+
+    Each request goes to the participant with the least load: the fewest
+    requests in flight, weighted by median latency with the `latency`
+    strategy. Ties go to the participant used least recently, so sequential
+    requests rotate. Participants which keep failing are left out while
+    their breaker is open, unless no one else is left.
+    """
+
+    def __init__(
+        self,
+        timeout_service: TimeoutService,
+        dispatch: Optional[Dict[str, Any]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.policy = DispatchPolicy.model_validate(dispatch or {})
+        self.timeout_service = timeout_service
+        self.clock = clock
+        self.breaker_policy = BreakerPolicy(
+            failure_threshold=self.policy.failure_threshold,
+            reset_timeout=self.policy.reset_timeout,
+        )
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.outstanding: Dict[str, int] = {}
+        self.last_used: Dict[str, int] = {}
+        self.sequence = 0
+
+    def breaker(self, participant_id: str) -> CircuitBreaker:
+        if participant_id not in self.breakers:
+            self.breakers[participant_id] = CircuitBreaker(
+                self.breaker_policy, self.clock
+            )
+        return self.breakers[participant_id]
+
+    def is_healthy(self, participant_id: str) -> bool:
+        return self.breaker(participant_id).state != BreakerState.OPEN
+
+    def expected_latency(self, participant_id: str, kind: str) -> Optional[float]:
+        return self.timeout_service.latency.percentile(
+            self.timeout_service.model_key(participant_id), kind, 50
+        )
+
+    def load(self, participant_id: str, kind: str, default_latency: float) -> float:
+        outstanding = self.outstanding.get(participant_id, 0)
+        if self.policy.strategy == "latency":
+            latency = self.expected_latency(participant_id, kind)
+            if latency is None:
+                latency = default_latency
+            return (outstanding + 1) * latency
+        return outstanding
+
+    def choose(
+        self,
+        participants: List[Participant],
+        kind: str,
+        exclude: Iterable[str] = (),
+    ) -> Optional[Participant]:
+        """
+        The participant to send the next request of `kind` to, or None if
+        all of them are excluded.
+        """
+        excluded = set(exclude)
+        candidates = [p for p in participants if p.id not in excluded]
+        if not candidates:
+            return None
+        # with every participant left out, try anyway rather than fail
+        candidates = [p for p in candidates if self.is_healthy(p.id)] or candidates
+        known = [
+            latency
+            for latency in (self.expected_latency(p.id, kind) for p in candidates)
+            if latency is not None
+        ]
+        # participants without history are assumed as fast as the fastest
+        default_latency = min(known) if known else 1.0
+        return min(
+            candidates,
+            key=lambda p: (
+                self.load(p.id, kind, default_latency),
+                self.last_used.get(p.id, -1),
+            ),
+        )
+
+    async def request(
+        self,
+        participants: List[Participant],
+        kind: str,
+        send: Callable[[Participant], Awaitable[Msg]],
+    ) -> Msg:
+        """
+        Send a request with `send` to the chosen participant, trying the next
+        one if it fails, returns nothing or returns a FAIL job response, up to
+        `max_attempts`. Returns the
+        last response, or raises the last error if there wasn't one.
+        """
+        tried: List[str] = []
+        msg: Optional[Msg] = None
+        error: Optional[Exception] = None
+        for _ in range(self.policy.max_attempts):
+            participant = self.choose(participants, kind, exclude=tried)
+            if participant is None:
+                break
+            participant_id = participant.id
+            tried.append(participant_id)
+            self.sequence += 1
+            self.last_used[participant_id] = self.sequence
+            self.outstanding[participant_id] = (
+                self.outstanding.get(participant_id, 0) + 1
+            )
+            try:
+                msg = await send(participant)
+            except Exception as e:
+                error = e
+                self.breaker(participant_id).record_failure()
+                continue
+            finally:
+                self.outstanding[participant_id] -= 1
+            if succeeded(msg):
+                self.breaker(participant_id).record_success()
+                return msg
+            self.breaker(participant_id).record_failure()
+        if msg is not None:
+            return msg
+        if error is not None:
+            raise error
+        raise ValueError(f"No participants to send {kind} request to")
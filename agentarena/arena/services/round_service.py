@@ -1,5 +1,6 @@
 import json
 from typing import List
+from typing import Optional
 
 from sqlmodel import Session
 
@@ -16,6 +17,7 @@ from agentarena.core.services.model_service import ModelService
 from agentarena.core.services.uuid_service import UUIDService
 from agentarena.models.constants import ContestRoundState
 from agentarena.models.constants import RoleType
+from agentarena.util.spatial import Board
 
 
 class RoundService(ModelService[ContestRound, ContestRoundCreate]):
@@ -73,11 +75,12 @@ class RoundService(ModelService[ContestRound, ContestRoundCreate]):
         log.info("Added round to contest")
         session.flush()
         player_states: List[PlayerState] = []
+        board: Board[str] = Board(contest.arena.width, contest.arena.height)
         ct = 0
         for player in players:
             player_states.append(
                 await self.create_player_state(
-                    contest, round.id, round_no, ct, player, session
+                    contest, round.id, round_no, ct, player, session, board=board
                 )
             )
             ct += 1
@@ -94,9 +97,12 @@ class RoundService(ModelService[ContestRound, ContestRoundCreate]):
         ix: int,
         player: Participant,
         session: Session,
+        board: Optional[Board] = None,
     ) -> PlayerState:
         """
-        Create a new player state for a contest round.
+        Create a new player state for a contest round. With a `board`, start
+        positions which are off the board or already taken are moved to the
+        nearest free cell, and the player is placed on the board.
         """
         log = self.log.bind(
             contest_id=contest.id,
@@ -111,6 +117,10 @@ class RoundService(ModelService[ContestRound, ContestRoundCreate]):
             positions = json.loads(contest.player_positions)
             assert len(positions) > ix, "Player position not found"
             position = positions[ix]
+            if board and not board.is_free(position):
+                moved = board.nearest_free(position)
+                log.warn("Start position unavailable", position=position, moved=moved)
+                position = moved or position
             score = 0
             health = "Fresh"
             inventory = []
@@ -127,6 +137,8 @@ class RoundService(ModelService[ContestRound, ContestRoundCreate]):
             health = last_player_state.health
             inventory = last_player_state.inventory
 
+        if board:
+            board.place_player(player.id, position)
         pc = PlayerStateCreate(
             participant_id=player.id,
             contestround_id=round_id,
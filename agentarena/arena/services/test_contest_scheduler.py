@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+
+from agentarena.arena.services.contest_scheduler import ContestScheduler
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_caps_contests_overall_and_per_arena():
+    scheduler = ContestScheduler({"max_contests": 2, "max_per_arena": 1})
+    tasks = [
+        asyncio.ensure_future(scheduler.acquire(cid, arena))
+        for cid, arena in [("c1", "a1"), ("c2", "a1"), ("c3", "a2"), ("c4", "a3")]
+    ]
+    await settle()
+    assert sorted(scheduler.running) == ["c1", "c3"]
+
+    queue = scheduler.queue()
+    assert [(e.contest_id, e.position) for e in queue if e.state == "waiting"] == [
+        ("c2", 1),
+        ("c4", 2),
+    ]
+    assert scheduler.position("c4").position == 2
+
+    scheduler.release("c1")
+    await settle()
+    # c2 was first in line, and a1 is free again
+    assert sorted(scheduler.running) == ["c2", "c3"]
+    scheduler.release("c3")
+    await asyncio.gather(*tasks)
+    assert sorted(scheduler.running) == ["c2", "c4"]
+
+
+@pytest.mark.asyncio
+async def test_yield_turn_round_robins():
+    scheduler = ContestScheduler({"max_contests": 1})
+    steps = []
+
+    async def run(contest_id: str, count: int):
+        async with scheduler.turn(contest_id, contest_id):
+            for n in range(count):
+                steps.append((contest_id, n))
+                await asyncio.sleep(0)  # the step's requests
+                await scheduler.yield_turn(contest_id)
+
+    await asyncio.gather(run("big", 4), run("small", 2))
+    assert steps == [
+        ("big", 0),
+        ("small", 0),
+        ("big", 1),
+        ("small", 1),
+        ("big", 2),
+        ("big", 3),
+    ]
+    assert scheduler.running == {}
+    assert scheduler.passes == {}
+
+
+@pytest.mark.asyncio
+async def test_weighted_contests_get_more_turns():
+    scheduler = ContestScheduler(
+        {"max_contests": 1, "strategy": "weighted", "weights": {"League": 2.0}}
+    )
+    steps = []
+
+    async def run(contest_id: str, weight: float):
+        async with scheduler.turn(contest_id, contest_id, weight):
+            for _ in range(6):
+                steps.append(contest_id)
+                await asyncio.sleep(0)
+                await scheduler.yield_turn(contest_id)
+
+    await asyncio.gather(
+        run("league", scheduler.weight_for("League")),
+        run("demo", scheduler.weight_for("Demo")),
+    )
+    assert steps[:6].count("league") == 4
+    assert steps[:6].count("demo") == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_wait_leaves_the_line():
+    scheduler = ContestScheduler({"max_contests": 1})
+    await scheduler.acquire("c1", "a1")
+    waiting = asyncio.ensure_future(scheduler.acquire("c2", "a1"))
+    await settle()
+    waiting.cancel()
+    await asyncio.gather(waiting, return_exceptions=True)
+    assert scheduler.waiting == []
+    scheduler.release("c1")
+    assert scheduler.running == {}
+
+
+@pytest.mark.asyncio
+async def test_request_slots_cap_requests_in_flight():
+    scheduler = ContestScheduler({"max_requests": 2})
+    gate = asyncio.Event()
+    in_flight = []
+
+    async def request():
+        async with scheduler.request_slot():
+            in_flight.append(1)
+            await gate.wait()
+
+    tasks = [asyncio.ensure_future(request()) for _ in range(5)]
+    await settle()
+    assert len(in_flight) == 2
+    gate.set()
+    await asyncio.gather(*tasks)
+    assert len(in_flight) == 5
@@ -0,0 +1,115 @@
+from unittest.mock import MagicMock
+
+from agentarena.arena.models import Arena
+from agentarena.arena.models import JudgeResult
+from agentarena.arena.models import PlayerState
+from agentarena.arena.services.effects_engine import EffectsEngine
+
+
+def make_round(effects_by_player):
+    arena = Arena(
+        name="Test Arena",
+        description="",
+        height=10,
+        width=10,
+        rules="",
+        winning_condition="",
+        max_random_features=0,
+    )
+    player_states = [
+        PlayerState(
+            participant_id=pid,
+            contestround_id="round1",
+            position="1,1",
+            inventory=["rock"],
+            score=50,
+        )
+        for pid in effects_by_player
+    ]
+    judge_results = [
+        JudgeResult(
+            participant_id=pid,
+            contestround_id="round1",
+            narration="",
+            memories="",
+            result="",
+            effects=effects,
+        )
+        for pid, effects in effects_by_player.items()
+    ]
+    contest_round = MagicMock(player_states=player_states, judge_results=judge_results)
+    contest_round.contest.arena = arena
+    return contest_round
+
+
+def test_disabled_leaves_everything_to_judge():
+    contest_round = make_round({"p1": {"position": "2,2"}})
+    outcome = EffectsEngine().apply(contest_round)
+
+    assert outcome.applied == []
+    assert outcome.unresolved == ["p1"]
+    assert contest_round.player_states[0].position == "1,1"
+
+
+def test_applies_valid_effects():
+    engine = EffectsEngine({"default": {"enabled": True}})
+    contest_round = make_round(
+        {
+            "p1": {
+                "position": "2,3",
+                "score": 60,
+                "health": "winded",
+                "add_items": ["fruit"],
+                "remove_items": ["rock"],
+            },
+            "p2": None,
+        }
+    )
+    outcome = engine.apply(contest_round)
+
+    assert outcome.applied == ["p1"]
+    assert outcome.unresolved == ["p2"]
+    p1 = contest_round.player_states[0]
+    assert (p1.position, p1.score, p1.health, p1.inventory) == (
+        "2,3",
+        110,
+        "winded",
+        ["fruit"],
+    )
+
+
+def test_applied_effects_are_not_applied_again():
+    engine = EffectsEngine({"default": {"enabled": True}})
+    contest_round = make_round({"p1": {"position": "2,3", "score": 10}})
+
+    engine.apply(contest_round)
+    # the step is retried after the judge failed
+    outcome = engine.apply(contest_round)
+
+    assert outcome.applied == ["p1"]
+    assert contest_round.judge_results[0].effects_applied
+    p1 = contest_round.player_states[0]
+    assert (p1.position, p1.score) == ("2,3", 60)
+
+
+def test_invalid_effects_go_to_judge():
+    engine = EffectsEngine(
+        {
+            "default": {"enabled": True},
+            "arenas": {"Test Arena": {"enabled": True, "max_move": 2}},
+        }
+    )
+    contest_round = make_round(
+        {
+            "off_board": {"position": "11,1"},
+            "too_far": {"position": "5,5"},
+            "missing_item": {"remove_items": ["sword"]},
+            "not_effects": {"position": 12},
+        }
+    )
+    outcome = engine.apply(contest_round)
+
+    assert outcome.applied == []
+    assert len(outcome.unresolved) == 4
+    for player_state in contest_round.player_states:
+        assert (player_state.position, player_state.inventory) == ("1,1", ["rock"])
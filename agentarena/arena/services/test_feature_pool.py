@@ -0,0 +1,108 @@
+import pytest
+
+from agentarena.arena.models import Arena
+from agentarena.arena.services.feature_pool import FeaturePool
+from agentarena.arena.services.feature_pool import pool_request
+from agentarena.models.constants import ContestRoundState
+from agentarena.models.public import ContestPublic
+from agentarena.models.public import ContestRoundPublic
+from agentarena.models.public import PlayerPublic
+
+
+def make_arena(updated_at: int = 1) -> Arena:
+    return Arena(
+        id="arena1",
+        name="Test Arena",
+        description="",
+        height=10,
+        width=10,
+        rules="",
+        winning_condition="",
+        max_random_features=2,
+        updated_at=updated_at,
+    )
+
+
+def counting_generator():
+    calls = []
+
+    async def generate():
+        calls.append(len(calls))
+        return [{"name": f"rock {len(calls)}", "position": "1,1"}]
+
+    return generate, calls
+
+
+@pytest.mark.asyncio
+async def test_refill_then_take():
+    pool = FeaturePool({"enabled": True, "depth": 2})
+    arena = make_arena()
+    generate, calls = counting_generator()
+
+    assert pool.take(arena) is None
+    await pool.refill(arena, generate)
+    assert len(calls) == 2
+    assert pool.depth(arena.id) == 2
+
+    assert pool.take(arena) == [{"name": "rock 1", "position": "1,1"}]
+    stats = pool.stats()[0]
+    assert (stats.depth, stats.hits, stats.misses) == (1, 1, 1)
+    assert stats.hit_rate == 0.5
+    assert stats.refills == 2
+
+    await pool.refill(arena, generate)
+    assert len(calls) == 3
+    assert pool.depth(arena.id) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_generation_stops_refill():
+    pool = FeaturePool({"enabled": True, "depth": 3})
+    arena = make_arena()
+
+    async def generate():
+        raise TimeoutError()
+
+    await pool.refill(arena, generate)
+    assert pool.depth(arena.id) == 0
+    assert pool.stats()[0].failures == 1
+    assert arena.id not in pool.refilling
+
+
+@pytest.mark.asyncio
+async def test_arena_update_drops_sets():
+    pool = FeaturePool({"enabled": True, "depth": 1})
+    generate, _ = counting_generator()
+    await pool.refill(make_arena(updated_at=1), generate)
+    assert pool.depth("arena1") == 1
+
+    assert pool.take(make_arena(updated_at=2)) is None
+
+
+def test_disabled_pool_does_not_refill():
+    pool = FeaturePool()
+    generate, calls = counting_generator()
+    assert pool.refill(make_arena(), generate) is None
+
+
+def test_pool_request_has_only_the_arena():
+    arena = make_arena().get_public()
+    contest = ContestPublic(
+        id="contest1",
+        arena=arena,
+        auto_advance=False,
+        start_time=0,
+        end_time=0,
+        rounds=[
+            ContestRoundPublic(
+                round_no=0,
+                players=[PlayerPublic(id="p1", name="p1", position="1,1")],
+                state=ContestRoundState.IDLE,
+            )
+        ],
+    )
+
+    request = pool_request(contest)
+    assert request.arena == arena
+    assert (request.id, request.rounds, request.participants) == ("", [], [])
+    assert contest.id == "contest1"
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from agentarena.arena.services.narration_tracker import NarrationTracker
+
+
+async def narrate(gate: asyncio.Event, narrative: str):
+    await gate.wait()
+    return narrative
+
+
+async def fail():
+    raise RuntimeError("announcer went away")
+
+
+def test_background_is_off_by_default():
+    assert not NarrationTracker().background
+    assert NarrationTracker({"background": True}).background
+
+
+@pytest.mark.asyncio
+async def test_collect_stops_at_unfinished_round():
+    tracker = NarrationTracker({"background": True})
+    gates = [asyncio.Event() for _ in range(3)]
+    for n, gate in enumerate(gates):
+        tracker.start("c1", n, narrate(gate, f"round {n}"))
+
+    gates[0].set()
+    gates[2].set()
+    await tracker.wait_through("c1", 0)
+    await asyncio.sleep(0)
+
+    assert tracker.collect("c1") == [(0, "round 0")]
+    assert tracker.pending_rounds("c1") == [1, 2]
+
+    gates[1].set()
+    await tracker.drain("c1")
+    assert tracker.collect("c1") == [(1, "round 1"), (2, "round 2")]
+    assert tracker.pending_rounds("c1") == []
+
+
+@pytest.mark.asyncio
+async def test_before_round_waits_beyond_max_lag():
+    tracker = NarrationTracker({"background": True, "max_lag": 1})
+    gate = asyncio.Event()
+    tracker.start("c1", 0, narrate(gate, "round 0"))
+
+    # round 1 may start while round 0 is narrated
+    await asyncio.wait_for(tracker.before_round("c1", 1), timeout=1)
+
+    waiting = asyncio.ensure_future(tracker.before_round("c1", 2))
+    await asyncio.sleep(0.01)
+    assert not waiting.done()
+    gate.set()
+    await asyncio.wait_for(waiting, timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_failed_narration_collects_none():
+    tracker = NarrationTracker({"background": True})
+    tracker.start("c1", 0, fail())
+    await tracker.drain("c1")
+    assert tracker.collect("c1") == [(0, None)]
+
+
+@pytest.mark.asyncio
+async def test_cancel_drops_contest_narrations():
+    tracker = NarrationTracker({"background": True})
+    task = tracker.start("c1", 0, narrate(asyncio.Event(), "round 0"))
+    tracker.start("c2", 0, narrate(asyncio.Event(), "other contest"))
+
+    tracker.cancel("c1")
+    await asyncio.sleep(0)
+
+    assert task.cancelled()
+    assert tracker.pending_rounds("c1") == []
+    assert tracker.pending_rounds("c2") == [0]
+    tracker.cancel("c2")
@@ -0,0 +1,36 @@
+from agentarena.arena.services.presence_registry import PresenceRegistry
+from agentarena.models.requests import Heartbeat
+
+
+def make_registry(now):
+    return PresenceRegistry({"missed_beats": 3, "probe_ttl": 5}, clock=lambda: now[0])
+
+
+def test_heartbeat_marks_participants_present_until_missed():
+    now = [100.0]
+    registry = make_registry(now)
+    registry.record(Heartbeat(node_id="n1", participants=["p1", "p2"], interval=10))
+
+    assert registry.unconfirmed(["p1", "p2", "p3"]) == ["p3"]
+    now[0] = 129.0
+    assert registry.is_present("p1")
+    now[0] = 131.0
+    assert registry.unconfirmed(["p1", "p2"]) == ["p1", "p2"]
+
+
+def test_probe_results():
+    now = [0.0]
+    registry = make_registry(now)
+    registry.mark_present("p1")
+    assert registry.is_present("p1")
+    now[0] = 6.0
+    assert not registry.is_present("p1")
+
+    registry.record(Heartbeat(node_id="n1", participants=["p1"], interval=10))
+    # a short probe doesn't cut a heartbeat short
+    registry.mark_present("p1")
+    now[0] = 30.0
+    assert registry.is_present("p1")
+
+    registry.mark_absent("p1")
+    assert not registry.is_present("p1")
@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from agentarena.arena.services.prestage_service import PrestageService
+
+
+def test_wants_follows_request_then_default():
+    service = PrestageService()
+    assert not service.wants(None)
+    assert service.wants(True)
+
+    service = PrestageService({"default": True})
+    assert service.wants(None)
+    assert not service.wants(False)
+
+
+@pytest.mark.asyncio
+async def test_setups_run_within_budget():
+    service = PrestageService({"max_concurrent": 2})
+    gate = asyncio.Event()
+    running = []
+    peak = [0]
+
+    async def setup():
+        running.append(1)
+        peak[0] = max(peak[0], len(running))
+        await gate.wait()
+        running.pop()
+
+    for n in range(4):
+        service.start(f"c{n}", setup)
+    await asyncio.sleep(0.01)
+    assert len(running) == 2
+    assert sorted(service.pending()) == ["c0", "c1", "c2", "c3"]
+
+    gate.set()
+    for n in range(4):
+        await service.wait(f"c{n}")
+    assert peak[0] == 2
+    assert service.pending() == []
+
+
+@pytest.mark.asyncio
+async def test_wait_ignores_failed_setup():
+    service = PrestageService()
+
+    async def setup():
+        raise RuntimeError("role call failed")
+
+    service.start("c1", setup)
+    await service.wait("c1")
+    await service.wait("unknown")
+    assert service.pending() == []
@@ -0,0 +1,142 @@
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from agentarena.arena.models import Participant
+from agentarena.arena.services.role_dispatcher import RoleDispatcher
+from agentarena.arena.services.timeout_service import TimeoutService
+from agentarena.models.constants import PromptType
+from agentarena.models.constants import RoleType
+
+KIND = PromptType.JUDGE_PLAYER_ACTION_JUDGEMENT
+
+
+def make_judges(count: int):
+    return [
+        Participant(
+            id=f"j{n}",
+            name=f"Judge {n}",
+            description="",
+            endpoint="",
+            role=RoleType.JUDGE,
+        )
+        for n in range(count)
+    ]
+
+
+def reply(data: bytes = b"ok"):
+    return MagicMock(data=data)
+
+
+@pytest.mark.asyncio
+async def test_sequential_requests_rotate():
+    dispatcher = RoleDispatcher(TimeoutService())
+    judges = make_judges(3)
+    used = []
+
+    async def send(judge):
+        used.append(judge.id)
+        return reply()
+
+    for _ in range(4):
+        await dispatcher.request(judges, KIND, send)
+    assert used == ["j0", "j1", "j2", "j0"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_spread_by_outstanding():
+    dispatcher = RoleDispatcher(TimeoutService())
+    judges = make_judges(2)
+    gate = asyncio.Event()
+    used = []
+
+    async def send(judge):
+        used.append(judge.id)
+        await gate.wait()
+        return reply()
+
+    tasks = [
+        asyncio.ensure_future(dispatcher.request(judges, KIND, send)) for _ in range(4)
+    ]
+    await asyncio.sleep(0)
+    assert dispatcher.outstanding == {"j0": 2, "j1": 2}
+    gate.set()
+    await asyncio.gather(*tasks)
+    assert sorted(used) == ["j0", "j0", "j1", "j1"]
+    assert dispatcher.outstanding == {"j0": 0, "j1": 0}
+
+
+def test_latency_strategy_prefers_faster_judge():
+    timeout_service = TimeoutService()
+    for _ in range(3):
+        timeout_service.record("j0", KIND, 10.0)
+        timeout_service.record("j1", KIND, 2.0)
+    dispatcher = RoleDispatcher(timeout_service, {"strategy": "latency"})
+    judges = make_judges(2)
+
+    assert dispatcher.choose(judges, KIND).id == "j1"
+    # three in flight on the fast judge still beats one on the slow one
+    dispatcher.outstanding["j1"] = 3
+    assert dispatcher.choose(judges, KIND).id == "j1"
+    dispatcher.outstanding["j1"] = 5
+    assert dispatcher.choose(judges, KIND).id == "j0"
+
+
+@pytest.mark.asyncio
+async def test_failing_judge_is_retried_elsewhere_and_left_out():
+    now = [0.0]
+    dispatcher = RoleDispatcher(
+        TimeoutService(),
+        {"failure_threshold": 1, "reset_timeout": 30},
+        clock=lambda: now[0],
+    )
+    judges = make_judges(2)
+    used = []
+
+    async def send(judge):
+        used.append(judge.id)
+        if judge.id == "j0":
+            raise asyncio.TimeoutError()
+        return reply(judge.id.encode())
+
+    msg = await dispatcher.request(judges, KIND, send)
+    assert msg.data == b"j1"
+    assert not dispatcher.is_healthy("j0")
+
+    used.clear()
+    for _ in range(2):
+        await dispatcher.request(judges, KIND, send)
+    assert used == ["j1", "j1"]
+
+    now[0] = 31.0
+    assert dispatcher.is_healthy("j0")
+
+
+@pytest.mark.asyncio
+async def test_fail_response_tries_next_judge():
+    dispatcher = RoleDispatcher(TimeoutService(), {"failure_threshold": 1})
+    judges = make_judges(2)
+    fail = json.dumps({"state": "fail", "data": None, "message": "no model"})
+
+    async def send(judge):
+        if judge.id == "j0":
+            return reply(fail.encode())
+        return reply(json.dumps({"state": "complete", "data": "ok"}).encode())
+
+    msg = await dispatcher.request(judges, KIND, send)
+    assert json.loads(msg.data)["state"] == "complete"
+    assert not dispatcher.is_healthy("j0")
+    assert dispatcher.is_healthy("j1")
+
+
+@pytest.mark.asyncio
+async def test_raises_when_every_attempt_fails():
+    dispatcher = RoleDispatcher(TimeoutService(), {"max_attempts": 3})
+
+    async def send(judge):
+        raise asyncio.TimeoutError()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await dispatcher.request(make_judges(2), KIND, send)
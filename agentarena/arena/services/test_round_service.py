@@ -165,6 +165,14 @@ def contest_ctrl(
     message_broker,
     template_service,
     logging,
+    timeout_service,
+    effects_engine,
+    narration_tracker,
+    dispatcher,
+    presence,
+    feature_pool,
+    prestage_service,
+    scheduler,
 ):
     return ContestController(
         feature_service=feature_service,
@@ -174,6 +182,14 @@ def contest_ctrl(
         model_service=contest_service,
         template_service=template_service,
         logging=logging,
+        timeout_service=timeout_service,
+        effects_engine=effects_engine,
+        narration_tracker=narration_tracker,
+        dispatcher=dispatcher,
+        presence=presence,
+        feature_pool=feature_pool,
+        prestage_service=prestage_service,
+        scheduler=scheduler,
     )
 
 
@@ -238,3 +254,43 @@ async def test_create_round(
         assert round.player_states[0].inventory == []
         assert round.player_states[0].health == "Fresh"
         assert round.player_states[0].score == 0
+
+
+@pytest.mark.asyncio
+async def test_create_round_moves_start_positions(
+    db_service, round_service, participant_service, arena_ctrl, contest_ctrl
+):
+    """Test that start positions off the board or already taken are moved"""
+    with db_service.get_session() as session:
+        players = []
+        for name in ["Taken", "Clash", "Outside"]:
+            player, _ = await participant_service.create(
+                ParticipantCreate(
+                    name=name,
+                    description="Test Description",
+                    role=RoleType.PLAYER,
+                    endpoint="http://localhost:8000/test/$ID$",
+                ),
+                session,
+            )
+            players.append(player)
+        session.commit()
+        arena = await get_arena(arena_ctrl, session)
+        contest = await contest_ctrl.create_contest(
+            ContestCreate(
+                arena_id=arena.id,
+                player_positions='["3,3","3,3","40,40"]',
+                player_inventories="[]",
+                participant_ids=[p.id for p in players],
+            ),
+            session,
+        )
+        session.commit()
+        round = await round_service.create_round(
+            contest_id=contest.id, round_no=0, session=session
+        )
+        positions = [ps.position for ps in round.player_states]
+        assert positions[0] == "3,3"
+        assert positions[1] != "3,3"
+        assert positions[2] == "10,10"
+        assert len(set(positions)) == 3
@@ -0,0 +1,132 @@
+import asyncio
+from unittest.mock import AsyncMock
+from unittest.mock import MagicMock
+
+import pytest
+
+from agentarena.arena.services.contest_scheduler import ContestScheduler
+from agentarena.arena.services.timeout_service import HEALTH
+from agentarena.arena.services.timeout_service import TimeoutService
+from agentarena.models.constants import PromptType
+
+
+@pytest.fixture
+def timeout_service():
+    return TimeoutService(
+        {
+            "default": {"default": 60, "floor": 5, "ceiling": 120, "min_samples": 3},
+            "player_player_action": {
+                "default": 30,
+                "floor": 2,
+                "ceiling": 90,
+                "multiplier": 2,
+                "percentile": 50,
+                "min_samples": 3,
+            },
+        }
+    )
+
+
+def test_default_timeouts(timeout_service):
+    assert timeout_service.get_timeout("p1", PromptType.PLAYER_PLAYER_ACTION) == 30
+    assert timeout_service.get_timeout("p1", PromptType.JUDGE_APPLY_EFFECTS) == 60
+    assert timeout_service.get_timeout("p1", HEALTH) == 10
+
+
+def test_no_config_keeps_sixty_seconds():
+    service = TimeoutService()
+    assert service.get_timeout("p1", PromptType.ARENA_GENERATE_FEATURES) == 60
+
+
+def test_timeout_adapts_to_latency(timeout_service):
+    for seconds in [1.0, 3.0, 5.0]:
+        timeout_service.record("p1", PromptType.PLAYER_PLAYER_ACTION, seconds)
+    # p50 is 3s, doubled
+    assert timeout_service.get_timeout("p1", PromptType.PLAYER_PLAYER_ACTION) == 6.0
+
+
+def test_timeout_clamped(timeout_service):
+    for _ in range(3):
+        timeout_service.record("fast", PromptType.PLAYER_PLAYER_ACTION, 0.1)
+        timeout_service.record("slow", PromptType.PLAYER_PLAYER_ACTION, 100.0)
+    assert timeout_service.get_timeout("fast", PromptType.PLAYER_PLAYER_ACTION) == 2
+    assert timeout_service.get_timeout("slow", PromptType.PLAYER_PLAYER_ACTION) == 90
+
+
+def test_latency_shared_by_model(timeout_service):
+    for seconds in [4.0, 4.0, 4.0]:
+        timeout_service.record(
+            "p1", PromptType.PLAYER_PLAYER_ACTION, seconds, model="gpt"
+        )
+    timeout_service.record("p2", PromptType.PLAYER_PLAYER_ACTION, 4.0, model="gpt")
+    assert timeout_service.get_timeout("p2", PromptType.PLAYER_PLAYER_ACTION) == 8.0
+
+
+@pytest.mark.asyncio
+async def test_request_job_uses_timeout_and_records(timeout_service):
+    broker = AsyncMock()
+    msg = MagicMock()
+    msg.headers = {"model": "gpt"}
+    broker.request_job = AsyncMock(return_value=msg)
+
+    result = await timeout_service.request_job(
+        broker, "p1", PromptType.PLAYER_PLAYER_ACTION, "chan", "payload"
+    )
+
+    assert result is msg
+    broker.request_job.assert_awaited_once_with("chan", "payload", timeout=30)
+    assert timeout_service.participant_models["p1"] == "gpt"
+    assert timeout_service.latency.count("gpt", PromptType.PLAYER_PLAYER_ACTION) == 1
+
+
+@pytest.mark.asyncio
+async def test_prompt_requests_wait_for_a_scheduler_slot():
+    scheduler = ContestScheduler({"max_requests": 1})
+    timeout_service = TimeoutService(scheduler=scheduler)
+    gate = asyncio.Event()
+
+    async def request_job(channel, payload, timeout):
+        if channel != "health":
+            await gate.wait()
+        return MagicMock(headers={})
+
+    broker = AsyncMock()
+    broker.request_job = request_job
+    first = asyncio.ensure_future(
+        timeout_service.request_job(
+            broker, "p1", PromptType.PLAYER_PLAYER_ACTION, "chan", "payload"
+        )
+    )
+    second = asyncio.ensure_future(
+        timeout_service.request_job(
+            broker, "p2", PromptType.PLAYER_PLAYER_ACTION, "chan", "payload"
+        )
+    )
+    await asyncio.sleep(0.01)
+    assert scheduler.requests.locked()
+
+    # health probes don't take a slot
+    await asyncio.wait_for(
+        timeout_service.request_job(broker, "p3", HEALTH, "health", "payload"), 1
+    )
+    gate.set()
+    await asyncio.gather(first, second)
+    assert not scheduler.requests.locked()
+
+
+@pytest.mark.asyncio
+async def test_timeouts_are_recorded_as_samples(timeout_service):
+    kind = PromptType.PLAYER_PLAYER_ACTION
+    for _ in range(3):
+        timeout_service.record("p1", kind, 3.0)
+    assert timeout_service.get_timeout("p1", kind) == 6.0
+
+    broker = AsyncMock()
+    broker.request_job = AsyncMock(side_effect=asyncio.TimeoutError())
+    for _ in range(4):
+        with pytest.raises(asyncio.TimeoutError):
+            await timeout_service.request_job(broker, "p1", kind, "chan", "payload")
+
+    assert timeout_service.latency.count("p1", kind) == 7
+    # the median is now a timed out request, so the timeout widens
+    assert timeout_service.get_timeout("p1", kind) == 12.0
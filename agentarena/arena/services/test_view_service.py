@@ -0,0 +1,139 @@
+from unittest.mock import MagicMock
+
+from agentarena.arena.services.view_service import ViewService
+from agentarena.core.factories.logger_factory import LoggingService
+from agentarena.models.constants import ContestRoundState
+from agentarena.models.constants import RoleType
+from agentarena.models.public import ArenaPublic
+from agentarena.models.public import ContestPublic
+from agentarena.models.public import ContestRoundPublic
+from agentarena.models.public import FeaturePublic
+from agentarena.models.public import ParticipantPublic
+from agentarena.models.public import PlayerPublic
+from agentarena.util.compaction import rolling_summary
+from agentarena.util.compaction import summary_through
+
+
+def make_contest(positions=("0,0", "0,0"), features=(), radius=None) -> MagicMock:
+    players = [
+        PlayerPublic(id=pid, name=pid, position=position, inventory=["key"], score=5)
+        for pid, position in zip(["p1", "p2"], positions)
+    ]
+    public = ContestPublic(
+        id="contest1",
+        arena=ArenaPublic(
+            id="arena1",
+            name="Arena",
+            description="",
+            height=10,
+            width=10,
+            rules="",
+            winning_condition="",
+            visibility_radius=radius,
+        ),
+        auto_advance=True,
+        start_time=0,
+        end_time=0,
+        participants=[
+            ParticipantPublic(
+                id=pid, name=pid, endpoint=f"http://{pid}", role=RoleType.PLAYER
+            )
+            for pid in ["p1", "p2"]
+        ],
+        rounds=[
+            ContestRoundPublic(
+                round_no=0,
+                players=players,
+                features=[
+                    FeaturePublic(name=name, description="", position=position)
+                    for name, position in features
+                ],
+                state=ContestRoundState.COMPLETE,
+            )
+        ],
+    )
+    public.rounds[0].summary = rolling_summary("", public.rounds[0])
+    contest = MagicMock(id="contest1")
+    contest.get_public.return_value = public
+    return contest
+
+
+def test_player_views_share_one_snapshot():
+    service = ViewService(logging=LoggingService(capture=True))
+    contest = make_contest()
+    players = [MagicMock(id="p1"), MagicMock(id="p2")]
+
+    views = service.get_player_views(contest, players)
+
+    assert contest.get_public.call_count == 1
+    p1 = views["p1"]
+    assert [p.endpoint for p in p1.participants] == ["http://p1", ""]
+    assert [(p.inventory, p.score) for p in p1.rounds[0].players] == [
+        (["key"], 5),
+        ([], 0),
+    ]
+    assert views["p2"].rounds[0].players[1].score == 5
+
+    # unmasked objects are shared, and the snapshot is unchanged
+    snapshot = contest.get_public.return_value
+    assert p1.arena is snapshot.arena
+    assert p1.rounds[0].players[0] is snapshot.rounds[0].players[0]
+    assert snapshot.rounds[0].players[1].score == 5
+
+
+def test_summaries_rebuilt_from_player_view():
+    service = ViewService(logging=LoggingService(capture=True))
+    contest = make_contest(positions=("0,0", "8,8"))
+    snapshot = contest.get_public.return_value
+    assert "p2 at 8,8, score 5" in snapshot.rounds[0].summary
+
+    view = service.get_player_views(contest, [MagicMock(id="p1")])["p1"]
+
+    assert view.rounds[0].summary == ""
+    summary = summary_through(view.rounds)
+    assert "p1 at 0,0, score 5" in summary
+    assert "score 5" not in summary.replace("p1 at 0,0, score 5", "")
+
+
+def test_contest_view_matches_bulk_view():
+    service = ViewService(logging=LoggingService(capture=True))
+    contest = make_contest()
+    player = MagicMock(id="p2")
+
+    view = service.get_contest_view(contest, player)
+    assert view == service.get_player_views(contest, [player])["p2"]
+
+
+def test_fog_of_war_limits_view():
+    service = ViewService(
+        logging=LoggingService(capture=True),
+        visibility={"global_features": ["Exit"]},
+    )
+    contest = make_contest(
+        positions=("0,0", "8,8"),
+        features=[("Rock", "1,1"), ("Tree", "9,9"), ("Exit", "9,0"), ("Fog", "")],
+        radius=3,
+    )
+    players = [MagicMock(id="p1"), MagicMock(id="p2")]
+
+    views = service.get_player_views(contest, players)
+
+    p1 = views["p1"].rounds[0]
+    assert [f.name for f in p1.features] == ["Rock", "Exit", "Fog"]
+    assert [p.id for p in p1.players] == ["p1"]
+    p2 = views["p2"].rounds[0]
+    assert [f.name for f in p2.features] == ["Tree", "Exit", "Fog"]
+
+    # a player without a position sees only the global features and themselves
+    contest = make_contest(
+        positions=("", "8,8"), features=[("Tree", "9,9"), ("Exit", "9,0")], radius=3
+    )
+    view = service.get_player_views(contest, players)["p1"].rounds[0]
+    assert [p.id for p in view.players] == ["p1"]
+    assert [f.name for f in view.features] == ["Exit"]
+
+    # without a radius everything is in sight
+    contest = make_contest(positions=("0,0", "8,8"), features=[("Tree", "9,9")])
+    view = service.get_player_views(contest, players)["p1"].rounds[0]
+    assert [p.id for p in view.players] == ["p1", "p2"]
+    assert [f.name for f in view.features] == ["Tree"]
@@ -0,0 +1,124 @@
+import asyncio
+import time
+from typing import Any
+from typing import Dict
+from typing import Optional
+
+from nats.aio.msg import Msg
+
+from agentarena.arena.services.contest_scheduler import ContestScheduler
+from agentarena.clients.message_broker import MessageBroker
+from agentarena.core.services.latency_tracker import LatencyTracker
+from agentarena.models.policies import TimeoutPolicy
+from agentarena.models.policies import parse_policies
+
+HEALTH = "health"
+
+
+class TimeoutService:
+    """
+    Picks request timeouts per (model, prompt type) from observed round-trip latency.
+
+    Actors report the model that served a request in the `model` header of the
+    response. Until a participant has reported one, its latency is tracked
+    under the participant id.
+
+    With a scheduler, prompt requests wait for one of its request slots, so
+    all contests together keep at most `max_requests` in flight.
+    """
+
+    def __init__(
+        self,
+        timeouts: Optional[Dict[str, Any]] = None,
+        scheduler: Optional[ContestScheduler] = None,
+    ):
+        raw = timeouts or {}
+        self.default_policy = TimeoutPolicy.model_validate(raw.get("default") or {})
+        self.health_policy = TimeoutPolicy.model_validate(
+            raw.get(HEALTH) or {"default": 10.0, "floor": 1.0, "ceiling": 30.0}
+        )
+        self.policies = parse_policies(raw, TimeoutPolicy)
+        self.latency = LatencyTracker()
+        self.participant_models: Dict[str, str] = {}
+        self.scheduler = scheduler
+
+    def get_policy(self, kind: str) -> TimeoutPolicy:
+        if kind == HEALTH:
+            return self.health_policy
+        return self.policies.get(kind, self.default_policy)
+
+    def model_key(self, participant_id: str) -> str:
+        return self.participant_models.get(participant_id, participant_id)
+
+    def get_timeout(self, participant_id: str, kind: str) -> float:
+        """
+        Seconds to wait for a participant's response to a request of `kind`,
+        which is a prompt type or "health".
+        """
+        policy = self.get_policy(kind)
+        observed = self.latency.percentile(
+            self.model_key(participant_id),
+            kind,
+            policy.percentile,
+            policy.min_samples,
+        )
+        if observed is None:
+            timeout = policy.default
+        else:
+            timeout = observed * policy.multiplier
+        return min(max(timeout, policy.floor), policy.ceiling)
+
+    def record(
+        self,
+        participant_id: str,
+        kind: str,
+        seconds: float,
+        model: Optional[str] = None,
+    ):
+        if model:
+            self.participant_models[participant_id] = model
+        self.latency.record(self.model_key(participant_id), kind, seconds)
+
+    async def request_job(
+        self,
+        message_broker: MessageBroker,
+        participant_id: str,
+        kind: str,
+        channel: str,
+        payload: str | bytes,
+    ) -> Msg:
+        """
+        Request a job from a participant, using the adaptive timeout and
+        recording how long the response took.
+        """
+        if self.scheduler is not None and kind != HEALTH:
+            async with self.scheduler.request_slot():
+                return await self._request_job(
+                    message_broker, participant_id, kind, channel, payload
+                )
+        return await self._request_job(
+            message_broker, participant_id, kind, channel, payload
+        )
+
+    async def _request_job(
+        self,
+        message_broker: MessageBroker,
+        participant_id: str,
+        kind: str,
+        channel: str,
+        payload: str | bytes,
+    ) -> Msg:
+        timeout = self.get_timeout(participant_id, kind)
+        start = time.monotonic()
+        try:
+            msg = await message_broker.request_job(channel, payload, timeout=timeout)
+        except asyncio.TimeoutError:
+            # the response took at least this long, so count it, or the
+            # timeout could only ever shrink
+            self.record(participant_id, kind, timeout)
+            raise
+        headers = getattr(msg, "headers", None) or {}
+        self.record(
+            participant_id, kind, time.monotonic() - start, headers.get("model")
+        )
+        return msg
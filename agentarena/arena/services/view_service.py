@@ -1,29 +1,152 @@
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
 from agentarena.arena.models import Contest
 from agentarena.arena.models import Participant
 from agentarena.core.factories.logger_factory import LoggingService
+from agentarena.models.policies import VisibilityPolicy
+from agentarena.models.public import ArenaPublic
 from agentarena.models.public import ContestPublic
+from agentarena.models.public import ContestRoundPublic
+from agentarena.util.spatial import Board
+from agentarena.util.spatial import parse_position
+
+
+class RoundIndex:
+    """
+    Spatial index of a round's features and players, shared by all views.
+    """
+
+    def __init__(
+        self, round: ContestRoundPublic, arena: ArenaPublic, policy: VisibilityPolicy
+    ):
+        self.board: Board[int] = Board(arena.width, arena.height)
+        self.positions = {p.id: parse_position(p.position) for p in round.players}
+        self.global_features: Set[int] = set()
+        for ix, feature in enumerate(round.features):
+            if feature.name in policy.global_features:
+                self.global_features.add(ix)
+            else:
+                self.board.place_feature(ix, feature.position)
+        self.global_features.update(self.board.unplaced_features)
+        for player in round.players:
+            self.board.place_player(player.id, player.position)
+
+    def visible(self, player_id: str, radius: float) -> Tuple[Set[int], Set[str]]:
+        """
+        Indexes of the features and ids of the players the player can see.
+        A player with no position in this round sees only the global features
+        and themselves.
+        """
+        xy = self.positions.get(player_id)
+        if xy is None:
+            return set(self.global_features), {player_id}
+        features = set(self.board.features_within(*xy, radius))
+        features.update(self.global_features)
+        players = set(self.board.players_within(*xy, radius))
+        players.update(self.board.unplaced_players)
+        players.add(player_id)
+        return features, players
 
 
 class ViewService:
     """Service for managing views of Contests - allowing different players to have a different view."""
 
-    def __init__(self, logging: LoggingService):
+    def __init__(
+        self, logging: LoggingService, visibility: Optional[Dict[str, Any]] = None
+    ):
         self.log = logging.get_logger("service")
+        self.visibility = VisibilityPolicy.model_validate(visibility or {})
 
     def get_contest_view(self, contest: Contest, player: Participant) -> ContestPublic:
         """Get a view of the contest tailored to the player."""
-        view = contest.get_public()
-        log = self.log.bind(contest_id=contest.id, player_id=player.id)
-        for participant in view.participants:
-            if participant.id != player.id:
-                participant.endpoint = ""
-
-        if view.rounds:
-            for round in view.rounds:
-                for other in round.players:
-                    if other.id != player.id:
-                        other.inventory = []
-                        other.score = 0
-
-        log.debug("returning view", view=view)
-        return view
+        snapshot = contest.get_public()
+        return self.mask_view(snapshot, player.id, self.index_rounds(snapshot))
+
+    def get_player_views(
+        self, contest: Contest, players: List[Participant]
+    ) -> Dict[str, ContestPublic]:
+        """
+        Get the views for all players at once, by player id. The contest is
+        made public and indexed once, and each view is a masked copy of that
+        snapshot.
+        """
+        snapshot = contest.get_public()
+        indexes = self.index_rounds(snapshot)
+        views = {
+            player.id: self.mask_view(snapshot, player.id, indexes)
+            for player in players
+        }
+        self.log.debug(
+            "returning views",
+            contest_id=contest.id,
+            players=len(views),
+            rounds=len(snapshot.rounds),
+            fog=indexes is not None,
+        )
+        return views
+
+    def visibility_radius(self, arena: ArenaPublic) -> Optional[float]:
+        """
+        The arena's visibility radius, or the configured default.
+        """
+        if arena.visibility_radius is not None:
+            return arena.visibility_radius
+        return self.visibility.radius
+
+    def index_rounds(self, snapshot: ContestPublic) -> Optional[List[RoundIndex]]:
+        """
+        Index every round of the snapshot, if the arena has fog of war.
+        """
+        radius = self.visibility_radius(snapshot.arena)
+        if radius is None:
+            return None
+        return [RoundIndex(r, snapshot.arena, self.visibility) for r in snapshot.rounds]
+
+    def mask_view(
+        self,
+        snapshot: ContestPublic,
+        player_id: str,
+        indexes: Optional[List[RoundIndex]] = None,
+    ) -> ContestPublic:
+        """
+        The player's view of a public contest: other players' endpoints,
+        inventories and scores are blanked, and with `indexes` only what is in
+        sight of the player is kept in each round. The rolling summaries cover
+        every player, so they are dropped, and the actor summarizes from the
+        masked rounds instead. Only the masked objects are
+        copied, everything else is shared with the snapshot, which is left
+        unchanged.
+        """
+        participants = [
+            p if p.id == player_id else p.model_copy(update={"endpoint": ""})
+            for p in snapshot.participants
+        ]
+        radius = self.visibility_radius(snapshot.arena)
+        rounds = []
+        for ix, round in enumerate(snapshot.rounds):
+            visible = None
+            if indexes and radius is not None:
+                visible = indexes[ix].visible(player_id, radius)
+            update: Dict[str, Any] = {"summary": ""}
+            if visible is not None:
+                features, in_sight = visible
+                update["features"] = [round.features[i] for i in sorted(features)]
+                if not self.visibility.global_players:
+                    update["players"] = [p for p in round.players if p.id in in_sight]
+            update["players"] = [
+                (
+                    other
+                    if other.id == player_id
+                    else other.model_copy(update={"inventory": [], "score": 0})
+                )
+                for other in update.get("players", round.players)
+            ]
+            rounds.append(round.model_copy(update=update))
+        return snapshot.model_copy(
+            update={"participants": participants, "rounds": rounds, "summary": ""}
+        )
@@ -2,6 +2,7 @@
 The Contest State Machine
 """
 
+import asyncio
 from datetime import datetime
 from typing import Any
 from typing import Dict
@@ -24,12 +25,21 @@ from agentarena.arena.models import PlayerAction
 from agentarena.arena.models import PlayerActionCreate
 from agentarena.arena.models import PlayerState
 from agentarena.arena.models import PlayerStateCreate
+from agentarena.arena.services.contest_scheduler import ContestScheduler
+from agentarena.arena.services.effects_engine import EffectsEngine
+from agentarena.arena.services.feature_pool import FeaturePool
+from agentarena.arena.services.narration_tracker import NarrationTracker
+from agentarena.arena.services.presence_registry import PresenceRegistry
+from agentarena.arena.services.role_dispatcher import RoleDispatcher
 from agentarena.arena.services.round_service import RoundService
+from agentarena.arena.services.timeout_service import HEALTH
+from agentarena.arena.services.timeout_service import TimeoutService
 from agentarena.arena.services.view_service import ViewService
 from agentarena.clients.message_broker import MessageBroker
 from agentarena.core.factories.logger_factory import ILogger
 from agentarena.core.services.model_service import ModelService
 from agentarena.core.services.uuid_service import UUIDService
+from agentarena.util.compaction import rolling_summary
 
 from .round_machine import RoundMachine
 from .setup_machine import SetupMachine
@@ -100,9 +110,22 @@ class ContestMachine(StateMachine):
         uuid_service: UUIDService,
         view_service: ViewService,
         log: ILogger,
+        timeout_service: TimeoutService,
+        effects_engine: EffectsEngine,
+        narration_tracker: NarrationTracker,
+        dispatcher: RoleDispatcher,
+        presence: PresenceRegistry,
+        feature_pool: FeaturePool,
+        scheduler: ContestScheduler,
         auto_advance: bool = True,
+        prestage: bool = False,
     ):
-        """Initialize the contest machine."""
+        """Initialize the contest machine.
+
+        With `prestage`, the machine runs the contest setup and then pauses,
+        ready to go into the first round when next advanced. Auto-advancing
+        machines yield their scheduler turn between steps.
+        """
         self._setup_machine = None
         self._round_machine = None
         self.feature_service = feature_service
@@ -114,9 +137,17 @@ class ContestMachine(StateMachine):
         self.view_service = view_service
         self.judge_result_service = judge_result_service
         self.session = session
+        self.timeout_service = timeout_service
+        self.effects_engine = effects_engine
+        self.narration_tracker = narration_tracker
+        self.dispatcher = dispatcher
+        self.presence = presence
+        self.feature_pool = feature_pool
+        self.scheduler = scheduler
         assert contest is not None, "Contest required"
         self.contest = contest
         self.auto_advance = auto_advance
+        self.prestage = prestage
 
         state = contest.state.value or ContestState.STARTING.value
         if state == ContestState.CREATED.value:
@@ -183,6 +214,20 @@ class ContestMachine(StateMachine):
         """
         return self.contest.winner_id is not None
 
+    def setup_done(self, target_state: str) -> bool:
+        """
+        Check if a prestaging machine has finished the setup.
+        """
+        return (
+            self.prestage
+            and target_state
+            in [
+                ContestState.CREATE_ROUND.value,
+                ContestState.IN_ROUND.value,
+            ]
+            and not self.current_round_failed()
+        )
+
     async def cycle_or_pause(self, label: str, target_state: str = ""):
         """
         Cycle the contest machine, either advancing to the next state or
@@ -192,7 +237,13 @@ class ContestMachine(StateMachine):
         state, if needed, and send a message that the contest machine is
         paused.
         """
-        if self.auto_advance:
+        if self.setup_done(target_state):
+            # the opening round is ready to play, so resume in it
+            if self.has_opening_round():
+                target_state = ContestState.IN_ROUND.value
+            self.log.info("Contest prestaged", target_state=target_state)
+        if self.auto_advance and not self.setup_done(target_state):
+            await self.scheduler.yield_turn(self.contest.id)
             await self.advance_state(label)
         else:
             current_state = self.current_state_value or "ERROR - NO STATE"
@@ -250,27 +301,50 @@ class ContestMachine(StateMachine):
             await self.cycle(event)
 
     async def on_enter_role_call(self):
-        """Called when entering the role call state."""
+        """Called when entering the role call state.
+
+        Participants with a current heartbeat are present without asking, the
+        rest are sent a health request, all at once.
+        """
         self.log.info("starting role call")
-        healthy = True
-        missing = []
-        for p in self.contest.participants:
-            log = self.log.bind(participant=p.name, role=p.role)
-            job_id = self.uuid_service.make_id()
-            channel = p.channel(f"request.health.{job_id}")
-            log.info("requesting health from participant", channel=channel)
-            msg: Msg = await self.message_broker.request_job(channel, self.contest.id)
-            if msg.data:
-                log.info("Participant is healthy")
-            else:
-                missing.append(p.name)
-                log.error("Participant is not healthy")
-                healthy = False
+        participants = self.contest.participants
+        unconfirmed = set(self.presence.unconfirmed([p.id for p in participants]))
+        to_probe = [p for p in participants if p.id in unconfirmed]
+        self.log.info(
+            "checking presence",
+            present=len(participants) - len(to_probe),
+            probing=[p.name for p in to_probe],
+        )
+        results = await asyncio.gather(*[self.probe_health(p) for p in to_probe])
+        missing = [p.name for p, ok in zip(to_probe, results) if not ok]
+        healthy = not missing
         if healthy:
             await self.cycle_or_pause("roles present", "setup_arena")  # type: ignore
         else:
             await self.roles_error("failed to get", missing=missing)  # type: ignore
 
+    async def probe_health(self, participant: Participant) -> bool:
+        """Send a health request to a participant, recording the result."""
+        log = self.log.bind(participant=participant.name, role=participant.role)
+        job_id = self.uuid_service.make_id()
+        channel = participant.channel(f"request.health.{job_id}")
+        log.info("requesting health from participant", channel=channel)
+        try:
+            msg: Msg = await self.timeout_service.request_job(
+                self.message_broker, participant.id, HEALTH, channel, self.contest.id
+            )
+        except Exception as e:
+            log.error("Participant did not respond to health request", error=e)
+            self.presence.mark_absent(participant.id)
+            return False
+        if not msg.data:
+            log.error("Participant is not healthy")
+            self.presence.mark_absent(participant.id)
+            return False
+        log.info("Participant is healthy")
+        self.presence.mark_present(participant.id)
+        return True
+
     async def on_enter_setup_arena(self):
         """Called when entering the SetupArena state."""
         # Initialize the setup machine if it exists
@@ -287,21 +361,24 @@ class ContestMachine(StateMachine):
                 session=self.session,
                 log=self.log,
                 auto_advance=self.auto_advance,
+                timeout_service=self.timeout_service,
+                feature_pool=self.feature_pool,
             )
 
         setup_machine = self._setup_machine
 
         await setup_machine.activate_initial_state()  # type: ignore
-        if setup_machine.current_state in [
-            ContestRoundState.SETUP_COMPLETE.value,
-            ContestRoundState.SETUP_FAIL.value,
-        ]:
+        if setup_machine.current_state_value == ContestRoundState.SETUP_FAIL.value:
+            # fail here, before a prestaged machine parks in the opening round
+            await self.step_failed("setup failed")  # type: ignore
+        elif setup_machine.current_state_value == ContestRoundState.SETUP_COMPLETE.value:
             await self.cycle_or_pause("setup complete", "create_round")  # type: ignore
 
     async def on_enter_create_round(self):
         """Called when entering the CreateRound state, which happens for all
         rounds after the first."""
         self.log.info("Entering CreateRound state")
+        self.save_narratives()
         narrative = ""
         needs_round = True
         if self.contest.rounds:
@@ -341,6 +418,10 @@ class ContestMachine(StateMachine):
             self.log.info("Setup machine destroyed")
 
         current_round = self.contest.rounds[-1]
+        await self.narration_tracker.before_round(
+            self.contest.id, current_round.round_no
+        )
+        self.save_narratives()
         if current_round.state in [
             ContestRoundState.IDLE.value,
             ContestRoundState.SETUP_COMPLETE.value,
@@ -359,6 +440,11 @@ class ContestMachine(StateMachine):
             view_service=self.view_service,
             log=self.log,
             auto_advance=self.auto_advance,
+            timeout_service=self.timeout_service,
+            effects_engine=self.effects_engine,
+            narration_tracker=self.narration_tracker,
+            dispatcher=self.dispatcher,
+            scheduler=self.scheduler,
         )
         await self._round_machine.activate_initial_state()  # type: ignore
         if self._round_machine.current_state == ContestRoundState.COMPLETE.value:
@@ -395,6 +481,46 @@ class ContestMachine(StateMachine):
     async def on_enter_complete(self, winner: Participant):
         """Called when entering the Complete state."""
         self.log.info("Contest complete", winner=winner)
+        await self.narration_tracker.drain(self.contest.id)
+        self.save_narratives()
+
+    async def on_enter_fail(self):
+        """Called when entering the Fail state."""
+        # nothing will collect them now
+        self.narration_tracker.cancel(self.contest.id)
+
+    def save_narratives(self):
+        """
+        Save the narratives finished in the background to their rounds, with
+        the rolling summary, and as the opening narrative of the next round
+        if it has already started without one.
+        """
+        finished = self.narration_tracker.collect(self.contest.id)
+        if not finished:
+            return
+        rounds = {r.round_no: r for r in self.contest.rounds}
+        now = int(datetime.now().timestamp())
+        for round_no, narrative in finished:
+            contest_round = rounds.get(round_no)
+            if contest_round is None:
+                continue
+            previous = rounds.get(round_no - 1)
+            if narrative:
+                contest_round.ending_narrative = narrative
+            else:
+                self.log.error("No background narrative for round", round=round_no)
+            contest_round.summary = rolling_summary(
+                previous.summary if previous else "",
+                contest_round.get_public(),
+                narrative=narrative,
+            )
+            contest_round.updated_at = now
+            following = rounds.get(round_no + 1)
+            if narrative and following is not None and not following.narrative:
+                following.narrative = narrative
+                following.updated_at = now
+        self.session.commit()
+        self.log.info("Saved background narratives", rounds=[n for n, _ in finished])
 
     def get_state_dict(self) -> Dict[str, Any]:
         """
@@ -1,6 +1,9 @@
 import asyncio
 from codecs import decode
 from datetime import datetime
+from typing import List
+from typing import Optional
+from typing import Set
 
 from nats.aio.msg import Msg
 from sqlmodel import Session
@@ -16,6 +19,11 @@ from agentarena.arena.models import PlayerAction
 from agentarena.arena.models import PlayerActionCreate
 from agentarena.arena.models import PlayerState
 from agentarena.arena.models import PlayerStateCreate
+from agentarena.arena.services.contest_scheduler import ContestScheduler
+from agentarena.arena.services.effects_engine import EffectsEngine
+from agentarena.arena.services.narration_tracker import NarrationTracker
+from agentarena.arena.services.role_dispatcher import RoleDispatcher
+from agentarena.arena.services.timeout_service import TimeoutService
 from agentarena.arena.services.view_service import ViewService
 from agentarena.clients.message_broker import MessageBroker
 from agentarena.core.factories.logger_factory import ILogger
@@ -23,14 +31,17 @@ from agentarena.core.services.model_service import ModelService
 from agentarena.models.constants import ContestRoundState
 from agentarena.models.constants import PromptType
 from agentarena.models.constants import RoleType
+from agentarena.models.public import ContestPublic
 from agentarena.models.requests import ActionRequestPayload
 from agentarena.models.requests import ContestRequestPayload
 from agentarena.models.requests import ContestRoundPayload
 from agentarena.models.requests import ParticipantActionRequest
 from agentarena.models.requests import ParticipantContestRequest
 from agentarena.models.requests import ParticipantContestRoundRequest
-from agentarena.util.response_parsers import extract_obj_from_json
+from agentarena.util.compaction import rolling_summary
 from agentarena.util.response_parsers import extract_text_response
+from agentarena.util.response_parsers import parse_response
+from agentarena.util.spatial import Board
 
 
 class RoundMachine(StateMachine):
@@ -80,6 +91,11 @@ class RoundMachine(StateMachine):
         player_state_service: ModelService[PlayerState, PlayerStateCreate],
         view_service: ViewService,
         log: ILogger,
+        timeout_service: TimeoutService,
+        effects_engine: EffectsEngine,
+        narration_tracker: NarrationTracker,
+        dispatcher: RoleDispatcher,
+        scheduler: ContestScheduler,
         auto_advance: bool = True,
     ):
         """Initialize the round machine."""
@@ -96,6 +112,11 @@ class RoundMachine(StateMachine):
         self.log = log.bind(contest_round=contest_round.id)
         self.judge_result_service = judge_result_service
         self.auto_advance = auto_advance
+        self.timeout_service = timeout_service
+        self.effects_engine = effects_engine
+        self.narration_tracker = narration_tracker
+        self.dispatcher = dispatcher
+        self.scheduler = scheduler
         super().__init__(start_value=contest_round.state.value)
 
     async def cycle_or_pause(self, label: str, target_state: str = ""):
@@ -106,6 +127,7 @@ class RoundMachine(StateMachine):
         state, if needed, and send a message that the round machine is paused.
         """
         if self.auto_advance:
+            await self.scheduler.yield_turn(self.contest_round.contest.id)
             await self.cycle(label)
         else:
             current_state = self.current_state_value or "ERROR - NO STATE"
@@ -136,11 +158,13 @@ class RoundMachine(StateMachine):
             await self.step_failed("round_fail")
             return
 
+        # every player sees the round as it was before anyone acted
+        views = self.view_service.get_player_views(self.contest_round.contest, players)
         success = True
         error = ""
         for player in players:
             log = self.log.bind(player=player.name, player_id=player.id)
-            msg: Msg = await self.get_player_action(player)
+            msg: Msg = await self.get_player_action(player, views.get(player.id))
             log.info("received player prompt message", msg=msg)
             success, error = await self.handle_player_action(player, msg)
             if not success:
@@ -161,19 +185,38 @@ class RoundMachine(StateMachine):
         This state is a holding state, waiting for the judge results to
         be received.
         The message handler will transition to the next state.
+
+        Actions are judged concurrently, spread across the contest's judges,
+        and the results are handled in order once all are in.
         """
         judges = self.contest_round.contest.get_role(RoleType.JUDGE)
         if not judges:
             self.log.error("No judges found for judging action prompt")
             await self.cycle_or_pause("round_fail")
             return
-        judge = judges[0]
-
+        actions = list(self.contest_round.player_actions)
+        limit = asyncio.Semaphore(len(judges) * self.dispatcher.policy.max_outstanding)
+
+        async def judge_action(action: PlayerAction) -> Msg:
+            async with limit:
+                return await self.dispatcher.request(
+                    judges,
+                    PromptType.JUDGE_PLAYER_ACTION_JUDGEMENT,
+                    lambda judge: self.get_judging_action(judge, action),
+                )
+
+        msgs = await asyncio.gather(
+            *[judge_action(action) for action in actions], return_exceptions=True
+        )
         success = True
         error = ""
-        for action in self.contest_round.player_actions:
+        for action, msg in zip(actions, msgs):
             log = self.log.bind(player=action.player.name, player_id=action.player.id)
-            msg: Msg = await self.get_judging_action(judge, action)
+            if isinstance(msg, BaseException):
+                log.error("failed to get judging action", error=msg)
+                success = False
+                error = f"failed to judge action for player {action.player.id}"
+                break
             success, error = await self.handle_judging_action(action, msg)
             if not success:
                 log.error("failed to handle judging action", error=error)
@@ -192,15 +235,32 @@ class RoundMachine(StateMachine):
 
         This state is a holding state, waiting for the apply effects message to be received.
         The message handler will transition to the next state.
+
+        Effects the effects engine can resolve are applied first, and the judge
+        is only prompted if some are left.
         """
+        outcome = self.effects_engine.apply(self.contest_round)
+        if outcome.applied:
+            self.session.commit()
+            self.log.info(
+                "applied effects locally",
+                applied=outcome.applied,
+                unresolved=outcome.unresolved,
+            )
+        if not outcome.unresolved:
+            await self.cycle_or_pause("applying_effects_done", "describing_results")
+            return
         judges = self.contest_round.contest.get_role(RoleType.JUDGE)
         if not judges:
             self.log.error("No judges found for applying effects")
             await self.step_failed("round_fail")
             return
-        judge = judges[0]
-        msg = await self.get_apply_effects(judge)
-        success, error = await self.handle_apply_effects(msg)
+        msg = await self.dispatcher.request(
+            judges, PromptType.JUDGE_APPLY_EFFECTS, self.get_apply_effects
+        )
+        success, error = await self.handle_apply_effects(
+            msg, resolved=set(outcome.applied)
+        )
         if not success:
             self.log.error("Failed to apply effects", error=error)
             await self.step_failed(error)
@@ -214,8 +274,21 @@ class RoundMachine(StateMachine):
             self.log.error("No announcers found for describing results")
             await self.step_failed("round_fail")
             return
-        announcer = announcers[0]
-        msg = await self.get_describing_results(announcer)
+        # built now, as background narration runs after the contest moves on
+        payload = self.describing_results_payload()
+        if self.narration_tracker.background:
+            self.narration_tracker.start(
+                self.contest_round.contest_id,
+                self.contest_round.round_no,
+                self.narrate(announcers, payload),
+            )
+            await self.cycle_or_pause("describing_results_done", "round_complete")
+            return
+        msg = await self.dispatcher.request(
+            announcers,
+            PromptType.ANNOUNCER_DESCRIBE_RESULTS,
+            lambda announcer: self.get_describing_results(announcer, payload),
+        )
         success, error = await self.handle_describing_results(msg)
         if not success:
             self.log.error("Failed to describe results", error=error)
@@ -230,8 +303,10 @@ class RoundMachine(StateMachine):
 
     # ---- Message handlers ----
 
-    async def get_player_action(self, player: Participant) -> Msg:
-        """Send a prompt to a player."""
+    async def get_player_action(
+        self, player: Participant, view: Optional[ContestPublic] = None
+    ) -> Msg:
+        """Send a prompt to a player, with their view of the contest."""
         log = self.log.bind(player=player.name, player_id=player.id)
         log.info("sending player prompt")
 
@@ -239,13 +314,22 @@ class RoundMachine(StateMachine):
         channel = player.channel_prompt(
             PromptType.PLAYER_PLAYER_ACTION, "request", job_id
         )
-        view = self.view_service.get_contest_view(self.contest_round.contest, player)
+        if view is None:
+            view = self.view_service.get_contest_view(
+                self.contest_round.contest, player
+            )
         req = ParticipantContestRequest(
             command=PromptType.PLAYER_PLAYER_ACTION,
             data=ContestRequestPayload(contest=view),
             message="player action",
         )
-        return await self.message_broker.request_job(channel, req.model_dump_json())
+        return await self.timeout_service.request_job(
+            self.message_broker,
+            player.id,
+            PromptType.PLAYER_PLAYER_ACTION,
+            channel,
+            req.model_dump_json(),
+        )
 
     async def handle_player_action(
         self, player: Participant, msg: Msg
@@ -264,9 +348,10 @@ class RoundMachine(StateMachine):
                 log.error("No data in message")
                 asyncio.create_task(self.step_failed("no data in message"))
                 return False, "no data in message"
-            action = extract_obj_from_json(raw)
+            parsed = parse_response(raw)
+            action = parsed.data
             if not action:
-                log.error("No action in message")
+                log.error("No action in message", state=parsed.state)
                 return False, "no action in message"
             log.info("received action", action=action)
             valid = "action" in action and action.get("action", "") != ""
@@ -319,7 +404,13 @@ class RoundMachine(StateMachine):
             data=payload,
             message="judge player action",
         )
-        return await self.message_broker.request_job(channel, req.model_dump_json())
+        return await self.timeout_service.request_job(
+            self.message_broker,
+            judge.id,
+            PromptType.JUDGE_PLAYER_ACTION_JUDGEMENT,
+            channel,
+            req.model_dump_json(),
+        )
 
     async def handle_judging_action(
         self, action: PlayerAction, msg: Msg
@@ -337,9 +428,10 @@ class RoundMachine(StateMachine):
             if not raw:
                 log.error("No data in message")
                 return False, "no data in message"
-            result = extract_obj_from_json(raw)
+            parsed = parse_response(raw)
+            result = parsed.data
             if not result:
-                log.error("No result in message")
+                log.error("No result in message", state=parsed.state)
                 return False, "no result in message"
             log.info("received judging action", result=result)
             jc = JudgeResultCreate(
@@ -349,6 +441,11 @@ class RoundMachine(StateMachine):
                 memories=result.get("memories", ""),
                 result=result.get("result", ""),
                 reason=result.get("reason", ""),
+                effects=(
+                    result["effects"]
+                    if isinstance(result.get("effects"), dict)
+                    else None
+                ),
             )
             created, result = await self.judge_result_service.create(jc, self.session)
             if not created or not result.success:
@@ -379,10 +476,18 @@ class RoundMachine(StateMachine):
         channel = judge.channel_prompt(
             PromptType.JUDGE_APPLY_EFFECTS, "request", job_id
         )
-        return await self.message_broker.request_job(channel, req.model_dump_json())
+        return await self.timeout_service.request_job(
+            self.message_broker,
+            judge.id,
+            PromptType.JUDGE_APPLY_EFFECTS,
+            channel,
+            req.model_dump_json(),
+        )
 
-    async def handle_apply_effects(self, msg: Msg) -> tuple[bool, str]:
-        """Handle a apply effects message."""
+    async def handle_apply_effects(
+        self, msg: Msg, resolved: Optional[Set[str]] = None
+    ) -> tuple[bool, str]:
+        """Handle a apply effects message, ignoring updates to `resolved` players."""
         log = self.log.bind(prompt=PromptType.JUDGE_APPLY_EFFECTS.value)
         log.info("received apply effects message", msg=msg)
         try:
@@ -390,17 +495,23 @@ class RoundMachine(StateMachine):
             if not raw:
                 log.error("No data in message")
                 return False, "no data in apply effects message"
-            result = extract_obj_from_json(raw)
+            parsed = parse_response(raw)
+            result = parsed.data
             if not result:
-                log.error("No result in message")
+                log.error("No result in message", state=parsed.state)
                 return False, "no result in apply effects message"
             log.info("parsed apply effects message", result=result)
+            arena = self.contest_round.contest.arena
+            board: Board[str] = Board(arena.width, arena.height)
             player_state_map = {}
             for player_state in self.contest_round.player_states:
                 player_state_map[player_state.participant_id] = player_state
 
             for updated_player in result.get("players", []):
                 player_id = updated_player.get("id")
+                if resolved and player_id in resolved:
+                    log.debug("Player effects already applied", player_id=player_id)
+                    continue
                 current_player = player_state_map.get(player_id)
                 if not current_player:
                     log.error(
@@ -408,7 +519,15 @@ class RoundMachine(StateMachine):
                     )
                     continue
                 if "position" in updated_player:
-                    current_player.position = updated_player.get("position")
+                    position = updated_player.get("position")
+                    if board.is_valid(position):
+                        current_player.position = position
+                    else:
+                        log.warn(
+                            "Ignoring player position off the board",
+                            player_id=player_id,
+                            position=position,
+                        )
                 if "health" in updated_player:
                     current_player.health = updated_player.get("health")
                 if "score" in updated_player:
@@ -431,7 +550,15 @@ class RoundMachine(StateMachine):
                 if "description" in updated_feature:
                     current_feature.description = updated_feature.get("description")
                 if "position" in updated_feature:
-                    current_feature.position = updated_feature.get("position")
+                    position = updated_feature.get("position")
+                    if board.is_valid(position):
+                        current_feature.position = position
+                    else:
+                        log.warn(
+                            "Ignoring feature position off the board",
+                            feature_id=feature_id,
+                            position=position,
+                        )
                 self.session.add(current_feature)
 
             self.session.commit()
@@ -442,7 +569,15 @@ class RoundMachine(StateMachine):
             log.error("Exception in handle_apply_effects", error=e)
             return False, "error in apply effects message"
 
-    async def get_describing_results(self, announcer: Participant) -> Msg:
+    def describing_results_payload(self) -> ContestRoundPayload:
+        return ContestRoundPayload(
+            contest=self.contest_round.contest.get_public(),
+            round=self.contest_round.get_public(),
+        )
+
+    async def get_describing_results(
+        self, announcer: Participant, payload: Optional[ContestRoundPayload] = None
+    ) -> Msg:
         """Send a prompt to the announcer to describe round results."""
         log = self.log.bind(
             prompt=PromptType.ANNOUNCER_DESCRIBE_RESULTS.value,
@@ -454,28 +589,36 @@ class RoundMachine(StateMachine):
         channel = announcer.channel_prompt(
             PromptType.ANNOUNCER_DESCRIBE_RESULTS, "request", job_id
         )
-        payload = ContestRoundPayload(
-            contest=self.contest_round.contest.get_public(),
-            round=self.contest_round.get_public(),
-        )
+        if payload is None:
+            payload = self.describing_results_payload()
         req = ParticipantContestRoundRequest(
             command=PromptType.ANNOUNCER_DESCRIBE_RESULTS,
             data=payload,
             message="describe round results",
         )
-        return await self.message_broker.request_job(channel, req.model_dump_json())
+        return await self.timeout_service.request_job(
+            self.message_broker,
+            announcer.id,
+            PromptType.ANNOUNCER_DESCRIBE_RESULTS,
+            channel,
+            req.model_dump_json(),
+        )
 
     async def handle_describing_results(self, msg: Msg) -> tuple[bool, str]:
         """Handle the message from the announcer agent with the round ending narrative."""
         log = self.log.bind(prompt=PromptType.ANNOUNCER_DESCRIBE_RESULTS.value)
         log.info("received describing results message", msg=msg)
         try:
-            raw = decode(msg.data, "utf-8", "unicode_escape")
-            narrative = extract_text_response(raw)
+            narrative = self.parse_narrative(msg)
             if not narrative:
                 log.error("No narrative in describing results message")
                 return False, "no narrative in describing results message"
             self.contest_round.ending_narrative = narrative
+            self.contest_round.summary = rolling_summary(
+                self.previous_summary(),
+                self.contest_round.get_public(),
+                narrative=narrative,
+            )
             self.contest_round.updated_at = int(datetime.now().timestamp())
             self.session.commit()
             log.info("Set ending_narrative for round", ending_narrative=narrative)
@@ -484,6 +627,41 @@ class RoundMachine(StateMachine):
             log.error("Failed to handle describing results message", error=e)
             return False, "error in describing results message"
 
+    async def narrate(
+        self, announcers: List[Participant], payload: ContestRoundPayload
+    ) -> Optional[str]:
+        """
+        Get the round's narrative from the announcer, in the background. The
+        contest machine saves it, so this doesn't touch the session.
+        """
+        log = self.log.bind(prompt=PromptType.ANNOUNCER_DESCRIBE_RESULTS.value)
+        try:
+            msg = await self.dispatcher.request(
+                announcers,
+                PromptType.ANNOUNCER_DESCRIBE_RESULTS,
+                lambda announcer: self.get_describing_results(announcer, payload),
+            )
+            narrative = self.parse_narrative(msg)
+        except Exception as e:
+            log.error("Failed to describe results in the background", error=e)
+            return None
+        if not narrative:
+            log.error("No narrative in describing results message")
+            return None
+        log.info("received background narrative", ending_narrative=narrative)
+        return narrative
+
+    def parse_narrative(self, msg: Msg) -> str:
+        raw = decode(msg.data, "utf-8", "unicode_escape")
+        return extract_text_response(raw)
+
+    def previous_summary(self) -> str:
+        round_no = self.contest_round.round_no
+        for round in self.contest_round.contest.rounds:
+            if round.round_no == round_no - 1:
+                return round.summary
+        return ""
+
     def on_enter_state(self, target, event):
         # update the round state
         log = self.log.bind(state=target.id)
@@ -1,6 +1,6 @@
-import json
 from codecs import decode
 from datetime import datetime
+from typing import Optional
 
 from nats.aio.msg import Msg
 from sqlmodel import Field
@@ -15,7 +15,11 @@ from agentarena.arena.models import Feature
 from agentarena.arena.models import FeatureCreate
 from agentarena.arena.models import FeatureOriginType
 from agentarena.arena.models import Participant
+from agentarena.arena.services.feature_pool import FeaturePool
+from agentarena.arena.services.feature_pool import FeatureSet
+from agentarena.arena.services.feature_pool import pool_request
 from agentarena.arena.services.round_service import RoundService
+from agentarena.arena.services.timeout_service import TimeoutService
 from agentarena.arena.services.view_service import ViewService
 from agentarena.clients.message_broker import MessageBroker
 from agentarena.core.factories.logger_factory import ILogger
@@ -23,10 +27,14 @@ from agentarena.core.services.model_service import ModelService
 from agentarena.models.constants import JobResponseState
 from agentarena.models.constants import PromptType
 from agentarena.models.constants import RoleType
+from agentarena.models.public import ContestPublic
 from agentarena.models.requests import ContestRequestPayload
 from agentarena.models.requests import ParticipantContestRequest
+from agentarena.util.response_parsers import ResponseKind
 from agentarena.util.response_parsers import extract_text_response
-from agentarena.util.response_parsers import parse_list
+from agentarena.util.response_parsers import parse_response
+from agentarena.util.spatial import Board
+from agentarena.util.spatial import format_position
 
 
 class SetupMachine(StateMachine):
@@ -75,6 +83,8 @@ class SetupMachine(StateMachine):
         auto_advance: bool = Field(
             description="Auto advance to next state", default=True
         ),
+        timeout_service: TimeoutService = Field(description="Timeout Service"),
+        feature_pool: FeaturePool = Field(description="Feature Pool"),
     ):
         """Initialize the setup machine."""
         self.contest = contest
@@ -90,6 +100,8 @@ class SetupMachine(StateMachine):
         self.session = session
         self.log = log.bind(contest_id=contest.id)
         self.auto_advance = auto_advance
+        self.timeout_service = timeout_service
+        self.feature_pool = feature_pool
         super().__init__(
             start_value=(
                 self.contest_round.state
@@ -174,7 +186,11 @@ class SetupMachine(StateMachine):
         await self.cycle_or_pause("added fixed features", "generating_features")  # type: ignore
 
     async def on_enter_generating_features(self):
-        """Called when entering the GeneratingFeatures state, which adds the random features."""
+        """Called when entering the GeneratingFeatures state, which adds the random features.
+
+        With the feature pool enabled, a pre-generated set is used if there is
+        one, and the pool is refilled in the background.
+        """
         round = self.contest_round
         # Ensure we have a contest round
         if not round:
@@ -204,10 +220,22 @@ class SetupMachine(StateMachine):
         arena_agent = agents[0]
         log = self.log.bind(agent=arena_agent.name)
 
-        # Generate random features and add them to the round
-        self.log.info("Starting Generate features")
-        msg: Msg = await self.get_generate_features(arena_agent)
-        success, error = await self.handle_generate_features(msg)
+        arena = self.contest.arena
+        contest = self.contest.get_public()
+        pooled = self.feature_pool.take(arena) if self.feature_pool.enabled else None
+        if pooled is not None:
+            log.info("Using pre-generated features", count=len(pooled))
+            success, error = await self.add_random_features(pooled)
+        else:
+            # Generate random features and add them to the round
+            self.log.info("Starting Generate features")
+            msg: Msg = await self.get_generate_features(arena_agent, contest)
+            success, error = await self.handle_generate_features(msg)
+        if self.feature_pool.enabled:
+            request = pool_request(contest)
+            self.feature_pool.refill(
+                arena, lambda: self.generate_feature_set(arena_agent, request)
+            )
         if not success:
             self.log.error("Failed to handle feature generation message", error=error)
             await self.step_failed("from generating features")  # type: ignore
@@ -270,7 +298,13 @@ class SetupMachine(StateMachine):
             data=ContestRequestPayload(contest=contest),
             message="",
         )
-        return await self.message_broker.request_job(channel, req.model_dump_json())
+        return await self.timeout_service.request_job(
+            self.message_broker,
+            announcer.id,
+            PromptType.ANNOUNCER_DESCRIBE_ARENA,
+            channel,
+            req.model_dump_json(),
+        )
 
     async def handle_describe_arena(self, msg: Msg) -> tuple[bool, str]:
         """Handle the message from the announcer agent with the arena description."""
@@ -297,7 +331,9 @@ class SetupMachine(StateMachine):
 
         return True, ""
 
-    async def get_generate_features(self, arena_agent: Participant) -> Msg:
+    async def get_generate_features(
+        self, arena_agent: Participant, contest: Optional[ContestPublic] = None
+    ) -> Msg:
         """Generate a list of random features up to count, by sending a job to the message broker"""
         log = self.log.bind(
             agent=arena_agent.name, prompt=PromptType.ARENA_GENERATE_FEATURES.value
@@ -307,121 +343,114 @@ class SetupMachine(StateMachine):
             PromptType.ARENA_GENERATE_FEATURES, "request", job_id
         )
         log.info("requesting random features from arena agent", channel=channel)
-        contest = self.contest.get_public()
+        if contest is None:
+            contest = self.contest.get_public()
         req = ParticipantContestRequest(
             command=PromptType.ARENA_GENERATE_FEATURES,
             data=ContestRequestPayload(contest=contest),
             message="",
         )
-        return await self.message_broker.request_job(channel, req.model_dump_json())
+        return await self.timeout_service.request_job(
+            self.message_broker,
+            arena_agent.id,
+            PromptType.ARENA_GENERATE_FEATURES,
+            channel,
+            req.model_dump_json(),
+        )
 
     def parse_generate_features_response(self, msg: Msg) -> tuple[list[dict], bool]:
         """Parse the response from the arena agent with generated features."""
         log = self.log.bind(msg=msg.subject)
         log.info("Received feature generation message", msg=msg)
-        features = []
-        try:
-            job_data = decode(msg.data, "utf-8", "unicode_escape")
-            obj = json.loads(job_data)
-            state = obj["state"] if isinstance(obj, dict) and "state" in obj else None
-
-            while isinstance(obj, dict) and "data" in obj:
-                obj = obj["data"]
-                if isinstance(obj, str) and obj.find('"data"') != -1:
-                    obj = json.loads(obj)
-                if state is None and isinstance(obj, dict):
-                    state = obj.get("state", None)  # type: ignore
-
-            if state != JobResponseState.COMPLETE.value:
-                log.error("Feature generation job failed", obj=obj)
-                return [], False
-            features = parse_list(obj, log=log)
-            log.info("Parsed feature generation message", features=features)
-        except Exception as e:
-            log.error("Failed to parse feature generation message", error=e)
+        job_data = decode(msg.data, "utf-8", "unicode_escape")
+        parsed = parse_response(job_data, ResponseKind.LIST)
+        if parsed.state != JobResponseState.COMPLETE.value:
+            log.error("Feature generation job failed", message=parsed.message)
             return [], False
-
-        return features, True  # type: ignore
+        if not parsed.ok:
+            log.error("Failed to parse feature generation message")
+            return [], False
+        log.info("Parsed feature generation message", features=parsed.data)
+        return parsed.data, True
+
+    async def generate_feature_set(
+        self, arena_agent: Participant, contest: ContestPublic
+    ) -> Optional[FeatureSet]:
+        """Generate a set of random features for the feature pool."""
+        msg = await self.get_generate_features(arena_agent, contest)
+        features, success = self.parse_generate_features_response(msg)
+        return features if success else None
 
     async def handle_generate_features(self, msg: Msg) -> tuple[bool, str]:
         """Handle the message from the arena agent with generated features."""
-        log = self.log.bind(msg=msg.subject)
         features, success = self.parse_generate_features_response(msg)
         if not success:
             return False, "bad feature generation message"
+        return await self.add_random_features(features)
 
-        round = self.contest_round
-        assert round, "should have a contest round"
-
-        try:
-            job_data = decode(msg.data, "utf-8", "unicode_escape")
-            obj = json.loads(job_data)
-            state = obj["state"] if isinstance(obj, dict) and "state" in obj else None
-
-            while isinstance(obj, dict) and "data" in obj:
-                obj = obj["data"]
-                if isinstance(obj, str) and obj.find('"data"') != -1:
-                    obj = json.loads(obj)
-                if state is None and isinstance(obj, dict):
-                    state = obj.get("state", None)  # type: ignore
-
-            if state != JobResponseState.COMPLETE.value:
-                log.error("Feature generation job failed", obj=obj)
-                return False, "job failed"
-            features = parse_list(obj, log=log)
-            log.info("Parsed feature generation message", features=features)
-        except Exception as e:
-            log.error("Failed to parse feature generation message", error=e)
-            return False, "bad feature generation message"
-
+    async def add_random_features(self, features: FeatureSet) -> tuple[bool, str]:
+        """Add generated features to round 0, skipping any off the board."""
+        log = self.log.bind(state="generating_features")
         round = self.contest_round
         assert round, "should have a contest round"
         log.info("Copying new random features to round 0")
-        if features:
-            for f in features:
-                feature = Feature(
-                    id="",
-                    name=f["name"],
-                    description=f["description"] if "description" in f else "",
-                    position=f["position"],
-                    origin=FeatureOriginType.RANDOM,
-                )
-                log.debug(f"Adding feature", feature=feature.name)
-                feature, result = await self.feature_service.create(
-                    feature, self.session
+        arena = self.contest.arena
+        board: Board[str] = Board(arena.width, arena.height)
+        for existing in round.features:
+            board.place_feature(existing.id, existing.position)
+        for f in features or []:
+            position = f.get("position")
+            if not board.is_valid(position):
+                log.warn(
+                    "Skipping feature off the board",
+                    feature=f.get("name"),
+                    position=position,
                 )
-                if feature and result.success:
-                    round.features.append(feature)
-
-                    if "end_position" in f:
-                        # if a feature has a position of 1,1 and an end_position of 3,3, then we need to fill in the cells 1,2 and 2,1 and 2,2
-                        # and then add a feature for each of those cells
-                        start_pos = f["position"]
-                        end_pos = f["end_position"]
-                        start_x, start_y = start_pos.split(",")
-                        end_x, end_y = end_pos.split(",")
-                        for x in range(int(start_x), int(end_x) + 1):
-                            for y in range(int(start_y), int(end_y) + 1):
-                                log.debug(
-                                    "filling in feature cells for ranges", x=x, y=y
-                                )
-                                feature = Feature(
-                                    id="",
-                                    name=f["name"],
-                                    description=(
-                                        f["description"] if "description" in f else ""
-                                    ),
-                                    position=f"{x},{y}",
-                                    origin=FeatureOriginType.RANDOM,
-                                )
-                                feature, result = await self.feature_service.create(
-                                    feature, self.session
-                                )
-                                if feature and result.success:
-                                    round.features.append(feature)
-
-                else:
-                    log.info("could not create feature", result=result)
+                continue
+            feature = Feature(
+                id="",
+                name=f["name"],
+                description=f["description"] if "description" in f else "",
+                position=position,
+                origin=FeatureOriginType.RANDOM,
+            )
+            log.debug(f"Adding feature", feature=feature.name)
+            feature, result = await self.feature_service.create(feature, self.session)
+            if not feature or not result.success:
+                log.info("could not create feature", result=result)
+                continue
+            round.features.append(feature)
+            board.place_feature(feature.id, feature.position)
+
+            end_position = board.clamp(f.get("end_position") or f.get("endPosition"))
+            if end_position:
+                # a feature from 1,1 to 3,3 covers every cell in that rectangle,
+                # so add a feature for each of the other cells
+                start_cell = board.cell(position)
+                end_cell = board.cell(end_position)
+                assert start_cell is not None and end_cell is not None
+                start_x, start_y = board.coords(start_cell)
+                end_x, end_y = board.coords(end_cell)
+                for x in range(min(start_x, end_x), max(start_x, end_x) + 1):
+                    for y in range(min(start_y, end_y), max(start_y, end_y) + 1):
+                        if (x, y) == (start_x, start_y):
+                            continue
+                        log.debug("filling in feature cells for ranges", x=x, y=y)
+                        cell_feature = Feature(
+                            id="",
+                            name=f["name"],
+                            description=(
+                                f["description"] if "description" in f else ""
+                            ),
+                            position=format_position(x, y),
+                            origin=FeatureOriginType.RANDOM,
+                        )
+                        cell_feature, result = await self.feature_service.create(
+                            cell_feature, self.session
+                        )
+                        if cell_feature and result.success:
+                            round.features.append(cell_feature)
+                            board.place_feature(cell_feature.id, cell_feature.position)
 
         self.session.commit()
         return True, ""
@@ -1,8 +1,12 @@
+import asyncio
 import json
+from unittest.mock import AsyncMock
+from unittest.mock import MagicMock
 
 import pytest
 from nats.aio.msg import Msg
 
+from agentarena.arena.models import Contest
 from agentarena.arena.models import ContestState
 from agentarena.arena.statemachines.conftest import add_contest_agents_to_contest
 from agentarena.arena.statemachines.conftest import make_arena
@@ -27,6 +31,13 @@ async def test_initial_state(
     message_broker,
     uuid_service,
     logger,
+    timeout_service,
+    effects_engine,
+    narration_tracker,
+    dispatcher,
+    presence,
+    feature_pool,
+    scheduler,
 ):
     with contest_service.get_session() as session:
         test_arena = await make_arena(session, arena_service)
@@ -43,6 +54,13 @@ async def test_initial_state(
             uuid_service,
             view_service,
             logger,
+            timeout_service=timeout_service,
+            effects_engine=effects_engine,
+            narration_tracker=narration_tracker,
+            dispatcher=dispatcher,
+            presence=presence,
+            feature_pool=feature_pool,
+            scheduler=scheduler,
             auto_advance=False,
         )
         await machine.activate_initial_state()  # type: ignore
@@ -72,6 +90,13 @@ async def test_role_call(
     message_broker,
     uuid_service,
     logger,
+    timeout_service,
+    effects_engine,
+    narration_tracker,
+    dispatcher,
+    presence,
+    feature_pool,
+    scheduler,
 ):
     with contest_service.get_session() as session:
         test_arena = await make_arena(session, arena_service)
@@ -116,6 +141,13 @@ async def test_role_call(
             uuid_service,
             view_service,
             logger,
+            timeout_service=timeout_service,
+            effects_engine=effects_engine,
+            narration_tracker=narration_tracker,
+            dispatcher=dispatcher,
+            presence=presence,
+            feature_pool=feature_pool,
+            scheduler=scheduler,
             auto_advance=False,
         )
         await machine.activate_initial_state()  # type: ignore
@@ -149,6 +181,13 @@ async def test_setup_arena(
     message_broker,
     uuid_service,
     logger,
+    timeout_service,
+    effects_engine,
+    narration_tracker,
+    dispatcher,
+    presence,
+    feature_pool,
+    scheduler,
 ):
     with contest_service.get_session() as session:
         test_arena = await make_arena(session, arena_service)
@@ -178,6 +217,13 @@ async def test_setup_arena(
             uuid_service,
             view_service,
             logger,
+            timeout_service=timeout_service,
+            effects_engine=effects_engine,
+            narration_tracker=narration_tracker,
+            dispatcher=dispatcher,
+            presence=presence,
+            feature_pool=feature_pool,
+            scheduler=scheduler,
             auto_advance=False,
         )
         await machine.activate_initial_state()  # type: ignore
@@ -221,6 +267,13 @@ async def test_in_round_0(
     message_broker,
     uuid_service,
     logger,
+    timeout_service,
+    effects_engine,
+    narration_tracker,
+    dispatcher,
+    presence,
+    feature_pool,
+    scheduler,
 ):
     with contest_service.get_session() as session:
         test_arena = await make_arena(session, arena_service)
@@ -254,6 +307,13 @@ async def test_in_round_0(
             uuid_service,
             view_service,
             logger,
+            timeout_service=timeout_service,
+            effects_engine=effects_engine,
+            narration_tracker=narration_tracker,
+            dispatcher=dispatcher,
+            presence=presence,
+            feature_pool=feature_pool,
+            scheduler=scheduler,
             auto_advance=False,
         )
         await machine.activate_initial_state()  # type: ignore
@@ -337,3 +397,56 @@ async def test_in_round_0(
         assert player2_called
         assert len(test_round.player_actions) == 2
         # remaining tests for round prompting in `test_roundmachine.py`
+
+
+@pytest.mark.asyncio
+async def test_prestaged_setup_failure_fails_contest(
+    logger,
+    timeout_service,
+    effects_engine,
+    narration_tracker,
+    dispatcher,
+    presence,
+    feature_pool,
+    scheduler,
+):
+    contest = Contest(id="contest1", arena_id="arena1", state=ContestState.SETUP_ARENA)
+    message_broker = AsyncMock()
+    machine = ContestMachine(
+        contest,
+        message_broker,
+        MagicMock(),
+        MagicMock(),
+        MagicMock(),
+        MagicMock(),
+        MagicMock(),
+        MagicMock(),
+        MagicMock(),
+        MagicMock(),
+        logger,
+        timeout_service=timeout_service,
+        effects_engine=effects_engine,
+        narration_tracker=narration_tracker,
+        dispatcher=dispatcher,
+        presence=presence,
+        feature_pool=feature_pool,
+        scheduler=scheduler,
+        auto_advance=False,
+        prestage=True,
+    )
+    setup_machine = AsyncMock()
+    setup_machine.current_state_value = ContestRoundState.SETUP_FAIL.value
+    setup_machine.current_state.id = ContestRoundState.SETUP_FAIL.value
+    machine._setup_machine = setup_machine
+    # final states unsubscribe
+    machine.subscriber = AsyncMock()
+    narration = narration_tracker.start(contest.id, 0, asyncio.Event().wait())
+
+    await machine.activate_initial_state()  # type: ignore
+    await asyncio.sleep(0)
+
+    assert machine.current_state.id == ContestState.FAIL.value
+    assert contest.state == ContestState.FAIL.value
+    message_broker.send_message.assert_not_called()
+    assert narration.cancelled()
+    assert narration_tracker.pending_rounds(contest.id) == []
@@ -28,6 +28,11 @@ async def test_initial_state(
     view_service,
     message_broker,
     logger,
+    timeout_service,
+    effects_engine,
+    narration_tracker,
+    dispatcher,
+    scheduler,
 ):
     with round_service.get_session() as session:
         test_arena = await make_arena(session, arena_service)
@@ -47,6 +52,11 @@ async def test_initial_state(
             player_state_service=player_state_service,
             view_service=view_service,
             log=logger,
+            timeout_service=timeout_service,
+            effects_engine=effects_engine,
+            narration_tracker=narration_tracker,
+            dispatcher=dispatcher,
+            scheduler=scheduler,
             auto_advance=False,
         )
         await machine.activate_initial_state()  # type: ignore
@@ -69,6 +79,11 @@ async def test_round_prompting(
     view_service,
     message_broker,
     logger,
+    timeout_service,
+    effects_engine,
+    narration_tracker,
+    dispatcher,
+    scheduler,
 ):
     with round_service.get_session() as session:
         base_feature = await make_feature(
@@ -160,6 +175,11 @@ async def test_round_prompting(
             player_state_service=player_state_service,
             view_service=view_service,
             log=logger,
+            timeout_service=timeout_service,
+            effects_engine=effects_engine,
+            narration_tracker=narration_tracker,
+            dispatcher=dispatcher,
+            scheduler=scheduler,
             auto_advance=False,
         )
         await machine.activate_initial_state()  # type: ignore
@@ -199,6 +219,11 @@ async def test_judging_actions(
     view_service,
     message_broker,
     logger,
+    timeout_service,
+    effects_engine,
+    narration_tracker,
+    dispatcher,
+    scheduler,
 ):
     with round_service.get_session() as session:
         base_feature = await make_feature(
@@ -299,6 +324,11 @@ async def test_judging_actions(
             player_state_service=player_state_service,
             view_service=view_service,
             log=logger,
+            timeout_service=timeout_service,
+            effects_engine=effects_engine,
+            narration_tracker=narration_tracker,
+            dispatcher=dispatcher,
+            scheduler=scheduler,
             auto_advance=False,
         )
         await machine.activate_initial_state()  # type: ignore
@@ -342,6 +372,11 @@ async def test_applying_effects(
     view_service,
     message_broker,
     logger,
+    timeout_service,
+    effects_engine,
+    narration_tracker,
+    dispatcher,
+    scheduler,
 ):
     with round_service.get_session() as session:
         base_feature = await make_feature(
@@ -469,6 +504,11 @@ async def test_applying_effects(
             player_state_service=player_state_service,
             view_service=view_service,
             log=logger,
+            timeout_service=timeout_service,
+            effects_engine=effects_engine,
+            narration_tracker=narration_tracker,
+            dispatcher=dispatcher,
+            scheduler=scheduler,
             auto_advance=False,
         )
         await machine.activate_initial_state()  # type: ignore
@@ -507,6 +547,11 @@ async def test_describing_results(
     view_service,
     message_broker,
     logger,
+    timeout_service,
+    effects_engine,
+    narration_tracker,
+    dispatcher,
+    scheduler,
 ):
     with round_service.get_session() as session:
         base_feature = await make_feature(
@@ -631,6 +676,11 @@ async def test_describing_results(
             player_state_service=player_state_service,
             view_service=view_service,
             log=logger,
+            timeout_service=timeout_service,
+            effects_engine=effects_engine,
+            narration_tracker=narration_tracker,
+            dispatcher=dispatcher,
+            scheduler=scheduler,
             auto_advance=False,
         )
         await machine.activate_initial_state()  # type: ignore
@@ -28,6 +28,8 @@ async def test_initialization(
     round_service,
     message_broker,
     logger,
+    timeout_service,
+    feature_pool,
 ):
     """Test that the SetupMachine initializes correctly."""
     with round_service.get_session() as session:
@@ -40,6 +42,8 @@ async def test_initialization(
             round_service=round_service,
             message_broker=message_broker,
             log=logger,
+            timeout_service=timeout_service,
+            feature_pool=feature_pool,
             auto_advance=False,
             session=session,
         )
@@ -63,6 +67,8 @@ async def test_transition_to_creating_round(
     view_service,
     message_broker,
     logger,
+    timeout_service,
+    feature_pool,
 ):
     """Test transition from idle to creating_round.
     Sometimes fails when run in parallel with other tests with "event_loop" closed.
@@ -80,6 +86,8 @@ async def test_transition_to_creating_round(
             view_service=view_service,
             session=session,
             log=logger,
+            timeout_service=timeout_service,
+            feature_pool=feature_pool,
             auto_advance=False,
         )
         await setup_machine.activate_initial_state()  # type: ignore
@@ -103,6 +111,8 @@ async def test_adding_fixed_features(
     view_service,
     message_broker,
     logger,
+    timeout_service,
+    feature_pool,
 ):
     """Test adding fixed features to the contest."""
     with round_service.get_session() as session:
@@ -130,6 +140,8 @@ async def test_adding_fixed_features(
             view_service=view_service,
             session=session,
             log=logger,
+            timeout_service=timeout_service,
+            feature_pool=feature_pool,
             auto_advance=False,
         )
         await setup_machine.activate_initial_state()  # type: ignore
@@ -160,6 +172,8 @@ async def test_generating_features(
     view_service,
     message_broker: MessageBroker,
     logger,
+    timeout_service,
+    feature_pool,
 ):
     """Test adding fixed features to the contest."""
     with round_service.get_session() as session:
@@ -222,6 +236,8 @@ async def test_generating_features(
             view_service=view_service,
             session=session,
             log=logger,
+            timeout_service=timeout_service,
+            feature_pool=feature_pool,
             auto_advance=False,
         )
         await setup_machine.activate_initial_state()  # type: ignore
@@ -253,6 +269,8 @@ async def test_describing_setup(
     strategy_service,
     agent_service,
     uuid_service,
+    timeout_service,
+    feature_pool,
 ):
     with round_service.get_session() as session:
         base_feature = await make_feature(session, feature_service, "base")
@@ -320,6 +338,8 @@ async def test_describing_setup(
             view_service=view_service,
             session=session,
             log=logger,
+            timeout_service=timeout_service,
+            feature_pool=feature_pool,
             auto_advance=False,
         )
         await setup_machine.activate_initial_state()  # type: ignore
@@ -347,6 +367,8 @@ async def test_full_lifecycle(
     uuid_service,
     view_service,
     logger,
+    timeout_service,
+    feature_pool,
 ):
     """Test that the SetupMachine goes through the full lifecycle."""
     with round_service.get_session() as session:
@@ -437,6 +459,8 @@ async def test_full_lifecycle(
             view_service=view_service,
             session=session,
             log=logger,
+            timeout_service=timeout_service,
+            feature_pool=feature_pool,
             auto_advance=True,
         )
 
@@ -1,5 +1,10 @@
 from codecs import encode
+from typing import Awaitable
+from typing import Callable
 from typing import Coroutine
+from typing import Dict
+from typing import List
+from typing import Optional
 
 import nats
 from nats.aio.client import Client as NatsClient
@@ -12,15 +17,40 @@ from agentarena.models.public import JobResponse
 from agentarena.models.public import ModelChangeMessage
 
 
+class ReconnectListeners:
+    """
+    Listeners called each time the NATS client reconnects, for services which
+    need to resync state from events they may have missed.
+    """
+
+    def __init__(self, logging: LoggingService = Field()):
+        self.log = logging.get_logger("factory")
+        self.listeners: List[Callable[[], Awaitable[None]]] = []
+
+    def add(self, listener: Callable[[], Awaitable[None]]):
+        self.listeners.append(listener)
+
+    async def reconnected(self):
+        self.log.info("Reconnected", listeners=len(self.listeners))
+        for listener in self.listeners:
+            try:
+                await listener()
+            except Exception as e:
+                self.log.error("Reconnect listener failed", error=e)
+
+
 async def get_message_broker_connection(
     nats_url: str,
     logging: LoggingService,
+    reconnect_listeners: ReconnectListeners,
 ):
     """DI method to instantiate a NATS connection"""
     assert nats_url
     log = logging.get_logger("factory")
     log.info("Setup NATS message broker", url=nats_url)
-    nat_conn = await nats.connect(nats_url)
+    nat_conn = await nats.connect(
+        nats_url, reconnected_cb=reconnect_listeners.reconnected
+    )
     yield nat_conn
     await nat_conn.drain()
 
@@ -31,17 +61,25 @@ class MessageBroker:
         client: NatsClient = Field(),
         uuid_service: UUIDService = Field(),
         logging: LoggingService = Field(),
+        reconnect_listeners: ReconnectListeners = Field(),
     ):
         self.client = client
         assert self.client is not None, "Message broker client is not set"
         self.uuid_service = uuid_service
         self.log = logging.get_logger("factory")
+        self.reconnect_listeners = reconnect_listeners
 
     async def nats(self) -> NatsClient:
         if isinstance(self.client, Coroutine):
             self.client = await self.client
         return self.client
 
+    def add_reconnect_listener(self, listener: Callable[[], Awaitable[None]]):
+        """
+        Call `listener` each time the client reconnects.
+        """
+        self.reconnect_listeners.add(listener)
+
     async def publish_model_change(self, channel: str, obj_id: str, detail=""):
         """
         Publish a model change to the message broker.
@@ -58,9 +96,14 @@ class MessageBroker:
         client = await self.nats()
         await client.publish(channel, json)  # type: ignore
 
-    async def publish_response(self, channel: str, response: JobResponse):
+    async def publish_response(
+        self,
+        channel: str,
+        response: JobResponse,
+        headers: Optional[Dict[str, str]] = None,
+    ):
         """
-        Publish a response to the message broker.
+        Publish a response to the message broker, with optional NATS headers.
         """
         log = self.log.bind(job_id=response.job_id, channel=channel)
         if not channel:
@@ -70,7 +113,7 @@ class MessageBroker:
 
         log.debug("Publishing response to channel", channel=channel, response=json)
         client = await self.nats()
-        await client.publish(channel, json)  # type: ignore
+        await client.publish(channel, json, headers=headers)  # type: ignore
 
     async def request_job(
         self, channel: str, payload: str | bytes, timeout: float = 60.0
@@ -7,6 +7,7 @@ from unittest.mock import AsyncMock
 import pytest
 
 from agentarena.clients.message_broker import MessageBroker
+from agentarena.clients.message_broker import ReconnectListeners
 from agentarena.clients.message_broker import get_message_broker_connection
 from agentarena.core.factories.logger_factory import LoggingService
 from agentarena.core.services.uuid_service import UUIDService
@@ -34,11 +35,17 @@ def uuid_service():
 
 
 @pytest.fixture
-def message_broker(mock_nats_client, uuid_service, logging):
+def reconnect_listeners(logging):
+    return ReconnectListeners(logging=logging)
+
+
+@pytest.fixture
+def message_broker(mock_nats_client, uuid_service, logging, reconnect_listeners):
     return MessageBroker(
         client=mock_nats_client,
         uuid_service=uuid_service,
         logging=logging,
+        reconnect_listeners=reconnect_listeners,
     )
 
 
@@ -49,7 +56,9 @@ async def test_nats_returns_client_directly(message_broker, mock_nats_client):
 
 
 @pytest.mark.asyncio
-async def test_nats_awaits_coroutine(uuid_service, logging, mock_nats_client):
+async def test_nats_awaits_coroutine(
+    uuid_service, logging, mock_nats_client, reconnect_listeners
+):
     async def _get_client():
         return mock_nats_client
 
@@ -57,6 +66,7 @@ async def test_nats_awaits_coroutine(uuid_service, logging, mock_nats_client):
         client=cast(Any, _get_client()),
         uuid_service=uuid_service,
         logging=logging,
+        reconnect_listeners=reconnect_listeners,
     )
     client = await broker.nats()
     assert client is mock_nats_client
@@ -104,7 +114,22 @@ async def test_publish_response_publishes_encoded_json(
     await message_broker.publish_response(channel, res)
 
     expected_bytes = encode(res.model_dump_json(), "utf-8", "unicode_escape")
-    mock_nats_client.publish.assert_awaited_once_with(channel, expected_bytes)
+    mock_nats_client.publish.assert_awaited_once_with(
+        channel, expected_bytes, headers=None
+    )
+
+
+@pytest.mark.asyncio
+async def test_publish_response_passes_headers(message_broker, mock_nats_client):
+    channel = "jobs.response"
+    res = JobResponse(job_id="j1", state=JobResponseState.COMPLETE, data="ok")
+
+    await message_broker.publish_response(channel, res, headers={"model": "m1"})
+
+    expected_bytes = encode(res.model_dump_json(), "utf-8", "unicode_escape")
+    mock_nats_client.publish.assert_awaited_once_with(
+        channel, expected_bytes, headers={"model": "m1"}
+    )
 
 
 @pytest.mark.asyncio
@@ -190,7 +215,9 @@ async def test_send_response_calls_send_message_with_json_string(message_broker)
 
 
 @pytest.mark.asyncio
-async def test_get_message_broker_connection_yields_and_drains(monkeypatch, logging):
+async def test_get_message_broker_connection_yields_and_drains(
+    monkeypatch, logging, reconnect_listeners
+):
     connect_mock = AsyncMock()
     conn = AsyncMock()
     conn.drain = AsyncMock()
@@ -201,10 +228,27 @@ async def test_get_message_broker_connection_yields_and_drains(monkeypatch, logg
         connect_mock,
     )
 
-    agen = get_message_broker_connection("nats://localhost:4222", logging)
+    agen = get_message_broker_connection(
+        "nats://localhost:4222", logging, reconnect_listeners
+    )
     yielded_conn = await agen.__anext__()
     assert yielded_conn is conn
-    connect_mock.assert_awaited_once_with("nats://localhost:4222")
+    connect_mock.assert_awaited_once_with(
+        "nats://localhost:4222", reconnected_cb=reconnect_listeners.reconnected
+    )
 
     await agen.aclose()
     # conn.drain.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_reconnect_listeners(message_broker, reconnect_listeners):
+    first = AsyncMock(side_effect=Exception("boom"))
+    second = AsyncMock()
+
+    message_broker.add_reconnect_listener(first)
+    message_broker.add_reconnect_listener(second)
+    await reconnect_listeners.reconnected()
+
+    first.assert_awaited_once()
+    second.assert_awaited_once()
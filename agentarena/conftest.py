@@ -26,9 +26,18 @@ from agentarena.arena.models import PlayerAction
 from agentarena.arena.models import PlayerActionCreate
 from agentarena.arena.models import PlayerState
 from agentarena.arena.models import PlayerStateCreate
+from agentarena.arena.services.contest_scheduler import ContestScheduler
+from agentarena.arena.services.effects_engine import EffectsEngine
+from agentarena.arena.services.feature_pool import FeaturePool
+from agentarena.arena.services.narration_tracker import NarrationTracker
+from agentarena.arena.services.presence_registry import PresenceRegistry
+from agentarena.arena.services.prestage_service import PrestageService
+from agentarena.arena.services.role_dispatcher import RoleDispatcher
 from agentarena.arena.services.round_service import RoundService
+from agentarena.arena.services.timeout_service import TimeoutService
 from agentarena.arena.services.view_service import ViewService
 from agentarena.clients.message_broker import MessageBroker
+from agentarena.clients.message_broker import ReconnectListeners
 from agentarena.core.factories.db_factory import get_engine
 from agentarena.core.factories.environment_factory import get_project_root
 from agentarena.core.factories.logger_factory import LoggingService
@@ -293,7 +302,12 @@ def nats_url(nats_container):
 
 @pytest.fixture(scope="session")
 def message_broker(nats_client, uuid_service, logging):
-    return MessageBroker(client=nats_client, uuid_service=uuid_service, logging=logging)
+    return MessageBroker(
+        client=nats_client,
+        uuid_service=uuid_service,
+        logging=logging,
+        reconnect_listeners=ReconnectListeners(logging=logging),
+    )
 
 
 @pytest.fixture(scope="session")
@@ -426,6 +440,46 @@ def view_service(logging):
     return ViewService(logging=logging)
 
 
+@pytest.fixture
+def scheduler():
+    return ContestScheduler()
+
+
+@pytest.fixture
+def timeout_service(scheduler):
+    return TimeoutService(scheduler=scheduler)
+
+
+@pytest.fixture
+def effects_engine():
+    return EffectsEngine()
+
+
+@pytest.fixture
+def narration_tracker():
+    return NarrationTracker()
+
+
+@pytest.fixture
+def dispatcher(timeout_service):
+    return RoleDispatcher(timeout_service=timeout_service)
+
+
+@pytest.fixture
+def presence():
+    return PresenceRegistry()
+
+
+@pytest.fixture
+def feature_pool():
+    return FeaturePool()
+
+
+@pytest.fixture
+def prestage_service():
+    return PrestageService()
+
+
 @pytest.fixture(scope="session")
 def config_file(nats_url: str):
     with open("agent-arena-test-config.yaml", "r") as f:
@@ -22,6 +22,10 @@ from prompt_toolkit.widgets import Frame
 from prompt_toolkit.widgets import TextArea
 
 from agentarena.models.constants import PromptType
+from agentarena.tournament.models import ContestResult
+from agentarena.tournament.models import TournamentSpec
+from agentarena.tournament.runner import TournamentRunner
+from agentarena.tournament.runner import format_standings
 from agentarena.util.files import find_file_upwards
 
 from .clients import ArenaClient
@@ -146,6 +150,14 @@ def print_strategy_list(strategies):
         )
 
 
+def print_tournament_stage(stage: int, results: List[ContestResult]):
+    print_title(f"Stage {stage}: {len(results)} contests", info=True)
+    for r in results:
+        players = " vs ".join(r.pairing.player_ids)
+        outcome = r.winner_id or r.error or "no winner"
+        print(HTML(f"  {r.contest_id} - {players} - {r.state.value} - {outcome}"))
+
+
 def read_config():
     config_file = os.getenv("AGENTARENA_CONFIG_FILE", "agent-arena-config.yaml")
     print(f"Using config file: {config_file}")
@@ -463,6 +475,19 @@ BASE_COMMANDS = {
             },
         },
     },
+    "tournament": {
+        "description": "Tournament Control",
+        "commands": {
+            "run": {
+                "description": "run a tournament from a spec file",
+                "commands": {},
+            },
+            "standings": {
+                "description": "show the standings of the last tournament",
+                "commands": {},
+            },
+        },
+    },
 }
 
 
@@ -1347,6 +1372,42 @@ class ArenaCommander:
         print_strategy_list(strategies)
         return True
 
+    async def cmd_tournament(self, args: list[str]):
+        if len(args) == 0:
+            args = ["standings"]
+
+        cmd = args.pop(0)
+        if cmd == "run":
+            await self.cmd_tournament_run(args)
+        elif cmd == "standings":
+            report = self.loaded.get("tournament", None)
+            if not report:
+                print_title("No tournament loaded", error=True)
+                return True
+            print(format_standings(report))
+        else:
+            print_title(f"Invalid tournament command: {cmd}", error=True)
+        return True
+
+    async def cmd_tournament_run(self, args: list[str]):
+        if len(args) == 0:
+            spec_file = await prompt_str("Spec file", default="tournament.yaml")
+        else:
+            spec_file = args[0]
+        with open(spec_file, "r") as f:
+            spec = TournamentSpec.model_validate(yaml.safe_load(f))
+
+        print_title(f"Running {spec.format} tournament {spec.name}", info=True)
+        runner = TournamentRunner(
+            self.config["arena"],
+            self.config.get("tournament"),
+            on_stage=print_tournament_stage,
+        )
+        report = await runner.run(spec)
+        self.loaded["tournament"] = report
+        print(format_standings(report))
+        return True
+
     async def load_all(self):
         title = HTML("<ansiblue>Loading data...</ansiblue>")
         fetches = [
@@ -1390,6 +1451,8 @@ class ArenaCommander:
             await self.cmd_participant(args)
         elif cmd == "strategy":
             await self.cmd_strategy(args)
+        elif cmd == "tournament":
+            await self.cmd_tournament(args)
         else:
             print_title(f"Unknown command: {cmd}", error=True)
 
@@ -0,0 +1,71 @@
+from typing import Callable
+
+from agentarena.models.constants import BreakerState
+from agentarena.models.policies import BreakerPolicy
+
+
+class CircuitBreaker:
+    """
+    A closed/open/half-open circuit breaker.
+    """
+
+    def __init__(self, policy: BreakerPolicy, clock: Callable[[], float]):
+        self.policy = policy
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_running = False
+        self.trial_started_at = 0.0
+        self._state = BreakerState.CLOSED
+
+    @property
+    def state(self) -> BreakerState:
+        if (
+            self._state == BreakerState.OPEN
+            and self.clock() - self.opened_at >= self.policy.reset_timeout
+        ):
+            self._state = BreakerState.HALF_OPEN
+            self.trial_running = False
+        return self._state
+
+    def allow(self) -> bool:
+        """
+        Whether a request may go through. In the half-open state, only one
+        trial request is allowed until its result is recorded, or until
+        `reset_timeout` passes without one, in case it was never recorded.
+        """
+        state = self.state
+        if state == BreakerState.CLOSED:
+            return True
+        if state != BreakerState.HALF_OPEN:
+            return False
+        now = self.clock()
+        if (
+            self.trial_running
+            and now - self.trial_started_at < self.policy.reset_timeout
+        ):
+            return False
+        self.trial_running = True
+        self.trial_started_at = now
+        return True
+
+    def release(self):
+        """
+        End a half-open trial without a result, so another may go.
+        """
+        self.trial_running = False
+
+    def record_success(self):
+        self.failures = 0
+        self.trial_running = False
+        self._state = BreakerState.CLOSED
+
+    def record_failure(self):
+        self.failures += 1
+        self.trial_running = False
+        if (
+            self._state == BreakerState.HALF_OPEN
+            or self.failures >= self.policy.failure_threshold
+        ):
+            self._state = BreakerState.OPEN
+            self.opened_at = self.clock()
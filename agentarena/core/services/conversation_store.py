@@ -0,0 +1,89 @@
+from collections import OrderedDict
+from typing import Optional
+from typing import Tuple
+
+import llm
+from pydantic import BaseModel
+from pydantic import Field
+
+from agentarena.models.policies import ConversationPolicy
+
+
+class ConversationTurn(BaseModel):
+    """
+    A generation which may continue an agent's conversation.
+    """
+
+    key: str = Field(description="Conversation key, the agent and contest")
+    round_no: int = Field(description="Round the turn is for")
+
+
+class ConversationHandle:
+    """
+    An llm conversation, and the last round it has seen.
+    """
+
+    def __init__(self, conversation: llm.Conversation, model: str):
+        self.conversation = conversation
+        self.model = model
+        self.round_no = -1
+        self.busy = False
+
+    @property
+    def turns(self) -> int:
+        return len(self.conversation.responses)
+
+
+class ConversationStore:
+    """
+    Keeps the llm conversations for agents in conversation mode, in memory.
+
+    A turn continues the conversation only if it is for the next round, on the
+    same model, and the conversation isn't at `max_turns`. Otherwise a new
+    conversation is started with the full prompt. Conversations are lost on
+    restart, so the first turn afterwards is always a full prompt.
+    """
+
+    def __init__(self, policy: Optional[ConversationPolicy] = None):
+        self.policy = policy or ConversationPolicy()
+        self.handles: OrderedDict[str, ConversationHandle] = OrderedDict()
+
+    def checkout(
+        self, turn: ConversationTurn, model: llm.Model, model_key: str
+    ) -> Tuple[Optional[ConversationHandle], bool]:
+        """
+        Get the conversation for a turn, and whether it continues from the
+        previous round. Returns no handle if the conversation is in use.
+        """
+        handle = self.handles.get(turn.key)
+        if handle and handle.busy:
+            return None, False
+        continuing = (
+            handle is not None
+            and handle.model == model_key
+            and handle.round_no == turn.round_no - 1
+            and handle.turns < self.policy.max_turns
+        )
+        if not continuing:
+            handle = ConversationHandle(model.conversation(), model_key)
+            self.handles[turn.key] = handle
+        assert handle is not None
+        self.handles.move_to_end(turn.key)
+        while len(self.handles) > self.policy.max_conversations:
+            self.handles.popitem(last=False)
+        handle.busy = True
+        return handle, continuing
+
+    def checkin(self, turn: ConversationTurn, handle: ConversationHandle, turns: int):
+        """
+        Release the conversation after a generation. It is kept only if the
+        response was added to it, so it now has `turns` responses.
+        """
+        handle.busy = False
+        if handle.turns == turns:
+            handle.round_no = turn.round_no
+        elif self.handles.get(turn.key) is handle:
+            del self.handles[turn.key]
+
+    def drop(self, key: str):
+        self.handles.pop(key, None)
@@ -4,6 +4,9 @@ from typing import Callable
 from typing import List
 from typing import Sequence
 
+from sqlalchemy import inspect
+from sqlalchemy import literal
+from sqlalchemy import text
 from sqlmodel import Field
 from sqlmodel import Session
 from sqlmodel import SQLModel
@@ -48,9 +51,41 @@ class DbService:
         if not self._created:
             self.log.info("Creating DB")
             SQLModel.metadata.create_all(self.engine)
+            self.add_missing_columns()
             self._created = True
         return self
 
+    def add_missing_columns(self):
+        """
+        Add model columns missing from existing tables, which `create_all`
+        leaves alone. Existing rows get the column's default, or NULL if it
+        has none. Renamed or retyped columns still need a manual migration.
+        """
+        inspector = inspect(self.engine)
+        dialect = self.engine.dialect
+        with self.engine.begin() as conn:
+            for table in SQLModel.metadata.sorted_tables:
+                if not inspector.has_table(table.name):
+                    continue
+                existing = {c["name"] for c in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    if column.name in existing:
+                        continue
+                    ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} "
+                    ddl += column.type.compile(dialect=dialect)
+                    default = column.default
+                    if default is not None and default.is_scalar:
+                        value = literal(default.arg, column.type).compile(
+                            dialect=dialect, compile_kwargs={"literal_binds": True}
+                        )
+                        ddl += f" DEFAULT {value}"
+                        if not column.nullable:
+                            ddl += " NOT NULL"
+                    self.log.info(
+                        "Adding missing column", table=table.name, column=column.name
+                    )
+                    conn.execute(text(ddl))
+
     def create(self, obj, session: Session):
         session.add(obj)
         session.commit()
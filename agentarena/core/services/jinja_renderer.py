@@ -1,5 +1,13 @@
+import os
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from jinja2 import BaseLoader
 from jinja2 import Environment
+from jinja2 import FileSystemBytecodeCache
 from jinja2 import PackageLoader
+from jinja2 import Template
 from jinja2 import TemplateNotFound
 from jinja2 import select_autoescape
 from jinja2.exceptions import TemplateError
@@ -8,47 +16,111 @@ from jinja2.exceptions import UndefinedError
 from agentarena.core.exceptions import InvalidTemplateException
 from agentarena.core.exceptions import TemplateDataException
 from agentarena.core.exceptions import TemplateRenderingException
+from agentarena.util.jinja_helpers import TemplateIndex
 from agentarena.util.jinja_helpers import datetimeformat_filter
 from agentarena.util.jinja_helpers import find_obj_by_id
 from agentarena.util.jinja_helpers import get_attr_by_id
+from agentarena.util.jinja_helpers import index_by_id
 
 
 class JinjaRenderer:
+    """
+    Renders Jinja templates by key.
+
+    Template resolution is memoized per key, so after the first render a
+    template is a dict lookup rather than a probe of each candidate name in
+    every loader. If `cache_dir` is set, compiled templates are kept there in
+    a bytecode cache, and `preload` resolves every template up front.
+    """
 
-    def __init__(self, base_path: str = "agentarena.core"):
+    def __init__(
+        self,
+        base_path: str = "agentarena.core",
+        projectroot: str = "",
+        cache_dir: Optional[str] = None,
+        preload: bool = False,
+    ):
         self.env = Environment(
             loader=PackageLoader(base_path), autoescape=select_autoescape()
         )
         self.env.filters["datetimeformat"] = datetimeformat_filter
         self.env.filters["find_obj_by_id"] = find_obj_by_id
         self.env.filters["get_attr_by_id"] = get_attr_by_id
+        self.env.filters["index_by_id"] = index_by_id
+        self.templates: Dict[str, Template] = {}
+        self.missing: set[str] = set()
+        self.preload = preload
+        if cache_dir:
+            directory = cache_dir.replace("<projectroot>", str(projectroot))
+            os.makedirs(directory, exist_ok=True)
+            self.env.bytecode_cache = FileSystemBytecodeCache(directory)
+        if preload:
+            self.preload_templates()
 
-    def get_template(self, key: str):
-        possibles = [key, f"{key}.md", f"{key}.md.j2"]
+    def set_loader(self, loader: BaseLoader):
+        """
+        Replace the template loader, dropping resolved templates.
+        """
+        self.env.loader = loader
+        self.templates.clear()
+        self.missing.clear()
+        if self.preload:
+            self.preload_templates()
+
+    def preload_templates(self) -> int:
+        """
+        Resolve and compile every template the loader knows about.
+        """
+        for name in self.env.list_templates():
+            key = name
+            for suffix in (".md.j2", ".md"):
+                if name.endswith(suffix):
+                    key = name.removesuffix(suffix)
+                    break
+            self.get_template(key)
+        return len(self.templates)
+
+    def candidate_names(self, key: str) -> List[str]:
+        possibles = [key, f"{key}.j2", f"{key}.md", f"{key}.md.j2"]
         if key.lower() != key:
             possibles.append(key.lower())
+            possibles.append(f"{key.lower()}.j2")
             possibles.append(f"{key.lower()}.md")
             possibles.append(f"{key.lower()}.md.j2")
+        return possibles
 
+    def get_template(self, key: str):
+        template = self.templates.get(key)
+        if template is not None:
+            return template
         try:
-            return self.env.select_template(possibles)
+            template = self.env.select_template(self.candidate_names(key))
         except TemplateNotFound as te:
             raise InvalidTemplateException(key)
+        self.templates[key] = template
+        return template
 
-    def render_template(self, key: str, data: dict) -> str:
-        possibles = [key, f"{key}.j2", f"{key}.md", f"{key}.md.j2"]
-        if key.lower() != key:
-            possibles.append(key.lower())
-            possibles.append(f"{key.lower()}.md")
-            possibles.append(f"{key.lower()}.md.j2")
-
+    def has_template(self, key: str) -> bool:
+        """
+        Whether a template exists for the key, remembering misses.
+        """
+        if key in self.templates:
+            return True
+        if key in self.missing:
+            return False
         try:
-            template = self.env.select_template(possibles)
-        except InvalidTemplateException as te:
-            raise Exception(f"Could not find template {key}")
+            self.get_template(key)
+        except InvalidTemplateException:
+            self.missing.add(key)
+            return False
+        return True
+
+    def render_template(self, key: str, data: dict) -> str:
+        template = self.get_template(key)
+        context = data if "index" in data else {**data, "index": TemplateIndex(data)}
 
         try:
-            return template.render(data)
+            return template.render(context)
         except UndefinedError as e:
             # Handle specific Jinja2 undefined errors
             error_msg = str(e)
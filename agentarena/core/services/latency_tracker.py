@@ -0,0 +1,40 @@
+from collections import deque
+from typing import Deque
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+
+class LatencyTracker:
+    """
+    Keeps a rolling window of generation latencies, per (model, prompt type).
+    """
+
+    def __init__(self, window: int = 100):
+        self.window = window
+        self.samples: Dict[Tuple[str, str], Deque[float]] = {}
+
+    def record(self, model: str, prompt_type: str, seconds: float):
+        key = (model, prompt_type)
+        if key not in self.samples:
+            self.samples[key] = deque(maxlen=self.window)
+        self.samples[key].append(seconds)
+
+    def count(self, model: str, prompt_type: str) -> int:
+        samples = self.samples.get((model, prompt_type))
+        return len(samples) if samples else 0
+
+    def percentile(
+        self, model: str, prompt_type: str, pct: float, min_samples: int = 1
+    ) -> Optional[float]:
+        """
+        Returns the latency at the given percentile (0-100), or None if there
+        are fewer than `min_samples` observations.
+        """
+        samples = self.samples.get((model, prompt_type))
+        if not samples or len(samples) < max(min_samples, 1):
+            return None
+        ordered = sorted(samples)
+        ix = round((pct / 100.0) * (len(ordered) - 1))
+        ix = min(max(ix, 0), len(ordered) - 1)
+        return ordered[ix]
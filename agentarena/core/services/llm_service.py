@@ -1,20 +1,41 @@
+import asyncio
+import json
+import time
 from datetime import datetime
+from typing import Any
+from typing import Callable
 from typing import Dict
 from typing import List
+from typing import Optional
+from typing import Tuple
 
 import llm
 from sqlmodel import Field
 from sqlmodel import Session
+from sqlmodel import select
 
 from agentarena.clients.message_broker import MessageBroker
 from agentarena.core.factories.logger_factory import LoggingService
+from agentarena.core.services.conversation_store import ConversationHandle
+from agentarena.core.services.conversation_store import ConversationStore
+from agentarena.core.services.conversation_store import ConversationTurn
 from agentarena.core.services.db_service import DbService
+from agentarena.core.services.latency_tracker import LatencyTracker
 from agentarena.core.services.uuid_service import UUIDService
 from agentarena.models.constants import DEFAULT_AGENT_MODEL
 from agentarena.models.constants import JobState
 from agentarena.models.constants import PromptType
 from agentarena.models.job import GenerateJob
 from agentarena.models.job import GenerateJobCreate
+from agentarena.models.llm import LlmModel
+from agentarena.models.llm import LlmModelStats
+from agentarena.models.policies import ConversationPolicy
+from agentarena.models.policies import HedgePolicy
+from agentarena.models.policies import StreamPolicy
+from agentarena.models.policies import parse_policies
+from agentarena.models.responses import RESPONSE_ROOT_KEYS
+from agentarena.models.responses import get_response_schema
+from agentarena.util.incremental_json import JsonObjectScanner
 
 
 class LLMService:
@@ -26,34 +47,181 @@ class LLMService:
         message_broker: MessageBroker = Field(),
         uuid_service: UUIDService = Field(),
         logging: LoggingService = Field(),
+        hedging: Optional[Dict[str, Any]] = None,
+        streaming: Optional[Dict[str, Any]] = None,
+        conversations: Optional[Dict[str, Any]] = None,
     ):
         assert llm_map is not None, "llm_map is required"
         self.llm_map = {}
+        # models opted in to provider-side caching of the prompt prefix
+        self.cache_prefix = set()
         for llm in llm_map:
             self.llm_map[llm["name"]] = llm["key"]
+            if llm.get("cache_prefix"):
+                self.cache_prefix.add(llm["key"])
         self.log = logging.get_logger("llm")
         self.log.debug(f"LLM map is {len(llm_map)}")
         self.message_broker = message_broker
         self.db_service = db_service
         self.uuid_service = uuid_service
+        self.hedge_policies: Dict[PromptType, HedgePolicy] = parse_policies(
+            hedging, HedgePolicy
+        )
+        self.stream_policies: Dict[PromptType, StreamPolicy] = parse_policies(
+            streaming, StreamPolicy
+        )
+        self.latency = LatencyTracker()
+        self.conversations = ConversationStore(
+            ConversationPolicy.model_validate(conversations or {})
+        )
 
-    def generate(self, model_alias: str, prompt: str) -> str:
+    def resolve_model(self, model_alias: str) -> str:
         """
-        Query the LLM and return the text
+        Resolve a model alias from the llm map to its key
         """
         if model_alias in self.llm_map:
             model_alias = self.llm_map[model_alias]
-            self.log.debug(f"Using model {model_alias} from map")
-        if not model_alias:
-            model_alias = DEFAULT_AGENT_MODEL
+        return model_alias or DEFAULT_AGENT_MODEL
+
+    def generate(
+        self,
+        model_alias: str,
+        prompt: str,
+        on_chunk: Optional[Callable[[str], Any]] = None,
+        scanner: Optional[JsonObjectScanner] = None,
+        options: Optional[Dict[str, Any]] = None,
+        conversation: Optional[llm.Conversation] = None,
+    ) -> str:
+        """
+        Query the LLM and return the text.
+
+        If `on_chunk` or `scanner` is given the response is streamed, calling
+        `on_chunk` for each chunk, and stopping once the scanner has a complete
+        object. `options` are the structured output options from `output_options`.
+        With a `conversation` the prompt continues it, and is always read to the
+        end, since llm only adds complete responses to the conversation.
+        """
+        model_alias = self.resolve_model(model_alias)
         if model_alias.startswith("TEST:"):
             return model_alias.split(":")[1]
         try:
             model = llm.get_model(model_alias)
-            return model.prompt(prompt).text()
+            kwargs = self.structured_kwargs(model, options)
+            prompt, cache_kwargs = self.cache_kwargs(
+                model, model_alias, prompt, (options or {}).get("prefix_length", 0)
+            )
+            if conversation is not None:
+                scanner = None
+                response = conversation.prompt(prompt, **kwargs, **cache_kwargs)
+            else:
+                response = model.prompt(prompt, **kwargs, **cache_kwargs)
+            if on_chunk is None and scanner is None:
+                text = response.text()
+            else:
+                chunks = []
+                for chunk in response:
+                    chunks.append(chunk)
+                    if on_chunk:
+                        on_chunk(chunk)
+                    if scanner and scanner.feed(chunk):
+                        self.log.debug("object complete, dispatching early")
+                        break
+                text = "".join(chunks)
         except llm.UnknownModelError as ue:
             self.log.warn("Could not get model from LLM", model=model_alias)
             raise ue
+        if kwargs and options:
+            return self.unwrap_structured(text, options.get("root_key"))
+        return text
+
+    def structured_kwargs(
+        self, model: llm.Model, options: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Prompt kwargs for structured output, limited to what the llm plugin
+        for the model supports.
+        """
+        if not options:
+            return {}
+        if options.get("schema") and getattr(model, "supports_schema", False):
+            return {"schema": options["schema"]}
+        if options.get("json_mode") and "json_object" in model.Options.model_fields:
+            return {"json_object": True}
+        return {}
+
+    def cache_kwargs(
+        self, model: llm.Model, model_key: str, prompt: str, prefix_length: int
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Split the stable prefix off into a cached fragment, for models opted in
+        with `cache_prefix` whose llm plugin has a `cache` option. llm joins
+        fragments and the prompt with a newline, so the text sent is the same.
+        """
+        if (
+            not prefix_length
+            or model_key not in self.cache_prefix
+            or "cache" not in model.Options.model_fields
+        ):
+            return prompt, {}
+        return prompt[prefix_length + 1 :], {
+            "fragments": [prompt[:prefix_length]],
+            "cache": True,
+        }
+
+    def start_turn(
+        self, turn: Optional[ConversationTurn], model_key: str, prefix_length: int
+    ) -> Tuple[Optional[ConversationHandle], bool]:
+        """
+        The conversation for a turn, and whether it continues from the previous
+        round. Prompts without a stable prefix have no delta to send, so they
+        don't use conversations.
+        """
+        if not turn or not prefix_length or model_key.startswith("TEST:"):
+            return None, False
+        try:
+            model = llm.get_model(model_key)
+        except llm.UnknownModelError:
+            return None, False
+        return self.conversations.checkout(turn, model, model_key)
+
+    def unwrap_structured(self, text: str, root_key: Optional[str]) -> str:
+        """
+        Structured output is a single JSON object, which we unwrap when the
+        arena expects something else at the root, such as a list.
+        """
+        if not root_key:
+            return text
+        try:
+            obj = json.loads(text)
+        except json.JSONDecodeError:
+            self.log.warn("structured output was not valid JSON")
+            return text
+        if isinstance(obj, dict) and root_key in obj:
+            return json.dumps(obj[root_key])
+        return text
+
+    def get_llm_model(self, model: str, session: Session) -> Optional[LlmModel]:
+        stmt = select(LlmModel).where(LlmModel.model_id == self.resolve_model(model))
+        return session.exec(stmt).first()
+
+    def output_options(
+        self, model: str, prompt_type: PromptType, session: Session
+    ) -> Dict[str, Any]:
+        """
+        Structured output options for the prompt type, if it has a response
+        schema and the model supports JSON or schemas.
+        """
+        schema = get_response_schema(prompt_type)
+        if not schema:
+            return {}
+        llm_model = self.get_llm_model(model, session)
+        if not llm_model or not (llm_model.supports_json or llm_model.supports_schema):
+            return {}
+        return {
+            "schema": schema if llm_model.supports_schema else None,
+            "json_mode": llm_model.supports_json,
+            "root_key": RESPONSE_ROOT_KEYS.get(prompt_type),
+        }
 
     def make_generate_job(
         self, job_id: str, model: str, prompt: str, prompt_type: PromptType
@@ -71,7 +239,19 @@ class LLMService:
         )
         return job
 
-    async def execute_job(self, gen_id: str, session: Session):
+    async def execute_job(
+        self,
+        gen_id: str,
+        session: Session,
+        prefix_length: int = 0,
+        conversation: Optional[ConversationTurn] = None,
+    ):
+        """
+        Run the generation for a job. `prefix_length` is the length of the
+        stable prompt prefix, which may be sent as a cached fragment. With a
+        `conversation` turn, only the part after the prefix is sent when the
+        agent's conversation continues from the previous round.
+        """
         log = self.log.bind(gen_id=gen_id)
         job = None
         generated = ""
@@ -96,22 +276,69 @@ class LLMService:
         )
 
         log.debug("start generation")
+        attempts: List[Dict[str, Any]] = []
+        chunk_channel = f"actor.llm.{job.id}.{job.job_id}.chunk"
+        policy = self.hedge_policies.get(job.prompt_type)
+        models = {model}
+        if policy and policy.backup_model:
+            models.add(policy.backup_model)
+        output_options = {
+            m: self.output_options(m, job.prompt_type, session) for m in models
+        }
+        handle, continuing = self.start_turn(conversation, model, prefix_length)
+        primary_prompt = prompt[prefix_length + 1 :] if continuing else prompt
+        turns = handle.turns + 1 if handle else 0
+        if handle:
+            log.debug("conversation turn", continuing=continuing, turns=turns)
+        if prefix_length:
+            for m in models:
+                if continuing and m == model:
+                    continue
+                output_options[m] = {
+                    **output_options[m],
+                    "prefix_length": prefix_length,
+                }
         try:
-            generated = self.generate(model, prompt)
+            # a cancelled attempt's thread would still add to the conversation
+            if policy and not handle:
+                generated = await self.generate_hedged(
+                    model,
+                    prompt,
+                    job.prompt_type,
+                    policy,
+                    attempts,
+                    log,
+                    chunk_channel=chunk_channel,
+                    output_options=output_options,
+                )
+            else:
+                generated = await self.attempt(
+                    model,
+                    primary_prompt,
+                    job.prompt_type,
+                    attempts,
+                    chunk_channel=chunk_channel,
+                    options=output_options[model],
+                    conversation=handle.conversation if handle else None,
+                )
         except llm.UnknownModelError:
             log.error(f"Invalid model {model}")
-            job.state = JobState.FAIL
-            job.finished_at = int(datetime.now().timestamp())
-            session.flush()
-            # Send message that job has failed
-            await self.message_broker.publish_model_change(
-                channel=f"actor.llm.{job.id}.{job.job_id}.{JobState.FAIL.value}",
-                obj_id=job.job_id,
-                detail="Generation job failed due to invalid model",
+            await self.fail_job(
+                job, attempts, session, "Generation job failed due to invalid model"
             )
             return job  # Return early as the job failed
+        except Exception as e:
+            # provider and network errors, or the hedge's error
+            log.error("Generation failed", error=e)
+            await self.fail_job(job, attempts, session, f"Generation job failed: {e}")
+            return job
+        finally:
+            if handle and conversation:
+                self.conversations.checkin(conversation, handle, turns)
         log.debug("end generation")
 
+        job.attempts = attempts
+        self.save_stats(job, attempts, session)
         job.state = JobState.COMPLETE
         job.generated = generated
         job.finished_at = int(datetime.now().timestamp())
@@ -124,3 +351,205 @@ class LLMService:
         )
 
         return job
+
+    async def fail_job(
+        self,
+        job: GenerateJob,
+        attempts: List[Dict[str, Any]],
+        session: Session,
+        detail: str,
+    ):
+        """
+        Mark a job failed, saving its attempts, and send the failure.
+        """
+        job.attempts = attempts
+        self.save_stats(job, attempts, session)
+        job.state = JobState.FAIL
+        job.finished_at = int(datetime.now().timestamp())
+        session.flush()
+        # Send message that job has failed
+        await self.message_broker.publish_model_change(
+            channel=f"actor.llm.{job.id}.{job.job_id}.{JobState.FAIL.value}",
+            obj_id=job.job_id,
+            detail=detail,
+        )
+
+    async def attempt(
+        self,
+        model: str,
+        prompt: str,
+        prompt_type: PromptType,
+        attempts: List[Dict[str, Any]],
+        hedge: bool = False,
+        chunk_channel: str = "",
+        options: Optional[Dict[str, Any]] = None,
+        conversation: Optional[llm.Conversation] = None,
+    ) -> str:
+        """
+        Run one generation in a worker thread, recording it in `attempts`.
+
+        If the prompt type has a stream policy, the response is streamed, with
+        chunks published on `chunk_channel`.
+        """
+        record: Dict[str, Any] = {
+            "model": model,
+            "hedge": hedge,
+            "conversation": conversation is not None,
+            "prompt_chars": len(prompt),
+            "state": JobState.REQUEST.value,
+            "started_at": int(datetime.now().timestamp()),
+            "finished_at": 0,
+        }
+        attempts.append(record)
+        on_chunk = None
+        scanner = None
+        stream_policy = self.stream_policies.get(prompt_type)
+        if stream_policy:
+            if stream_policy.publish_chunks and chunk_channel:
+                on_chunk = self.chunk_publisher(chunk_channel)
+            if stream_policy.early_dispatch:
+                scanner = JsonObjectScanner(stream_policy.required_keys)
+        start = time.monotonic()
+        try:
+            generated = await asyncio.to_thread(
+                self.generate, model, prompt, on_chunk, scanner, options, conversation
+            )
+        except asyncio.CancelledError:
+            record["state"] = "cancelled"
+            record["finished_at"] = int(datetime.now().timestamp())
+            raise
+        except Exception:
+            record["state"] = JobState.FAIL.value
+            record["finished_at"] = int(datetime.now().timestamp())
+            record["duration_ms"] = int((time.monotonic() - start) * 1000)
+            raise
+        elapsed = time.monotonic() - start
+        record["state"] = JobState.COMPLETE.value
+        record["finished_at"] = int(datetime.now().timestamp())
+        record["duration_ms"] = int(elapsed * 1000)
+        self.latency.record(model, prompt_type.value, elapsed)
+        return generated
+
+    def chunk_publisher(self, channel: str) -> Callable[[str], Any]:
+        """
+        Make a callback which publishes chunks from the worker thread, via
+        the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+
+        def publish(chunk: str):
+            asyncio.run_coroutine_threadsafe(
+                self.message_broker.send_message(channel, chunk), loop
+            )
+
+        return publish
+
+    def save_stats(
+        self, job: GenerateJob, attempts: List[Dict[str, Any]], session: Session
+    ):
+        """
+        Persist the finished attempts of a job as LlmModelStats, for models
+        which are in the db.
+        """
+        for record in attempts:
+            if record["state"] not in (JobState.COMPLETE.value, JobState.FAIL.value):
+                continue
+            llm_model = self.get_llm_model(record["model"], session)
+            if not llm_model:
+                continue
+            stats = LlmModelStats(
+                id=self.uuid_service.make_id(),
+                llm_model_id=llm_model.id,
+                eval_type=job.prompt_type.value,
+                run_id=job.job_id,
+                duration_ms=record.get("duration_ms"),
+                success=record["state"] == JobState.COMPLETE.value,
+                timestamp=record["finished_at"] * 1000,
+                created_at=int(datetime.now().timestamp()),
+            )
+            session.add(stats)
+
+    def hedge_delay(self, model: str, prompt_type: PromptType, policy: HedgePolicy):
+        """
+        How long to wait on the primary request before sending the hedge.
+        """
+        observed = self.latency.percentile(
+            model, prompt_type.value, policy.percentile, policy.min_samples
+        )
+        delay = observed if observed is not None else policy.delay
+        return max(delay, policy.min_delay)
+
+    async def generate_hedged(
+        self,
+        model: str,
+        prompt: str,
+        prompt_type: PromptType,
+        policy: HedgePolicy,
+        attempts: List[Dict[str, Any]],
+        log,
+        chunk_channel: str = "",
+        output_options: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> str:
+        """
+        Generate with a hedged second request if the first is slower than usual.
+
+        The first valid response wins and the other task is cancelled. The llm
+        library is synchronous, so a cancelled attempt's thread runs to completion
+        in the background, but its result is discarded. Only the primary attempt
+        publishes chunks.
+        """
+        delay = self.hedge_delay(model, prompt_type, policy)
+        primary = asyncio.create_task(
+            self.attempt(
+                model,
+                prompt,
+                prompt_type,
+                attempts,
+                chunk_channel=chunk_channel,
+                options=(output_options or {}).get(model),
+            )
+        )
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            # fast enough, or failed before the hedge was due
+            return primary.result()
+
+        backup_model = policy.backup_model or model
+        log.info(
+            "hedging slow generation",
+            delay=delay,
+            model=model,
+            backup_model=backup_model,
+        )
+        hedge = asyncio.create_task(
+            self.attempt(
+                backup_model,
+                prompt,
+                prompt_type,
+                attempts,
+                hedge=True,
+                options=(output_options or {}).get(backup_model),
+            )
+        )
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is not None:
+                        error = error or task.exception()
+                        continue
+                    generated = task.result()
+                    if generated:
+                        return generated
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        if error:
+            raise error
+        return ""
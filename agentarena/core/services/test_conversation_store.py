@@ -0,0 +1,78 @@
+from unittest.mock import MagicMock
+
+from agentarena.core.services.conversation_store import ConversationStore
+from agentarena.core.services.conversation_store import ConversationTurn
+from agentarena.models.policies import ConversationPolicy
+
+
+def make_model():
+    model = MagicMock()
+    model.conversation.side_effect = lambda: MagicMock(responses=[])
+    return model
+
+
+def take_turn(store, model, round_no, key="agent1.contest1", model_key="m1"):
+    turn = ConversationTurn(key=key, round_no=round_no)
+    handle, continuing = store.checkout(turn, model, model_key)
+    assert handle is not None
+    handle.conversation.responses.append("response")
+    store.checkin(turn, handle, handle.turns)
+    return handle, continuing
+
+
+def test_continues_on_next_round():
+    store = ConversationStore()
+    model = make_model()
+
+    first, continuing = take_turn(store, model, 0)
+    assert not continuing
+    second, continuing = take_turn(store, model, 1)
+    assert continuing
+    assert second is first
+    assert second.turns == 2
+
+
+def test_starts_over_when_rounds_or_models_differ():
+    store = ConversationStore()
+    model = make_model()
+    first, _ = take_turn(store, model, 0)
+
+    # a retried round, a skipped round, or another model starts over
+    for round_no, model_key in [(0, "m1"), (3, "m1"), (4, "m2")]:
+        handle, continuing = take_turn(store, model, round_no, model_key=model_key)
+        assert not continuing
+        assert handle is not first
+        first = handle
+
+
+def test_starts_over_after_max_turns():
+    store = ConversationStore(ConversationPolicy(max_turns=2))
+    model = make_model()
+    take_turn(store, model, 0)
+    _, continuing = take_turn(store, model, 1)
+    assert continuing
+    _, continuing = take_turn(store, model, 2)
+    assert not continuing
+
+
+def test_lost_turn_drops_conversation():
+    store = ConversationStore()
+    model = make_model()
+    turn = ConversationTurn(key="agent1.contest1", round_no=0)
+    handle, _ = store.checkout(turn, model, "m1")
+    assert handle is not None
+
+    # busy conversations aren't shared
+    assert store.checkout(turn, model, "m1") == (None, False)
+
+    # the response never made it into the conversation
+    store.checkin(turn, handle, handle.turns + 1)
+    assert "agent1.contest1" not in store.handles
+
+
+def test_least_recent_dropped():
+    store = ConversationStore(ConversationPolicy(max_conversations=2))
+    model = make_model()
+    for key in ["a", "b", "c"]:
+        take_turn(store, model, 0, key=key)
+    assert list(store.handles) == ["b", "c"]
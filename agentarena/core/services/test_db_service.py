@@ -0,0 +1,71 @@
+import pytest
+from sqlalchemy import inspect
+from sqlalchemy import text
+
+from agentarena.actors.models import Agent
+from agentarena.core.factories.db_factory import get_engine
+from agentarena.core.factories.logger_factory import LoggingService
+from agentarena.core.services.db_service import DbService
+from agentarena.core.services.uuid_service import UUIDService
+from agentarena.models.constants import PromptType
+from agentarena.models.job import GenerateJob
+
+
+@pytest.fixture
+def logging():
+    return LoggingService(capture=True)
+
+
+@pytest.fixture
+def uuid_service():
+    return UUIDService(word_list=[], prod=False)
+
+
+def make_db_service(path, uuid_service, logging):
+    return DbService(
+        str(path.parent),
+        dbfile=str(path),
+        get_engine=get_engine,
+        uuid_service=uuid_service,
+        logging=logging,
+    )
+
+
+def test_create_db_adds_missing_columns(tmp_path, uuid_service, logging):
+    path = tmp_path / "old.db"
+    old = make_db_service(path, uuid_service, logging).create_db()
+    with old.engine.begin() as conn:
+        # tables made before these columns were added
+        conn.execute(text("ALTER TABLE agent DROP COLUMN conversation"))
+        conn.execute(text("ALTER TABLE generatejob DROP COLUMN attempts"))
+        conn.execute(
+            text(
+                "INSERT INTO agent (id, model, name, participant_id, strategy_id)"
+                " VALUES ('a1', 'm', 'Agent', 'p1', 's1')"
+            )
+        )
+    old.engine.dispose()
+
+    db_service = make_db_service(path, uuid_service, logging).create_db()
+
+    inspector = inspect(db_service.engine)
+    assert "conversation" in [c["name"] for c in inspector.get_columns("agent")]
+    assert "attempts" in [c["name"] for c in inspector.get_columns("generatejob")]
+    with db_service.get_session() as session:
+        agent = session.get(Agent, "a1")
+        assert agent is not None
+        assert agent.conversation is False
+        session.add(
+            GenerateJob(
+                id="g1",
+                job_id="j1",
+                model="m",
+                prompt="p",
+                prompt_type=PromptType.ARENA_GENERATE_FEATURES,
+                attempts=[{"model": "m"}],
+            )
+        )
+        session.commit()
+        job = session.get(GenerateJob, "g1")
+        assert job is not None
+        assert job.attempts == [{"model": "m"}]
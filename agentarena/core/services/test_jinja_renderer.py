@@ -0,0 +1,61 @@
+from unittest.mock import MagicMock
+
+import pytest
+from jinja2 import ChoiceLoader
+from jinja2 import DictLoader
+
+from agentarena.core.exceptions import InvalidTemplateException
+from agentarena.core.services.jinja_renderer import JinjaRenderer
+
+
+def test_get_template_is_memoized():
+    renderer = JinjaRenderer()
+    renderer.set_loader(DictLoader({"greeting.md.j2": "Hello {{ name }}"}))
+    select = MagicMock(wraps=renderer.env.select_template)
+    renderer.env.select_template = select
+
+    assert renderer.render_template("greeting", {"name": "a"}) == "Hello a"
+    assert renderer.render_template("greeting", {"name": "b"}) == "Hello b"
+    assert select.call_count == 1
+
+
+def test_missing_template_raises():
+    renderer = JinjaRenderer()
+    renderer.set_loader(DictLoader({}))
+
+    with pytest.raises(InvalidTemplateException):
+        renderer.render_template("missing", {})
+    assert "missing" not in renderer.templates
+
+
+def test_set_loader_clears_resolved():
+    renderer = JinjaRenderer()
+    renderer.set_loader(DictLoader({"a.md.j2": "one"}))
+    assert renderer.render_template("a", {}) == "one"
+
+    renderer.set_loader(DictLoader({"a.md.j2": "two"}))
+    assert renderer.render_template("a", {}) == "two"
+
+
+def test_preload_resolves_all_templates():
+    renderer = JinjaRenderer(preload=True)
+    assert "arena" in renderer.templates
+
+    renderer.set_loader(
+        ChoiceLoader(
+            [
+                DictLoader({"a.md.j2": "one", "b.md": "two"}),
+                DictLoader({"a.md.j2": "shadowed", "c.txt": "three"}),
+            ]
+        )
+    )
+    assert set(renderer.templates) == {"a", "b", "c.txt"}
+    assert renderer.render_template("a", {}) == "one"
+
+
+def test_bytecode_cache_written(tmp_path):
+    cache_dir = "<projectroot>/jinja"
+    renderer = JinjaRenderer(projectroot=str(tmp_path), cache_dir=cache_dir)
+    renderer.render_template("arena", {"arena": {}})
+
+    assert list((tmp_path / "jinja").iterdir())
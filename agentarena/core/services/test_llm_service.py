@@ -1,19 +1,28 @@
 import asyncio
+import json
+import time
 from typing import Coroutine
+from unittest.mock import AsyncMock
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
 import llm  # Import llm at the top
 import pytest
 from sqlmodel import Session
+from sqlmodel import SQLModel
+from sqlmodel import create_engine
+from sqlmodel import select
 
 from agentarena.clients.message_broker import MessageBroker
+from agentarena.core.services.conversation_store import ConversationTurn
 from agentarena.core.services.db_service import DbService
 from agentarena.core.services.llm_service import LLMService
 from agentarena.core.services.uuid_service import UUIDService
 from agentarena.models.constants import JobState
 from agentarena.models.constants import PromptType
 from agentarena.models.job import GenerateJob
+from agentarena.models.llm import LlmModel
+from agentarena.models.llm import LlmModelStats
 
 
 @pytest.fixture
@@ -142,3 +151,385 @@ async def test_execute_job_failure_invalid_model(
         obj_id=job_id,
         detail="Generation job failed due to invalid model",
     )
+
+
+@pytest.mark.asyncio
+async def test_execute_job_failure_provider_error(
+    llm_service, mock_db_service, mock_message_broker
+):
+    mock_job = GenerateJob(
+        id="gen1",
+        job_id="job1",
+        model="some_model",
+        prompt="test_prompt",
+        prompt_type=PromptType.ANNOUNCER_DESCRIBE_ARENA,
+        state=JobState.IDLE,
+    )
+    mock_session = MagicMock(spec=Session)
+    mock_session.get.return_value = mock_job
+
+    with patch.object(
+        llm_service, "generate", side_effect=ConnectionError("connection reset")
+    ):
+        result_job = await llm_service.execute_job("gen1", mock_session)
+
+    assert result_job.state == JobState.FAIL
+    assert result_job.finished_at
+    assert [a["state"] for a in result_job.attempts] == [JobState.FAIL.value]
+    mock_message_broker.publish_model_change.assert_any_call(
+        channel=f"actor.llm.gen1.job1.{JobState.FAIL.value}",
+        obj_id="job1",
+        detail="Generation job failed: connection reset",
+    )
+
+
+@pytest.mark.asyncio
+async def test_execute_job_hedges_slow_generation(
+    mock_db_service, mock_message_broker, mock_uuid_service, mock_logging_service
+):
+    service = LLMService(
+        llm_map=[],
+        db_service=mock_db_service,
+        message_broker=mock_message_broker,
+        uuid_service=mock_uuid_service,
+        logging=mock_logging_service,
+        hedging={
+            "player_player_action": {
+                "delay": 0.05,
+                "min_delay": 0.05,
+                "backup_model": "backup",
+            }
+        },
+    )
+    mock_job = GenerateJob(
+        id="gen-hedge",
+        job_id="job-hedge",
+        model="slow",
+        prompt="test_prompt",
+        prompt_type=PromptType.PLAYER_PLAYER_ACTION,
+        state=JobState.IDLE,
+    )
+    mock_session = MagicMock(spec=Session)
+    mock_session.get.return_value = mock_job
+
+    def fake_generate(model, prompt, *args):
+        if model == "slow":
+            time.sleep(0.5)
+            return "slow answer"
+        return "backup answer"
+
+    with patch.object(service, "generate", side_effect=fake_generate):
+        result_job = await service.execute_job("gen-hedge", mock_session)
+
+    assert result_job.state == JobState.COMPLETE
+    assert result_job.generated == "backup answer"
+    assert [a["model"] for a in result_job.attempts] == ["slow", "backup"]
+    assert result_job.attempts[0]["state"] == "cancelled"
+    assert result_job.attempts[1]["hedge"] is True
+    assert result_job.attempts[1]["state"] == JobState.COMPLETE.value
+
+
+@pytest.mark.asyncio
+async def test_execute_job_no_hedge_when_fast(
+    mock_db_service, mock_message_broker, mock_uuid_service, mock_logging_service
+):
+    service = LLMService(
+        llm_map=[],
+        db_service=mock_db_service,
+        message_broker=mock_message_broker,
+        uuid_service=mock_uuid_service,
+        logging=mock_logging_service,
+        hedging={"player_player_action": {"delay": 5}},
+    )
+    mock_job = GenerateJob(
+        id="gen-fast",
+        job_id="job-fast",
+        model="TEST:quick",
+        prompt="test_prompt",
+        prompt_type=PromptType.PLAYER_PLAYER_ACTION,
+        state=JobState.IDLE,
+    )
+    mock_session = MagicMock(spec=Session)
+    mock_session.get.return_value = mock_job
+
+    result_job = await service.execute_job("gen-fast", mock_session)
+
+    assert result_job.generated == "quick"
+    assert len(result_job.attempts) == 1
+    assert service.latency.count("TEST:quick", "player_player_action") == 1
+
+
+@pytest.mark.asyncio
+async def test_execute_job_does_not_hedge_conversations(
+    mock_db_service, mock_message_broker, mock_uuid_service, mock_logging_service
+):
+    service = LLMService(
+        llm_map=[],
+        db_service=mock_db_service,
+        message_broker=mock_message_broker,
+        uuid_service=mock_uuid_service,
+        logging=mock_logging_service,
+        hedging={
+            "player_player_action": {
+                "delay": 0.01,
+                "min_delay": 0.01,
+                "backup_model": "backup",
+            }
+        },
+    )
+    mock_session = MagicMock(spec=Session)
+    mock_session.get.return_value = GenerateJob(
+        id="gen-conv",
+        job_id="job-conv",
+        model="slow",
+        prompt="prefix\nthis round",
+        prompt_type=PromptType.PLAYER_PLAYER_ACTION,
+        state=JobState.IDLE,
+    )
+
+    def fake_generate(model, prompt, on_chunk, scanner, options, conversation):
+        time.sleep(0.1)
+        conversation.responses.append(prompt)
+        return f"{model} answer"
+
+    model = MagicMock()
+    model.conversation.side_effect = lambda: MagicMock(responses=[])
+    with (
+        patch.object(llm, "get_model", return_value=model),
+        patch.object(service, "generate", side_effect=fake_generate),
+    ):
+        result_job = await service.execute_job(
+            "gen-conv",
+            mock_session,
+            prefix_length=len("prefix"),
+            conversation=ConversationTurn(key="a.c", round_no=0),
+        )
+
+    assert result_job.generated == "slow answer"
+    assert [a["model"] for a in result_job.attempts] == ["slow"]
+    assert service.conversations.handles["a.c"].turns == 1
+
+
+@pytest.mark.asyncio
+async def test_execute_job_saves_model_stats(
+    mock_db_service, mock_message_broker, mock_uuid_service, mock_logging_service
+):
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    mock_uuid_service.make_id.side_effect = ["stats-1", "stats-2"]
+    service = LLMService(
+        llm_map=[{"name": "quick", "key": "TEST:quick"}],
+        db_service=mock_db_service,
+        message_broker=mock_message_broker,
+        uuid_service=mock_uuid_service,
+        logging=mock_logging_service,
+    )
+    with Session(engine) as session:
+        session.add(LlmModel(id="m1", name="Quick", model_id="TEST:quick"))
+        session.add(
+            GenerateJob(
+                id="gen-stats",
+                job_id="job-stats",
+                model="quick",
+                prompt="test_prompt",
+                prompt_type=PromptType.PLAYER_PLAYER_ACTION,
+                state=JobState.IDLE,
+            )
+        )
+        session.commit()
+
+        await service.execute_job("gen-stats", session)
+        session.commit()
+
+        stats = session.exec(select(LlmModelStats)).all()
+        assert len(stats) == 1
+        assert stats[0].llm_model_id == "m1"
+        assert stats[0].eval_type == "player_player_action"
+        assert stats[0].run_id == "job-stats"
+        assert stats[0].success
+
+
+@pytest.mark.asyncio
+async def test_execute_job_streams_and_dispatches_early(
+    mock_db_service, mock_message_broker, mock_uuid_service, mock_logging_service
+):
+    chunks = ['{"action": ', '"move"}', " and a long explanation", " never read"]
+    read = []
+
+    def stream():
+        for chunk in chunks:
+            read.append(chunk)
+            yield chunk
+
+    fake_model = MagicMock()
+    fake_model.prompt.return_value = stream()
+    mock_message_broker.send_message = AsyncMock()
+    service = LLMService(
+        llm_map=[],
+        db_service=mock_db_service,
+        message_broker=mock_message_broker,
+        uuid_service=mock_uuid_service,
+        logging=mock_logging_service,
+        streaming={
+            "player_player_action": {
+                "early_dispatch": True,
+                "required_keys": ["action"],
+            }
+        },
+    )
+    mock_job = GenerateJob(
+        id="gen-stream",
+        job_id="job-stream",
+        model="streamer",
+        prompt="test_prompt",
+        prompt_type=PromptType.PLAYER_PLAYER_ACTION,
+        state=JobState.IDLE,
+    )
+    mock_session = MagicMock(spec=Session)
+    mock_session.get.return_value = mock_job
+
+    with patch("llm.get_model", return_value=fake_model):
+        result_job = await service.execute_job("gen-stream", mock_session)
+    await asyncio.sleep(0)
+
+    assert result_job.state == JobState.COMPLETE
+    assert result_job.generated == '{"action": "move"}'
+    assert read == chunks[:2]
+    channels = [c.args[0] for c in mock_message_broker.send_message.call_args_list]
+    assert channels == ["actor.llm.gen-stream.job-stream.chunk"] * 2
+
+
+@pytest.mark.asyncio
+async def test_execute_job_uses_schema_when_supported(
+    mock_db_service, mock_message_broker, mock_uuid_service, mock_logging_service
+):
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    fake_model = MagicMock()
+    fake_model.supports_schema = True
+    mock_uuid_service.make_id.return_value = "stats-1"
+    fake_model.prompt.return_value.text.return_value = json.dumps(
+        {"features": [{"name": "rock", "description": "a rock", "position": "1,1"}]}
+    )
+    service = LLMService(
+        llm_map=[],
+        db_service=mock_db_service,
+        message_broker=mock_message_broker,
+        uuid_service=mock_uuid_service,
+        logging=mock_logging_service,
+    )
+    with Session(engine) as session:
+        session.add(
+            LlmModel(id="m1", name="Schemer", model_id="schemer", supports_schema=True)
+        )
+        session.add(
+            GenerateJob(
+                id="gen-schema",
+                job_id="job-schema",
+                model="schemer",
+                prompt="test_prompt",
+                prompt_type=PromptType.ARENA_GENERATE_FEATURES,
+                state=JobState.IDLE,
+            )
+        )
+        session.commit()
+
+        with patch("llm.get_model", return_value=fake_model):
+            result_job = await service.execute_job("gen-schema", session)
+
+    _, kwargs = fake_model.prompt.call_args
+    assert kwargs["schema"]["required"] == ["features"]
+    assert json.loads(result_job.generated) == [
+        {"name": "rock", "description": "a rock", "position": "1,1"}
+    ]
+
+
+def test_output_options_without_support(llm_service):
+    session = MagicMock(spec=Session)
+    session.exec.return_value.first.return_value = None
+    assert (
+        llm_service.output_options("plain", PromptType.PLAYER_PLAYER_ACTION, session)
+        == {}
+    )
+    assert (
+        llm_service.output_options(
+            "plain", PromptType.ANNOUNCER_DESCRIBE_ARENA, session
+        )
+        == {}
+    )
+
+
+def test_cache_kwargs_splits_prefix(
+    mock_db_service, mock_message_broker, mock_uuid_service, mock_logging_service
+):
+    service = LLMService(
+        llm_map=[{"name": "cached", "key": "cached-model", "cache_prefix": True}],
+        db_service=mock_db_service,
+        message_broker=mock_message_broker,
+        uuid_service=mock_uuid_service,
+        logging=mock_logging_service,
+    )
+
+    class CachingOptions(llm.Options):
+        cache: bool = False
+
+    model = MagicMock()
+    model.Options = CachingOptions
+    prefix, suffix = "stable prefix", "this round"
+    prompt = f"{prefix}\n{suffix}"
+
+    assert service.cache_kwargs(model, "cached-model", prompt, len(prefix)) == (
+        suffix,
+        {"fragments": [prefix], "cache": True},
+    )
+    # not opted in, or no prefix
+    assert service.cache_kwargs(model, "other", prompt, len(prefix)) == (prompt, {})
+    assert service.cache_kwargs(model, "cached-model", prompt, 0) == (prompt, {})
+    # the plugin has no cache option
+    model.Options = llm.Options
+    assert service.cache_kwargs(model, "cached-model", prompt, len(prefix)) == (
+        prompt,
+        {},
+    )
+
+
+@pytest.mark.asyncio
+async def test_execute_job_continues_conversation(
+    llm_service, mock_db_service, mock_message_broker
+):
+    prefix, suffix = "stable prefix", "this round"
+    sent = []
+
+    def fake_generate(model, prompt, on_chunk, scanner, options, conversation):
+        sent.append((prompt, options.get("prefix_length")))
+        conversation.responses.append(prompt)
+        return "ok"
+
+    model = MagicMock()
+    model.conversation.side_effect = lambda: MagicMock(responses=[])
+    mock_session = MagicMock(spec=Session)
+    with (
+        patch.object(llm, "get_model", return_value=model),
+        patch.object(llm_service, "generate", side_effect=fake_generate),
+    ):
+        for round_no in [0, 1]:
+            mock_session.get.return_value = GenerateJob(
+                id=f"gen-{round_no}",
+                job_id=f"job-{round_no}",
+                model="m1",
+                prompt=f"{prefix}\n{suffix}",
+                prompt_type=PromptType.PLAYER_PLAYER_ACTION,
+                state=JobState.IDLE,
+            )
+            result_job = await llm_service.execute_job(
+                f"gen-{round_no}",
+                mock_session,
+                prefix_length=len(prefix),
+                conversation=ConversationTurn(key="a.c", round_no=round_no),
+            )
+            assert result_job.state == JobState.COMPLETE
+
+    # the whole prompt starts the conversation, then only the round is sent
+    assert sent == [(f"{prefix}\n{suffix}", len(prefix)), (suffix, None)]
+    assert result_job.attempts[0]["conversation"] is True
+    assert llm_service.conversations.handles["a.c"].round_no == 1
@@ -99,6 +99,8 @@ async def test_generate_features(
     view_service,
     message_broker,
     logger,
+    timeout_service,
+    feature_pool,
 ):
     announcer_id = contest_fixtures["announcer"]
     announcer_response = httpx.get(f"{ARENA_URL}/participant/{announcer_id}")
@@ -139,6 +141,8 @@ async def test_generate_features(
             view_service,
             session,
             log,
+            timeout_service=timeout_service,
+            feature_pool=feature_pool,
         )
 
         arena_agent = contest.get_role(RoleType.ARENA)[0]
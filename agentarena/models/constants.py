@@ -65,6 +65,16 @@ class JobResponseState(str, Enum):
     FAIL = "fail"
 
 
+class BreakerState(str, Enum):
+    """
+    State of a circuit breaker.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
 class PromptType(str, Enum):
     """
     Enum for prompt keys
@@ -91,3 +101,5 @@ class RoleType(str, Enum):
 
 DEFAULT_AGENT_MODEL = "openrouter/deepseek/deepseek-chat-v3-0324:free"
 # "openrouter/deepseek/deepseek-r1-0528:free"
+
+PRESENCE_CHANNEL = "sys.actor.presence"
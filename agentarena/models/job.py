@@ -2,8 +2,13 @@
 Provides models to manage aynchronous Jobs
 """
 
+from typing import Any
+from typing import Dict
+from typing import List
 from typing import Optional
 
+from sqlmodel import JSON
+from sqlmodel import Column
 from sqlmodel import Field
 from sqlmodel import SQLModel
 
@@ -33,6 +38,11 @@ class GenerateJobBase(SQLModel):
         default=0,
         description="When this job reached a final state ['complete', 'fail', 'waiting']",
     )
+    attempts: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        sa_column=Column(JSON),
+        description="Every generation attempt made for this job, for cost tracking",
+    )
 
 
 class GenerateJob(GenerateJobBase, DbBase, table=True):
@@ -48,6 +58,7 @@ class GenerateJob(GenerateJobBase, DbBase, table=True):
             state=self.state,
             started_at=self.started_at,
             finished_at=self.finished_at,
+            attempts=self.attempts or [],
         )
 
 
@@ -86,7 +86,7 @@ class LlmModelPriceUpdate(SQLModel, table=False):
 
 
 class LlmModelStatsBase(SQLModel):
-    llm_model_id: int = Field(
+    llm_model_id: str = Field(
         foreign_key="llmmodel.id", description="Foreign key to LlmModel"
     )
     eval_type: str = Field(index=True, description="Type of evaluation/scenario")
@@ -0,0 +1,351 @@
+"""
+Runtime policies, loaded from the `actor` and `arena` sections of the config file.
+"""
+
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Literal
+from typing import Optional
+
+from pydantic import BaseModel
+from pydantic import Field
+
+from agentarena.models.constants import PromptType
+
+
+class HedgePolicy(BaseModel):
+    """
+    Controls hedged generation for a prompt type.
+
+    If the primary generation hasn't completed by the observed latency percentile
+    for its model, a second request is issued and the first valid response wins.
+    """
+
+    percentile: float = Field(
+        default=95.0, description="Latency percentile to wait for before hedging"
+    )
+    delay: float = Field(
+        default=20.0,
+        description="Seconds to wait before hedging when there is not enough latency history",
+    )
+    min_delay: float = Field(
+        default=1.0, description="Never hedge sooner than this, in seconds"
+    )
+    min_samples: int = Field(
+        default=10, description="Samples needed before the percentile is trusted"
+    )
+    backup_model: Optional[str] = Field(
+        default=None,
+        description="Model for the hedged request, defaults to the job's model",
+    )
+
+
+def parse_policies(
+    raw: Optional[Dict[str, Any]], policy_class: type[BaseModel]
+) -> Dict[PromptType, Any]:
+    """
+    Parse a mapping of prompt type -> policy settings from config.
+
+    Unknown prompt types are ignored, and an empty or missing mapping gives no policies.
+    """
+    policies = {}
+    if not raw:
+        return policies
+    for key, settings in raw.items():
+        try:
+            prompt_type = PromptType(key)
+        except ValueError:
+            continue
+        policies[prompt_type] = policy_class.model_validate(settings or {})
+    return policies
+
+
+class TimeoutPolicy(BaseModel):
+    """
+    Controls how long the arena waits on a participant request.
+
+    Once there is enough latency history for the participant's model, the
+    timeout is the observed percentile times `multiplier`, clamped to
+    [floor, ceiling]. Until then `default` is used.
+    """
+
+    default: float = Field(
+        default=60.0,
+        description="Seconds to wait when there is not enough latency history",
+    )
+    floor: float = Field(default=5.0, description="Never time out sooner than this")
+    ceiling: float = Field(
+        default=180.0, description="Never wait longer than this, in seconds"
+    )
+    percentile: float = Field(
+        default=99.0, description="Latency percentile the timeout is based on"
+    )
+    multiplier: float = Field(
+        default=2.0, description="Headroom applied to the observed percentile"
+    )
+    min_samples: int = Field(
+        default=5, description="Samples needed before the percentile is trusted"
+    )
+
+
+class BreakerPolicy(BaseModel):
+    """
+    Controls the circuit breakers on models and participants in the actor.
+
+    A breaker opens after `failure_threshold` consecutive failed generations,
+    and lets a single trial request through once `reset_timeout` has passed.
+    """
+
+    failure_threshold: int = Field(
+        default=3, description="Consecutive failures before the breaker opens"
+    )
+    reset_timeout: float = Field(
+        default=60.0, description="Seconds an open breaker waits before a trial"
+    )
+    fallback: List[str] = Field(
+        default_factory=list,
+        description="Models to try, in order, while a model's breaker is open. Defaults to active models by score",
+    )
+    fallback_min_score: int = Field(
+        default=1, description="Minimum score for a model to be used as a fallback"
+    )
+
+
+class StreamPolicy(BaseModel):
+    """
+    Controls streamed generation for a prompt type.
+
+    Chunks are published for observers as they arrive, and with early dispatch
+    the generation ends as soon as a JSON object with `required_keys` closes.
+    """
+
+    publish_chunks: bool = Field(
+        default=True, description="Publish chunks on actor.llm.<id>.<job_id>.chunk"
+    )
+    early_dispatch: bool = Field(
+        default=False,
+        description="Stop reading once a complete JSON object has arrived",
+    )
+    required_keys: List[str] = Field(
+        default_factory=list,
+        description="Keys the object must have to be dispatched early",
+    )
+
+
+class CompactionPolicy(BaseModel):
+    """
+    Controls how contest history is compacted before prompts are rendered.
+
+    The last `keep_rounds` rounds are sent verbatim, fewer if they don't fit
+    in the history budget, and older rounds are replaced by their rolling
+    summary. The budget is `history_fraction` of the model's context length.
+    """
+
+    keep_rounds: int = Field(default=3, description="Recent rounds sent verbatim")
+    history_fraction: float = Field(
+        default=0.5, description="Share of the context window for contest history"
+    )
+    default_context_length: int = Field(
+        default=32000, description="Context length for models without pricing data"
+    )
+    max_history_tokens: Optional[int] = Field(
+        default=None, description="Upper bound on the history budget, in tokens"
+    )
+    chars_per_token: float = Field(
+        default=4.0, description="Used to estimate token counts from text"
+    )
+
+
+class ConversationPolicy(BaseModel):
+    """
+    Limits for agents in conversation mode, which keep an llm conversation per
+    contest and are sent only the new round after the first turn.
+    """
+
+    max_turns: int = Field(
+        default=20, description="Start a new conversation after this many turns"
+    )
+    max_conversations: int = Field(
+        default=1000, description="Conversations kept in memory, least recent dropped"
+    )
+
+
+class VisibilityPolicy(BaseModel):
+    """
+    Fog of war for player views. Players only see the features and other
+    players within `radius` grid cells of their own position, apart from what
+    is always visible.
+    """
+
+    radius: Optional[float] = Field(
+        default=None,
+        description="Default radius for arenas without one, unset for no fog",
+    )
+    global_features: List[str] = Field(
+        default=[], description="Names of features visible from anywhere"
+    )
+    global_players: bool = Field(
+        default=False, description="Whether other players are visible from anywhere"
+    )
+
+
+class EffectsPolicy(BaseModel):
+    """
+    Controls the local effects engine for an arena.
+
+    When enabled, the structured effects in judge results are applied to the
+    players without asking the judge, which is only prompted to apply effects
+    for the actions left unresolved.
+    """
+
+    enabled: bool = Field(default=False, description="Apply effects locally")
+    max_move: Optional[float] = Field(
+        default=None, description="Longest move applied locally, in grid cells"
+    )
+    max_score_change: Optional[int] = Field(
+        default=None, description="Largest score change applied locally"
+    )
+
+
+class NarrationPolicy(BaseModel):
+    """
+    Controls when the announcer's round narration is awaited.
+
+    With `background` set, rounds complete without waiting for the announcer,
+    and the narrative is saved when it returns. A round only starts once the
+    narration for every round more than `max_lag` rounds before it is done.
+    """
+
+    background: bool = Field(
+        default=False, description="Narrate rounds in the background"
+    )
+    max_lag: int = Field(
+        default=1, ge=0, description="Rounds narration may fall behind by"
+    )
+
+
+class DispatchPolicy(BaseModel):
+    """
+    Controls how the arena spreads requests across the participants of a role.
+
+    `least_outstanding` picks the participant with the fewest requests in
+    flight, `latency` weights that by each participant's median latency for
+    the prompt type. Participants are left out after `failure_threshold`
+    consecutive failures, until `reset_timeout` has passed.
+    """
+
+    strategy: Literal["least_outstanding", "latency"] = Field(
+        default="least_outstanding", description="How to pick a participant"
+    )
+    max_outstanding: int = Field(
+        default=2, ge=1, description="Concurrent judgements per judge in a round"
+    )
+    max_attempts: int = Field(
+        default=2, ge=1, description="Participants to try before giving up"
+    )
+    failure_threshold: int = Field(
+        default=2, description="Consecutive failures before a participant is left out"
+    )
+    reset_timeout: float = Field(
+        default=60.0, description="Seconds a participant is left out for"
+    )
+
+
+class HeartbeatPolicy(BaseModel):
+    """
+    Controls the presence heartbeats actor nodes publish for their participants.
+    """
+
+    enabled: bool = Field(default=True, description="Publish heartbeats")
+    interval: float = Field(default=10.0, gt=0, description="Seconds between beats")
+
+
+class PresencePolicy(BaseModel):
+    """
+    Controls how long the arena trusts a participant's last heartbeat.
+
+    A participant is present until `missed_beats` of its node's heartbeat
+    intervals have passed without another. Participants which pass a health
+    probe are trusted for `probe_ttl` seconds.
+    """
+
+    missed_beats: int = Field(
+        default=3, ge=1, description="Heartbeats missed before a participant is stale"
+    )
+    probe_ttl: float = Field(
+        default=30.0, description="Seconds a successful health probe is trusted"
+    )
+
+
+class FeaturePoolPolicy(BaseModel):
+    """
+    Controls the pool of pre-generated random feature sets for each arena.
+
+    Setup takes a set from the pool when there is one, and the pool is then
+    refilled to `depth` in the background.
+    """
+
+    enabled: bool = Field(default=False, description="Pre-generate feature sets")
+    depth: int = Field(default=2, ge=1, description="Feature sets kept per arena")
+
+
+class PrestagePolicy(BaseModel):
+    """
+    Controls prestaging, which sets contests up in the background as soon as
+    they are created, so the first advance goes straight into the first round.
+    """
+
+    default: bool = Field(
+        default=False, description="Prestage contests which don't say either way"
+    )
+    max_concurrent: int = Field(
+        default=2, ge=1, description="Contests set up in the background at once"
+    )
+
+
+class SchedulerPolicy(BaseModel):
+    """
+    Controls how the arena shares its capacity between running contests.
+
+    At most `max_contests` contests run a step at once, and at most
+    `max_per_arena` of them in the same arena. Waiting contests take turns:
+    `round_robin` treats them all alike, `weighted` gives contests in the
+    arenas listed in `weights` proportionally more turns. Prompt requests
+    across all contests are capped at `max_requests` in flight.
+    """
+
+    strategy: Literal["round_robin", "weighted"] = Field(
+        default="round_robin", description="How waiting contests take turns"
+    )
+    max_contests: int = Field(
+        default=4, ge=1, description="Contests running a step at once"
+    )
+    max_per_arena: int = Field(
+        default=2, ge=1, description="Contests running a step at once per arena"
+    )
+    max_requests: int = Field(
+        default=16, ge=1, description="Prompt requests in flight across contests"
+    )
+    weights: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Turn weights by arena name, for the weighted strategy",
+    )
+
+
+class TournamentPolicy(BaseModel):
+    """
+    Controls how the tournament runner plays its contests.
+
+    The arena does the work, so the runner is a single asyncio client: it
+    keeps up to `concurrency` contests running at once, polling the arena
+    every `poll_interval` seconds until they end.
+    """
+
+    concurrency: int = Field(default=4, ge=1, description="Contests running at once")
+    poll_interval: float = Field(
+        default=5.0, gt=0, description="Seconds between contest state checks"
+    )
+    timeout: float = Field(
+        default=1800.0, description="Seconds before a contest is given up on"
+    )
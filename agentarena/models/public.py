@@ -2,6 +2,8 @@
 Public Pydantic models - suitable for passing between apps, with no SQLModel stuff to accidentally cause tables to be created.
 """
 
+from typing import Any
+from typing import Dict
 from typing import List
 from typing import Optional
 
@@ -35,6 +37,9 @@ class ArenaPublic(BaseModel):
     max_random_features: int = Field(description="maximum random features", default=0)
     width: int = Field(description="Arena width", gt=0)
     rules: str = Field(description="Game rules")
+    visibility_radius: Optional[float] = Field(
+        default=None, description="How far players can see, in grid cells"
+    )
     winning_condition: str = Field(description="winning condition description")
 
 
@@ -45,6 +50,9 @@ class ContestPublic(BaseModel):
     end_time: int = Field(description="Timestamp")
     participants: List["ParticipantPublic"] = Field(default=[])
     rounds: List["ContestRoundPublic"] = Field()
+    summary: str = Field(
+        default="", description="Summary of earlier rounds left out of `rounds`"
+    )
     start_time: int = Field(description="Timestamp")
     state: ContestState = Field(
         default=ContestState.CREATED, description="Contest state"
@@ -61,6 +69,9 @@ class ContestRoundPublic(BaseModel):
     players: List["PlayerPublic"] = Field(default=[])
     round_no: int = Field(description="Round number", ge=0)
     state: ContestRoundState = Field(description="Round state")
+    summary: str = Field(
+        default="", description="Rolling summary of the contest through this round"
+    )
 
 
 class FeaturePublic(BaseModel):
@@ -81,6 +92,9 @@ class GenerateJobPublic(BaseModel):
     state: JobState = Field(description="Job state")
     started_at: int = Field(description="Timestamp")
     finished_at: Optional[int] = Field(default=None, description="Timestamp")
+    attempts: List[Dict[str, Any]] = Field(
+        default=[], description="Generation attempts, including hedged requests"
+    )
 
 
 class JobResponse(BaseModel):
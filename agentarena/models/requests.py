@@ -41,6 +41,18 @@ class HealthStatus(BaseModel):
     version: Optional[str] = Field(default="", description="service version")
 
 
+class Heartbeat(BaseModel):
+    """
+    Periodic announcement from an actor node of the participants it serves
+    """
+
+    node_id: str = Field(description="Actor node sending the heartbeat")
+    participants: List[str] = Field(
+        default_factory=list, description="Participant ids the node serves"
+    )
+    interval: float = Field(description="Seconds until the next heartbeat")
+
+
 class BaseParticipantRequest(BaseModel):
     """
     A request from the arena to a Participant
@@ -0,0 +1,96 @@
+"""
+Schemas for the JSON responses we expect from agents, used for structured output
+"""
+
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from pydantic import BaseModel
+from pydantic import Field
+
+from agentarena.models.constants import PromptType
+
+
+class PlayerActionResponse(BaseModel):
+    action: str = Field(description="The action the player takes this round")
+    target: Optional[str] = Field(
+        default="", description="Target position, as 'x,y', or name"
+    )
+    narration: str = Field(description="Narration to share with other players")
+    memories: str = Field(description="Private memories for the next round")
+
+
+class ActionEffects(BaseModel):
+    position: Optional[str] = Field(
+        default=None, description="Player's new position, 'x,y'"
+    )
+    score: int = Field(default=0, description="Change in score, may be negative")
+    health: Optional[str] = Field(default=None, description="Player's new health")
+    add_items: List[str] = Field(default=[], description="Items gained")
+    remove_items: List[str] = Field(default=[], description="Items lost")
+
+
+class JudgementResponse(BaseModel):
+    result: str = Field(description="Result of the action")
+    reason: str = Field(description="Reason for the result")
+    narration: str = Field(description="Narration of what happened")
+    memories: str = Field(description="Memories for the player")
+    effects: Optional[ActionEffects] = Field(
+        default=None,
+        description="Effects on the player, if they are only these simple changes",
+    )
+
+
+class PlayerUpdate(BaseModel):
+    id: str = Field(description="Player ID")
+    position: Optional[str] = Field(default=None, description="New position, 'x,y'")
+    health: Optional[str] = Field(default=None, description="New health")
+    score: Optional[int] = Field(default=None, description="New score")
+    inventory: Optional[List[str]] = Field(default=None, description="New inventory")
+
+
+class FeatureUpdate(BaseModel):
+    id: str = Field(description="Feature ID")
+    description: Optional[str] = Field(default=None, description="New description")
+    position: Optional[str] = Field(default=None, description="New position, 'x,y'")
+
+
+class ApplyEffectsResponse(BaseModel):
+    players: List[PlayerUpdate] = Field(description="Updated player states")
+    features: List[FeatureUpdate] = Field(description="Updated features")
+
+
+class GeneratedFeature(BaseModel):
+    name: str = Field(description="Feature name")
+    description: str = Field(description="One sentence description")
+    position: str = Field(description="Position, 'x,y'")
+    end_position: Optional[str] = Field(
+        default=None, description="End position for features spanning cells"
+    )
+
+
+class GeneratedFeaturesResponse(BaseModel):
+    features: List[GeneratedFeature] = Field(description="The generated features")
+
+
+RESPONSE_SCHEMAS: Dict[PromptType, type[BaseModel]] = {
+    PromptType.PLAYER_PLAYER_ACTION: PlayerActionResponse,
+    PromptType.JUDGE_PLAYER_ACTION_JUDGEMENT: JudgementResponse,
+    PromptType.JUDGE_APPLY_EFFECTS: ApplyEffectsResponse,
+    PromptType.ARENA_GENERATE_FEATURES: GeneratedFeaturesResponse,
+}
+
+# Schemas need an object at the root, but the arena expects a bare list for these
+RESPONSE_ROOT_KEYS: Dict[PromptType, str] = {
+    PromptType.ARENA_GENERATE_FEATURES: "features",
+}
+
+
+def get_response_schema(prompt_type: PromptType) -> Optional[Dict[str, Any]]:
+    """
+    Returns the JSON schema for a prompt type's response, if it has one.
+    """
+    schema = RESPONSE_SCHEMAS.get(prompt_type)
+    return schema.model_json_schema() if schema else None
@@ -0,0 +1 @@
+"""Agent Arena Tournaments."""
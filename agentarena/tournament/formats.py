@@ -0,0 +1,251 @@
+from abc import ABC
+from abc import abstractmethod
+from itertools import combinations
+from typing import Dict
+from typing import FrozenSet
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from agentarena.tournament.models import ContestResult
+from agentarena.tournament.models import Pairing
+from agentarena.tournament.models import Standing
+from agentarena.tournament.models import TournamentSpec
+
+Stage = Tuple[List[Pairing], List[str]]
+
+# groups tried when pairing a swiss stage, before settling for a greedy pairing
+MAX_PAIRING_STEPS = 10000
+
+
+def get_standings(
+    players: List[str], results: List[ContestResult], byes: List[List[str]]
+) -> List[Standing]:
+    """
+    Tally the results into standings, best first. Ties are broken by total
+    score, then by seed.
+    """
+    table: Dict[str, Standing] = {p: Standing(participant_id=p) for p in players}
+    for result in results:
+        entries = [table[p] for p in result.pairing.player_ids if p in table]
+        if not result.finished:
+            for entry in entries:
+                entry.failed += 1
+            continue
+        for entry in entries:
+            entry.played += 1
+            entry.score += result.scores.get(entry.participant_id, 0)
+            if result.winner_id == entry.participant_id:
+                entry.wins += 1
+                entry.points += 1.0
+            elif result.winner_id in result.pairing.player_ids:
+                entry.losses += 1
+            else:
+                entry.draws += 1
+                entry.points += 0.5
+    for stage_byes in byes:
+        for player in stage_byes:
+            table[player].byes += 1
+            table[player].points += 1.0
+    seeds = {p: n for n, p in enumerate(players)}
+    return sorted(
+        table.values(),
+        key=lambda s: (-s.points, -s.score, seeds[s.participant_id]),
+    )
+
+
+def contest_winner(result: ContestResult) -> str:
+    """
+    The player going through from a contest, the higher seed when there was
+    no winner.
+    """
+    if result.finished and result.winner_id in result.pairing.player_ids:
+        return result.winner_id  # type: ignore
+    return result.pairing.player_ids[0]
+
+
+class TournamentFormat(ABC):
+    """
+    Generates the contests of a tournament, a stage at a time, since later
+    stages of swiss and bracket tournaments depend on earlier results.
+    """
+
+    def __init__(self, spec: TournamentSpec):
+        self.spec = spec
+
+    def arena_for(self, stage: int) -> str:
+        return self.spec.arenas[stage % len(self.spec.arenas)]
+
+    @abstractmethod
+    def next_stage(
+        self, stage: int, results: List[ContestResult], byes: List[List[str]]
+    ) -> Optional[Stage]:
+        """
+        The pairings for `stage` and the players sitting it out, or None when
+        the tournament is over.
+        """
+
+
+class RoundRobin(TournamentFormat):
+    """
+    Every group of players meets once in every arena, all in one stage.
+    """
+
+    def next_stage(
+        self, stage: int, results: List[ContestResult], byes: List[List[str]]
+    ) -> Optional[Stage]:
+        if stage > 0:
+            return None
+        pairings = [
+            Pairing(stage=0, arena_id=arena_id, player_ids=list(group))
+            for arena_id in self.spec.arenas
+            for group in combinations(self.spec.players, self.spec.players_per_contest)
+        ]
+        return pairings, []
+
+
+class Swiss(TournamentFormat):
+    """
+    Each stage pairs players with the same record, avoiding rematches where
+    possible. Players left over sit out with a bye, lowest ranked first, at
+    most once each while others haven't had one.
+    """
+
+    def group(
+        self, ranked: List[str], size: int, met: Set[FrozenSet[str]]
+    ) -> Optional[List[List[str]]]:
+        """
+        Groups of players who haven't met, each with the nearest ranked
+        players possible, or None if there is no way to avoid a rematch. The
+        search is exponential, so it also gives up with None after
+        MAX_PAIRING_STEPS groups.
+        """
+        self.steps_left = MAX_PAIRING_STEPS
+        return self.search(ranked, size, met)
+
+    def search(
+        self, ranked: List[str], size: int, met: Set[FrozenSet[str]]
+    ) -> Optional[List[List[str]]]:
+        if not ranked:
+            return []
+        first, rest = ranked[0], ranked[1:]
+        for others in combinations(rest, size - 1):
+            self.steps_left -= 1
+            if self.steps_left < 0:
+                return None
+            group = [first, *others]
+            if any(frozenset(pair) in met for pair in combinations(group, 2)):
+                continue
+            groups = self.search([p for p in rest if p not in others], size, met)
+            if groups is not None:
+                return [group] + groups
+        return None
+
+    def greedy_group(
+        self, ranked: List[str], size: int, met: Set[FrozenSet[str]]
+    ) -> List[List[str]]:
+        """
+        Groups in rank order, each filled with the nearest ranked players who
+        haven't met its members, then with the nearest players left.
+        """
+        left = list(ranked)
+        groups = []
+        while left:
+            group = [left.pop(0)]
+            for player in list(left):
+                if len(group) == size:
+                    break
+                if not any(frozenset((player, p)) in met for p in group):
+                    group.append(player)
+                    left.remove(player)
+            while len(group) < size and left:
+                group.append(left.pop(0))
+            groups.append(group)
+        return groups
+
+    def next_stage(
+        self, stage: int, results: List[ContestResult], byes: List[List[str]]
+    ) -> Optional[Stage]:
+        if stage >= self.spec.rounds:
+            return None
+        size = self.spec.players_per_contest
+        ranked = [
+            s.participant_id for s in get_standings(self.spec.players, results, byes)
+        ]
+        had_bye = {p for stage_byes in byes for p in stage_byes}
+        sitting_out: List[str] = []
+        for player in reversed(ranked):
+            if len(sitting_out) == len(ranked) % size:
+                break
+            if player not in had_bye:
+                sitting_out.append(player)
+        # everyone has had a bye, so start over from the bottom
+        for player in reversed(ranked):
+            if len(sitting_out) == len(ranked) % size:
+                break
+            if player not in sitting_out:
+                sitting_out.append(player)
+
+        met = {
+            frozenset((a, b))
+            for r in results
+            for a, b in combinations(r.pairing.player_ids, 2)
+        }
+        playing = [p for p in ranked if p not in sitting_out]
+        groups = self.group(playing, size, met)
+        if groups is None:
+            groups = self.greedy_group(playing, size, met)
+        pairings = [
+            Pairing(stage=stage, arena_id=self.arena_for(stage), player_ids=group)
+            for group in groups
+        ]
+        return pairings, sitting_out
+
+
+class Bracket(TournamentFormat):
+    """
+    Single elimination: contest winners go through to the next stage until
+    one player is left. The top seeds get the byes, and with two players per
+    contest the top seed meets the bottom one.
+    """
+
+    def alive(
+        self, stage: int, results: List[ContestResult], byes: List[List[str]]
+    ) -> List[str]:
+        if stage == 0:
+            return list(self.spec.players)
+        seeds = {p: n for n, p in enumerate(self.spec.players)}
+        through = [contest_winner(r) for r in results if r.pairing.stage == stage - 1]
+        return sorted(through + byes[stage - 1], key=lambda p: seeds[p])
+
+    def next_stage(
+        self, stage: int, results: List[ContestResult], byes: List[List[str]]
+    ) -> Optional[Stage]:
+        alive = self.alive(stage, results, byes)
+        if len(alive) <= 1:
+            return None
+        size = min(self.spec.players_per_contest, len(alive))
+        sitting_out = alive[: len(alive) % size]
+        playing = alive[len(sitting_out) :]
+        if size == 2:
+            half = len(playing) // 2
+            groups = [[playing[n], playing[-1 - n]] for n in range(half)]
+        else:
+            groups = [playing[n : n + size] for n in range(0, len(playing), size)]
+        pairings = [
+            Pairing(stage=stage, arena_id=self.arena_for(stage), player_ids=group)
+            for group in groups
+        ]
+        return pairings, sitting_out
+
+
+FORMATS = {
+    "round_robin": RoundRobin,
+    "swiss": Swiss,
+    "bracket": Bracket,
+}
+
+
+def make_format(spec: TournamentSpec) -> TournamentFormat:
+    return FORMATS[spec.format](spec)
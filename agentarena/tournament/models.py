@@ -0,0 +1,97 @@
+from typing import Dict
+from typing import List
+from typing import Literal
+from typing import Optional
+
+from pydantic import BaseModel
+from pydantic import Field
+
+from agentarena.models.constants import ContestState
+
+
+class TournamentSpec(BaseModel):
+    """
+    What to play: the players, the arenas, and how to pair them.
+
+    Every contest gets the `staff` participants, the judge, announcer and
+    arena agents, as well as its players.
+    """
+
+    name: str = Field(default="tournament", description="Tournament name")
+    format: Literal["round_robin", "swiss", "bracket"] = Field(
+        default="round_robin", description="How players are paired"
+    )
+    arenas: List[str] = Field(
+        description="Arena IDs. Round robin plays every group in each arena, other formats rotate through them by stage"
+    )
+    players: List[str] = Field(description="Player participant IDs, in seed order")
+    staff: List[str] = Field(
+        description="Judge, announcer and arena participant IDs for every contest"
+    )
+    players_per_contest: int = Field(default=2, ge=1, description="Players per contest")
+    rounds: int = Field(default=3, ge=1, description="Stages to play, for swiss")
+    player_positions: List[str] = Field(
+        description="Starting position for each seat in a contest, as 'x,y'"
+    )
+    player_inventories: List[List[str]] = Field(
+        default_factory=list, description="Starting inventory for each seat"
+    )
+
+
+class Pairing(BaseModel):
+    """
+    One contest to play.
+    """
+
+    stage: int = Field(description="Stage of the tournament, from 0")
+    arena_id: str = Field(description="Arena ID")
+    player_ids: List[str] = Field(description="Player participant IDs")
+
+
+class ContestResult(BaseModel):
+    """
+    How a contest ended.
+    """
+
+    pairing: Pairing = Field(description="The contest's pairing")
+    contest_id: Optional[str] = Field(default=None, description="Contest ID")
+    state: ContestState = Field(description="Final contest state")
+    winner_id: Optional[str] = Field(default=None, description="Winning player ID")
+    scores: Dict[str, int] = Field(
+        default_factory=dict, description="Final score by player ID"
+    )
+    error: Optional[str] = Field(default=None, description="Why the contest failed")
+
+    @property
+    def finished(self) -> bool:
+        return self.state == ContestState.COMPLETE
+
+
+class Standing(BaseModel):
+    """
+    A player's record so far. Wins and byes are worth a point, draws half.
+    """
+
+    participant_id: str = Field(description="Player participant ID")
+    played: int = Field(default=0, description="Contests finished")
+    wins: int = Field(default=0, description="Contests won")
+    draws: int = Field(default=0, description="Contests finished without a winner")
+    losses: int = Field(default=0, description="Contests lost")
+    byes: int = Field(default=0, description="Stages sat out")
+    failed: int = Field(default=0, description="Contests which failed to finish")
+    points: float = Field(default=0.0, description="Points for pairing and ranking")
+    score: int = Field(default=0, description="Total final game score")
+
+
+class TournamentReport(BaseModel):
+    """
+    Every contest played, and the final standings.
+    """
+
+    name: str = Field(description="Tournament name")
+    format: str = Field(description="How players were paired")
+    results: List[ContestResult] = Field(default_factory=list)
+    byes: List[List[str]] = Field(
+        default_factory=list, description="Players sitting out, by stage"
+    )
+    standings: List[Standing] = Field(default_factory=list)
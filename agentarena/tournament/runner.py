@@ -0,0 +1,175 @@
+import asyncio
+import json
+import time
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+
+import httpx
+
+from agentarena.controlpanel.clients import ArenaClient
+from agentarena.models.constants import ContestState
+from agentarena.models.policies import TournamentPolicy
+from agentarena.tournament.formats import get_standings
+from agentarena.tournament.formats import make_format
+from agentarena.tournament.models import ContestResult
+from agentarena.tournament.models import Pairing
+from agentarena.tournament.models import TournamentReport
+from agentarena.tournament.models import TournamentSpec
+
+FINAL_STATES = [ContestState.COMPLETE, ContestState.FAIL]
+
+
+def check_spec(spec: TournamentSpec):
+    if len(spec.players) < spec.players_per_contest:
+        raise ValueError(
+            f"Need at least {spec.players_per_contest} players for a contest"
+        )
+    if len(spec.player_positions) < spec.players_per_contest:
+        raise ValueError("Need a starting position for each player in a contest")
+    if not spec.arenas:
+        raise ValueError("Need at least one arena")
+    if spec.format != "round_robin" and spec.players_per_contest < 2:
+        raise ValueError(f"A {spec.format} needs at least 2 players per contest")
+
+
+def contest_request(spec: TournamentSpec, pairing: Pairing) -> Dict[str, Any]:
+    """
+    The ContestCreate request for a pairing, which runs to the end once
+    advanced.
+    """
+    seats = len(pairing.player_ids)
+    return {
+        "arena_id": pairing.arena_id,
+        "participant_ids": spec.staff + pairing.player_ids,
+        "player_positions": json.dumps(spec.player_positions[:seats]),
+        "player_inventories": json.dumps(spec.player_inventories[:seats]),
+        "auto_advance": True,
+    }
+
+
+def read_result(pairing: Pairing, contest: Dict[str, Any]) -> ContestResult:
+    rounds = contest.get("rounds") or []
+    players = rounds[-1].get("players", []) if rounds else []
+    return ContestResult(
+        pairing=pairing,
+        contest_id=contest["id"],
+        state=contest["state"],
+        winner_id=contest.get("winner_id"),
+        scores={p["id"]: p.get("score", 0) for p in players},
+    )
+
+
+async def play_contest(
+    client: ArenaClient,
+    spec: TournamentSpec,
+    pairing: Pairing,
+    policy: TournamentPolicy,
+    clock: Callable[[], float] = time.monotonic,
+) -> ContestResult:
+    """
+    Create a contest for the pairing, start it, and wait for it to end.
+    """
+    contest_id = None
+    try:
+        r = await client.post("/api/contest/", contest_request(spec, pairing))
+        contest_id = r.json()["id"]
+        await client.post(f"/api/contest/{contest_id}/advance", {})
+        deadline = clock() + policy.timeout
+        while True:
+            r = await client.get(f"/api/contest/{contest_id}")
+            contest = r.json()
+            if ContestState(contest["state"]) in FINAL_STATES:
+                return read_result(pairing, contest)
+            if clock() > deadline:
+                return ContestResult(
+                    pairing=pairing,
+                    contest_id=contest_id,
+                    state=ContestState.FAIL,
+                    error=f"timed out in {contest['state']}",
+                )
+            await asyncio.sleep(policy.poll_interval)
+    except httpx.HTTPError as e:
+        return ContestResult(
+            pairing=pairing,
+            contest_id=contest_id,
+            state=ContestState.FAIL,
+            error=str(e),
+        )
+
+
+async def play_contests(
+    arena_config: Dict[str, Any],
+    spec: TournamentSpec,
+    pairings: List[Pairing],
+    policy: TournamentPolicy,
+) -> List[ContestResult]:
+    client = ArenaClient(arena_config)
+    slots = asyncio.Semaphore(policy.concurrency)
+
+    async def play(pairing: Pairing) -> ContestResult:
+        async with slots:
+            return await play_contest(client, spec, pairing, policy)
+
+    return await asyncio.gather(*[play(p) for p in pairings])
+
+
+class TournamentRunner:
+    """
+    Plays a tournament against a running arena, stage by stage.
+
+    This is a plain asyncio client: the arena runs the contests, and the
+    runner only creates them through the contest API, set to auto-advance,
+    then polls them, up to `concurrency` at once. Winners and final scores
+    are read back from the contests once they end.
+    """
+
+    def __init__(
+        self,
+        arena_config: Dict[str, Any],
+        tournament: Optional[Dict[str, Any]] = None,
+        on_stage: Optional[Callable[[int, List[ContestResult]], None]] = None,
+    ):
+        self.arena_config = arena_config
+        self.policy = TournamentPolicy.model_validate(tournament or {})
+        self.on_stage = on_stage
+
+    async def run(self, spec: TournamentSpec) -> TournamentReport:
+        check_spec(spec)
+        tournament_format = make_format(spec)
+        report = TournamentReport(name=spec.name, format=spec.format)
+        stage = 0
+        while True:
+            next_stage = tournament_format.next_stage(
+                stage, report.results, report.byes
+            )
+            if next_stage is None:
+                break
+            pairings, byes = next_stage
+            report.byes.append(byes)
+            results = await play_contests(
+                self.arena_config, spec, pairings, self.policy
+            )
+            report.results.extend(results)
+            if self.on_stage is not None:
+                self.on_stage(stage, results)
+            stage += 1
+        report.standings = get_standings(spec.players, report.results, report.byes)
+        return report
+
+
+def format_standings(report: TournamentReport) -> str:
+    """
+    The standings as a plain text table.
+    """
+    lines = [
+        f"{report.name} ({report.format}): {len(report.results)} contests",
+        f"{'#':>3}  {'player':<30} {'pts':>5} {'W':>3} {'D':>3} {'L':>3} {'bye':>3} {'fail':>4} {'score':>6}",
+    ]
+    for n, s in enumerate(report.standings, start=1):
+        lines.append(
+            f"{n:>3}  {s.participant_id:<30} {s.points:>5.1f} {s.wins:>3} {s.draws:>3} {s.losses:>3} {s.byes:>3} {s.failed:>4} {s.score:>6}"
+        )
+    return "\n".join(lines)
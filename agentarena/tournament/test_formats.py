@@ -0,0 +1,109 @@
+from typing import List
+
+from agentarena.models.constants import ContestState
+from agentarena.tournament.formats import get_standings
+from agentarena.tournament.formats import make_format
+from agentarena.tournament.models import ContestResult
+from agentarena.tournament.models import Pairing
+from agentarena.tournament.models import TournamentSpec
+
+
+def make_spec(format: str, players: int, **kwargs) -> TournamentSpec:
+    return TournamentSpec(
+        format=format,
+        arenas=kwargs.pop("arenas", ["a1"]),
+        players=[f"p{n}" for n in range(players)],
+        staff=["judge", "announcer", "arena"],
+        player_positions=["1,1", "9,9", "1,9"],
+        **kwargs,
+    )
+
+
+def win(pairing: Pairing, winner: str = "") -> ContestResult:
+    """
+    The first player wins, unless told otherwise.
+    """
+    return ContestResult(
+        pairing=pairing,
+        contest_id=f"c-{'-'.join(pairing.player_ids)}",
+        state=ContestState.COMPLETE,
+        winner_id=winner or pairing.player_ids[0],
+        scores={p: 10 for p in pairing.player_ids},
+    )
+
+
+def play_out(spec: TournamentSpec, pick=win):
+    tournament_format = make_format(spec)
+    results: List[ContestResult] = []
+    byes: List[List[str]] = []
+    stages = []
+    while True:
+        stage = tournament_format.next_stage(len(stages), results, byes)
+        if stage is None:
+            return stages, results, byes
+        pairings, sitting_out = stage
+        stages.append(pairings)
+        byes.append(sitting_out)
+        results.extend(pick(p) for p in pairings)
+
+
+def test_round_robin_plays_every_pair_in_every_arena():
+    spec = make_spec("round_robin", 4, arenas=["a1", "a2"])
+    stages, results, byes = play_out(spec)
+
+    assert len(stages) == 1
+    assert len(results) == 12
+    assert {p.arena_id for p in stages[0]} == {"a1", "a2"}
+    standings = get_standings(spec.players, results, byes)
+    assert [s.participant_id for s in standings] == ["p0", "p1", "p2", "p3"]
+    assert standings[0].wins == 6
+    assert standings[-1].losses == 6
+
+
+def test_swiss_avoids_rematches_and_rotates_byes():
+    spec = make_spec("swiss", 5, rounds=3, arenas=["a1", "a2"])
+    stages, results, byes = play_out(spec)
+
+    assert len(stages) == 3
+    assert [p.arena_id for p in stages[1]] == ["a2", "a2"]
+    pairs = [frozenset(r.pairing.player_ids) for r in results]
+    assert len(pairs) == len(set(pairs))
+    assert all(len(b) == 1 for b in byes)
+    assert len({b[0] for b in byes}) == 3
+
+
+def test_swiss_pairing_search_is_capped():
+    spec = make_spec("swiss", 22)
+    swiss = make_format(spec)
+    halves = [spec.players[:11], spec.players[11:]]
+    # everyone has met the other half, and neither half can pair up alone
+    met = {frozenset((a, b)) for a in halves[0] for b in halves[1]}
+
+    assert swiss.group(spec.players, 2, met) is None
+    groups = swiss.greedy_group(spec.players, 2, met)
+    assert sorted(p for g in groups for p in g) == sorted(spec.players)
+    assert sum(frozenset(g) in met for g in groups) == 1
+
+
+def test_bracket_plays_down_to_one():
+    spec = make_spec("bracket", 5)
+    # the lower seed wins every time
+    stages, results, byes = play_out(
+        spec, pick=lambda p: win(p, winner=p.player_ids[-1])
+    )
+
+    assert [len(s) for s in stages] == [2, 1, 1]
+    assert byes[0] == ["p0"]
+    assert stages[0][0].player_ids == ["p1", "p4"]
+    assert results[-1].winner_id == "p4"
+
+
+def test_failed_contests_count_as_failed_not_played():
+    spec = make_spec("round_robin", 2)
+    pairing = Pairing(stage=0, arena_id="a1", player_ids=["p0", "p1"])
+    failed = ContestResult(pairing=pairing, state=ContestState.FAIL, error="boom")
+    draw = ContestResult(pairing=pairing, state=ContestState.COMPLETE)
+
+    standings = get_standings(spec.players, [failed, draw], [])
+    assert all(s.played == 1 and s.failed == 1 for s in standings)
+    assert all(s.draws == 1 and s.points == 0.5 for s in standings)
@@ -0,0 +1,113 @@
+import json
+
+import httpx
+import pytest
+
+from agentarena.models.constants import ContestState
+from agentarena.tournament.models import Pairing
+from agentarena.tournament.models import TournamentSpec
+from agentarena.tournament.runner import TournamentRunner
+from agentarena.tournament.runner import format_standings
+
+ARENA = {"url": "http://arena.test"}
+FAST = {"concurrency": 2, "poll_interval": 0.01, "timeout": 5}
+
+
+class FakeArena:
+    """
+    Just enough of the contest API: contests finish after a couple of polls,
+    and the player with the lowest id wins.
+    """
+
+    def __init__(self):
+        self.contests = {}
+        self.polls = {}
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if request.method == "POST" and path == "/api/contest/":
+            body = json.loads(request.content)
+            contest_id = f"c{len(self.contests)}"
+            self.contests[contest_id] = body
+            self.polls[contest_id] = 0
+            return httpx.Response(200, json={"id": contest_id})
+        contest_id = path.split("/")[3]
+        if path.endswith("/advance"):
+            return httpx.Response(200, json={"id": contest_id})
+        body = self.contests[contest_id]
+        players = [p for p in body["participant_ids"] if p.startswith("p")]
+        self.polls[contest_id] += 1
+        done = self.polls[contest_id] > 2
+        return httpx.Response(
+            200,
+            json={
+                "id": contest_id,
+                "state": "complete" if done else "in_round",
+                "winner_id": min(players) if done else None,
+                "rounds": [
+                    {"players": [{"id": p, "score": 5} for p in players]},
+                ],
+            },
+        )
+
+
+def make_spec(format: str, players: int) -> TournamentSpec:
+    return TournamentSpec(
+        name="test",
+        format=format,
+        arenas=["a1"],
+        players=[f"p{n}" for n in range(players)],
+        staff=["judge", "announcer", "arena"],
+        player_positions=["1,1", "9,9"],
+    )
+
+
+@pytest.mark.asyncio
+async def test_round_robin_runs_every_contest(httpx_mock):
+    arena = FakeArena()
+    httpx_mock.add_callback(arena, is_reusable=True)
+    stages = []
+    runner = TournamentRunner(
+        ARENA,
+        FAST,
+        on_stage=lambda stage, results: stages.append(len(results)),
+    )
+
+    report = await runner.run(make_spec("round_robin", 4))
+
+    assert stages == [6]
+    assert len(arena.contests) == 6
+    first = next(iter(arena.contests.values()))
+    assert first["auto_advance"] is True
+    assert first["participant_ids"][:3] == ["judge", "announcer", "arena"]
+    assert first["player_positions"] == '["1,1", "9,9"]'
+    assert [s.participant_id for s in report.standings] == ["p0", "p1", "p2", "p3"]
+    assert report.standings[0].wins == 3
+    assert report.standings[0].score == 15
+    assert "p0" in format_standings(report)
+
+
+@pytest.mark.asyncio
+async def test_bracket_runs_stage_by_stage(httpx_mock):
+    httpx_mock.add_callback(FakeArena(), is_reusable=True)
+    runner = TournamentRunner(ARENA, FAST)
+
+    report = await runner.run(make_spec("bracket", 4))
+
+    assert [r.pairing.stage for r in report.results] == [0, 0, 1]
+    assert report.results[-1].pairing == Pairing(
+        stage=1, arena_id="a1", player_ids=["p0", "p1"]
+    )
+    assert report.standings[0].participant_id == "p0"
+
+
+@pytest.mark.asyncio
+async def test_api_errors_fail_the_contest(httpx_mock):
+    httpx_mock.add_response(status_code=422, is_reusable=True)
+    runner = TournamentRunner(ARENA, FAST)
+
+    report = await runner.run(make_spec("round_robin", 2))
+
+    assert report.results[0].state == ContestState.FAIL
+    assert report.results[0].contest_id is None
+    assert report.standings[0].failed == 1
@@ -0,0 +1,112 @@
+"""
+Compaction of contest history for prompts.
+
+The arena keeps a rolling summary on each ContestRound, covering the contest
+up to and including that round. Before rendering, the actor keeps the last
+few rounds verbatim and replaces the older ones with the summary of the last
+round left out, so prompt size stops growing with the length of the contest.
+Player views drop the stored summaries, which cover every player, so for
+players the summary is built here from the masked rounds.
+"""
+
+from typing import List
+from typing import Optional
+
+from agentarena.models.public import ContestPublic
+from agentarena.models.public import ContestRoundPublic
+
+CHARS_PER_TOKEN = 4
+MAX_SUMMARY_CHARS = 4000
+MAX_NARRATIVE_CHARS = 400
+
+
+def estimate_tokens(text: str, chars_per_token: float = CHARS_PER_TOKEN) -> int:
+    """
+    A rough token count, good enough for budgeting.
+    """
+    return int(len(text) / chars_per_token) + 1
+
+
+def clip(text: str, max_chars: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= max_chars else text[: max_chars - 3] + "..."
+
+
+def summarize_round(round: ContestRoundPublic, narrative: Optional[str] = None) -> str:
+    """
+    One paragraph for a round: its narrative and what each player did.
+    """
+    lines = [
+        f"Round {round.round_no}: {clip(narrative or round.narrative, MAX_NARRATIVE_CHARS)}"
+    ]
+    for player in round.players:
+        line = f"- {player.name} at {player.position}, score {player.score}"
+        if player.action:
+            line += f", {clip(player.action.action, 100)}"
+        if player.result:
+            line += f": {clip(player.result.result, 100)}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def rolling_summary(
+    previous: str,
+    round: ContestRoundPublic,
+    narrative: Optional[str] = None,
+    max_chars: int = MAX_SUMMARY_CHARS,
+) -> str:
+    """
+    The previous summary with this round added, dropping the oldest text
+    once it is longer than `max_chars`.
+    """
+    summary = "\n".join(s for s in [previous, summarize_round(round, narrative)] if s)
+    if len(summary) > max_chars:
+        summary = "..." + summary[-(max_chars - 3) :]
+    return summary
+
+
+def summary_through(rounds: List[ContestRoundPublic]) -> str:
+    """
+    The summary covering `rounds`, from the last round's stored summary, or
+    built here for rounds which don't have one yet.
+    """
+    if not rounds:
+        return ""
+    if rounds[-1].summary:
+        return rounds[-1].summary
+    summary = ""
+    for round in rounds:
+        summary = round.summary or rolling_summary(summary, round)
+    return summary
+
+
+def compact_contest(
+    contest: ContestPublic,
+    keep_rounds: int,
+    budget_tokens: int,
+    chars_per_token: float = CHARS_PER_TOKEN,
+) -> ContestPublic:
+    """
+    Keep at most `keep_rounds` recent rounds, fewer if they don't fit in
+    `budget_tokens`, and summarize the rest into `contest.summary`. The
+    latest round is always kept. Returns the contest itself if nothing
+    needs to change.
+    """
+    rounds = contest.rounds
+    sizes = [
+        estimate_tokens(r.model_dump_json(), chars_per_token)
+        for r in rounds[-keep_rounds:]
+    ]
+    if len(rounds) <= keep_rounds and sum(sizes) <= budget_tokens:
+        return contest
+
+    keep = max(1, min(keep_rounds, len(rounds)))
+    while keep > 1 and sum(sizes[-keep:]) > budget_tokens:
+        keep -= 1
+    kept = rounds[-keep:]
+    summary = summary_through(rounds[:-keep])
+    summary_budget = max(0, budget_tokens - sum(sizes[-keep:]))
+    max_chars = int(summary_budget * chars_per_token)
+    if len(summary) > max_chars:
+        summary = "..." + summary[-max_chars:] if max_chars else ""
+    return contest.model_copy(update={"rounds": kept, "summary": summary})
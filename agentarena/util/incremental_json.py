@@ -0,0 +1,67 @@
+import json
+from typing import Iterable
+from typing import Optional
+
+
+class JsonObjectScanner:
+    """
+    Finds the first complete top-level JSON object in streamed text.
+
+    Text outside objects (prose, code fences) is skipped. An object is only
+    accepted if it parses and has all of `required_keys`, otherwise scanning
+    continues with the next one.
+    """
+
+    def __init__(self, required_keys: Optional[Iterable[str]] = None):
+        self.required_keys = list(required_keys or [])
+        self.current: list[str] = []
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.obj: Optional[dict] = None
+
+    @property
+    def complete(self) -> bool:
+        return self.obj is not None
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Feed the next chunk of text, returning True once an object is complete.
+        """
+        if self.complete:
+            return True
+        for ch in chunk:
+            if self.depth == 0:
+                if ch == "{":
+                    self.depth = 1
+                    self.current = [ch]
+                continue
+            self.current.append(ch)
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch in "{[":
+                self.depth += 1
+            elif ch in "}]":
+                self.depth -= 1
+                if self.depth == 0 and self._accept("".join(self.current)):
+                    return True
+        return False
+
+    def _accept(self, text: str) -> bool:
+        try:
+            obj = json.loads(text)
+        except json.JSONDecodeError:
+            return False
+        if not isinstance(obj, dict):
+            return False
+        if any(key not in obj for key in self.required_keys):
+            return False
+        self.obj = obj
+        return True
@@ -1,4 +1,8 @@
+from functools import cached_property
 from typing import Any
+from typing import Dict
+from typing import Mapping
+from typing import Optional
 from typing import Sequence
 
 
@@ -16,25 +20,98 @@ def datetimeformat_filter(value, format="%Y-%m-%d %H:%M:%S"):
         return str(value)
 
 
-def find_obj_by_id(obj_list: Sequence[Any], id: str):
+def get_field(obj: Any, name: str, default: Any = None) -> Any:
     """
-    Find an object in a list by its ID.
+    Read a field from a model or a dict.
     """
+    if isinstance(obj, Mapping):
+        return obj.get(name, default)
+    return getattr(obj, name, default)
+
+
+def index_by_id(obj_list: Optional[Sequence[Any]], key: str = "id") -> Dict[Any, Any]:
+    """
+    Map objects in a list by their ID, or another field.
+    """
+    index = {}
+    for obj in obj_list or []:
+        value = get_field(obj, key)
+        if value is not None:
+            index.setdefault(value, obj)
+    return index
+
+
+def find_obj_by_id(obj_list: Sequence[Any] | Mapping[Any, Any], id: str):
+    """
+    Find an object in a list by its ID, or in an index from `index_by_id`.
+    """
+    if isinstance(obj_list, Mapping):
+        return obj_list.get(id)
     for obj in obj_list:
         if getattr(obj, "id", None) == id:
             return obj
     return None
 
 
-def get_attr_by_id(obj_list: Sequence[Any], id: str, attr: str):
+def get_attr_by_id(obj_list: Sequence[Any] | Mapping[Any, Any], id: str, attr: str):
     """
-    Get an attribute from an object in a list by its ID.
+    Get an attribute from an object in a list by its ID, or in an index
+    from `index_by_id`.
     """
     if not obj_list:
         return None
+    if isinstance(obj_list, Mapping):
+        obj = obj_list.get(id)
+        return None if obj is None else get_field(obj, attr)
     for obj in obj_list:
         if isinstance(obj, dict) and "id" in obj and obj["id"] == id:
             return obj.get(attr, None)
         elif getattr(obj, "id", None) == id:
             return getattr(obj, attr, None)
     return None
+
+
+class TemplateIndex:
+    """
+    ID lookups over the contest in a template context, available to
+    templates as `index`. Each map is built on first use.
+
+    - participants: contest participants by ID
+    - players: players in the latest round by ID
+    - features: features in the latest round by ID, or name if they have none
+    - round_players: players by ID, for each round by round_no
+    """
+
+    def __init__(self, data: Mapping[str, Any]):
+        self.contest = data.get("contest")
+
+    @cached_property
+    def rounds(self) -> Sequence[Any]:
+        return get_field(self.contest, "rounds") or []
+
+    @cached_property
+    def participants(self) -> Dict[Any, Any]:
+        return index_by_id(get_field(self.contest, "participants"))
+
+    @cached_property
+    def players(self) -> Dict[Any, Any]:
+        if not self.rounds:
+            return {}
+        return index_by_id(get_field(self.rounds[-1], "players"))
+
+    @cached_property
+    def features(self) -> Dict[Any, Any]:
+        if not self.rounds:
+            return {}
+        index = {}
+        for feature in get_field(self.rounds[-1], "features") or []:
+            key = get_field(feature, "id") or get_field(feature, "name")
+            index.setdefault(key, feature)
+        return index
+
+    @cached_property
+    def round_players(self) -> Dict[Any, Dict[Any, Any]]:
+        return {
+            get_field(r, "round_no"): index_by_id(get_field(r, "players"))
+            for r in self.rounds
+        }
@@ -1,10 +1,68 @@
+"""
+Extraction of JSON and text from agent responses.
+
+Everything goes through `parse_response`, which does a strict json.loads first
+and only then scans the text once for fenced or embedded JSON, with a fixed
+number of repair attempts per candidate.
+"""
+
 import json
+import re
 import uuid
+from enum import Enum
+from typing import Any
+from typing import Iterator
+from typing import Optional
 
 from llm.utils import extract_fenced_code_block
+from pydantic import BaseModel
+from pydantic import Field
+
+from agentarena.models.constants import JobResponseState
 
 BAD_PAYLOAD_DIR = "etc/payloads"
 
+# Bounds on the work done per payload
+MAX_ENVELOPES = 4
+MAX_CANDIDATES = 8
+
+# a backslash which doesn't start a valid JSON escape, e.g. \' from python reprs
+INVALID_ESCAPE = re.compile(r"\\(?![\"\\/bfnrtu])")
+
+
+class ResponseKind(str, Enum):
+    """
+    What we expect to find in a response.
+    """
+
+    OBJECT = "object"
+    LIST = "list"
+    TEXT = "text"
+
+
+class ParsedResponse(BaseModel):
+    """
+    The result of parsing a job response.
+    """
+
+    kind: ResponseKind = Field(description="What was asked for")
+    data: Any = Field(
+        default=None, description="The extracted value, None if nothing was found"
+    )
+    state: Optional[str] = Field(default=None, description="Job response state")
+    job_id: Optional[str] = Field(default=None, description="Job ID")
+    message: Optional[str] = Field(default=None, description="Job response message")
+    envelope: bool = Field(
+        default=False, description="Whether the raw payload was valid JSON"
+    )
+    repaired: bool = Field(
+        default=False, description="Whether the data needed extraction or repair"
+    )
+
+    @property
+    def ok(self) -> bool:
+        return self.data is not None
+
 
 def write_bad_payload(payload: str):
     """
@@ -16,76 +74,197 @@ def write_bad_payload(payload: str):
     return fname
 
 
-def extract_text_response(job_data: str):
+def json_candidates(text: str, openers: str) -> Iterator[str]:
     """
-    Extract the text response from a Message's data.
+    Yields balanced JSON-looking segments starting with one of `openers`, in
+    a single forward pass. Brackets inside strings are ignored.
     """
-    try:
-        rv = json.loads(job_data)
-        if "data" in rv and isinstance(rv["data"], str):
-            try:
-                rv = json.loads(rv["data"])
-            except json.JSONDecodeError:
-                pass
-        if "data" in rv:
-            rv = rv["data"]
-        return rv
-    except json.JSONDecodeError as e:
-        fname = write_bad_payload(job_data)
-        raise ValueError(f"Failed to parse job data, written to {fname}")
+    i = 0
+    n = len(text)
+    found = 0
+    while i < n and found < MAX_CANDIDATES:
+        start = min(
+            (ix for ix in (text.find(o, i) for o in openers) if ix != -1), default=-1
+        )
+        if start == -1:
+            return
+        depth = 0
+        in_string = False
+        escape = False
+        end = -1
+        for j in range(start, n):
+            ch = text[j]
+            if in_string:
+                if escape:
+                    escape = False
+                elif ch == "\\":
+                    escape = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                in_string = True
+            elif ch in "{[":
+                depth += 1
+            elif ch in "}]":
+                depth -= 1
+                if depth == 0:
+                    end = j
+                    break
+        if end == -1:
+            return
+        found += 1
+        yield text[start : end + 1]
+        i = end + 1
 
 
-def extract_obj_from_json(raw: str):
+def loads_lenient(candidate: str) -> Any:
     """
-    returns the json object if possible, extracting from fence if needed
+    json.loads, then with literal "\\n" and invalid escapes repaired, then with
+    the candidate treated as an escaped JSON string. Raises ValueError if none work.
     """
-    obj = raw
-    work = None
-    if isinstance(raw, str):
-        work = raw.replace("```json", "```")
+    try:
+        return json.loads(candidate, strict=False)
+    except json.JSONDecodeError:
+        pass
+    repaired = INVALID_ESCAPE.sub("", candidate.replace("\\n", "\n"))
+    try:
+        return json.loads(repaired, strict=False)
+    except json.JSONDecodeError:
+        pass
+    if '\\"' in candidate:
         try:
-            obj = json.loads(work)
+            return json.loads(json.loads(f'"{candidate}"'), strict=False)
         except json.JSONDecodeError:
-            obj = work
+            pass
+    raise ValueError("not JSON")
 
-    if isinstance(obj, str):
-        try:
-            obj = json.loads(f'"{obj}"')
-        except json.JSONDecodeError:
-            obj = work
 
-    while isinstance(obj, dict) and "data" in obj:
-        data = obj.get("data", None)
+def matches_kind(value: Any, kind: ResponseKind) -> bool:
+    if kind == ResponseKind.OBJECT:
+        return isinstance(value, dict)
+    if kind == ResponseKind.LIST:
+        return isinstance(value, list)
+    return True
+
+
+def search_json(text: str, kind: ResponseKind) -> Any:
+    """
+    Find the first embedded JSON value of the wanted kind, preferring the
+    first fenced code block if there is one. Returns None if nothing is found.
+    """
+    source = text
+    if "```" in text:
+        source = extract_fenced_code_block(text) or text
+    openers = "[" if kind == ResponseKind.LIST else "{"
+    for _ in range(2):
+        for candidate in json_candidates(source, openers):
+            try:
+                value = loads_lenient(candidate)
+            except ValueError:
+                continue
+            if matches_kind(value, kind):
+                return value
+        if '\\"' not in source:
+            break
+        # the whole thing is an escaped JSON string, decode once and rescan
         try:
-            obj = json.loads(data)
+            source = json.loads(f'"{source}"')
         except json.JSONDecodeError:
-            obj = data
             break
+    return None
 
-    if isinstance(obj, str) and "\\n" in obj:
-        while "\\n" in obj:
-            obj = obj.replace("\\n", "\n")
-        obj = obj.replace("\\", "")
-        return extract_obj_from_json(obj)
 
-    if isinstance(obj, str):
-        if obj.find("```") != -1:
-            obj = extract_fenced_code_block(obj)
+def coerce(value: Any, kind: ResponseKind) -> Any:
+    if kind == ResponseKind.OBJECT:
+        return value if isinstance(value, dict) else None
+    if kind == ResponseKind.LIST:
+        if isinstance(value, list):
+            return value
+        if isinstance(value, dict):
+            # structured output wraps lists in an object, e.g. {"features": [...]}
+            lists = [v for v in value.values() if isinstance(v, list)]
+            if len(lists) == 1:
+                return lists[0]
+        return None
+    return value
 
-    if obj and isinstance(obj, str):
-        try:
-            obj = json.loads(obj)
-        except json.JSONDecodeError:
-            pass
 
-    if isinstance(obj, dict):
-        return obj
+def parse_response(
+    raw: str | bytes | dict | list | None,
+    kind: ResponseKind = ResponseKind.OBJECT,
+    save_failures: bool = True,
+) -> ParsedResponse:
+    """
+    Extract the wanted kind of value from a job response.
 
-    if obj is None:
-        fname = write_bad_payload(raw)
-        raise ValueError(f"Failed to parse object, written to {fname}")
+    Handles the JobResponse envelope and nested "data" envelopes, JSON encoded
+    as a string, fenced code blocks, JSON embedded in prose, and escaped
+    strings. The work done is bounded by MAX_ENVELOPES and MAX_CANDIDATES.
+    Failures to find an object or list are written to etc/payloads.
+    """
+    parsed = ParsedResponse(kind=kind)
+    value: Any = raw.decode("utf-8") if isinstance(raw, bytes) else raw
+    if not isinstance(value, str):
+        parsed.envelope = True
 
-    return None
+    for depth in range(MAX_ENVELOPES):
+        if isinstance(value, str):
+            text = value.strip()
+            if not text:
+                value = ""
+                break
+            try:
+                decoded = json.loads(text)
+            except json.JSONDecodeError:
+                if kind == ResponseKind.TEXT:
+                    break
+                parsed.repaired = True
+                value = search_json(text, kind)
+            else:
+                parsed.envelope = parsed.envelope or depth == 0
+                value = decoded
+                if isinstance(value, str):
+                    # JSON encoded as a JSON string
+                    continue
+        if isinstance(value, dict) and "data" in value:
+            if parsed.state is None and "state" in value:
+                parsed.state = value.get("state")
+                parsed.job_id = value.get("job_id")
+                parsed.message = value.get("message")
+            value = value["data"]
+            continue
+        break
+
+    parsed.data = coerce(value, kind)
+    # a FAIL envelope has no data by design, so there is nothing to debug
+    if (
+        save_failures
+        and parsed.data is None
+        and kind != ResponseKind.TEXT
+        and parsed.state != JobResponseState.FAIL.value
+        and isinstance(raw, (str, bytes))
+        and raw
+    ):
+        write_bad_payload(raw if isinstance(raw, str) else raw.decode("utf-8"))
+    return parsed
+
+
+def extract_text_response(job_data: str):
+    """
+    Extract the text response from a Message's data.
+    """
+    parsed = parse_response(job_data, ResponseKind.TEXT)
+    if not parsed.envelope:
+        fname = write_bad_payload(job_data)
+        raise ValueError(f"Failed to parse job data, written to {fname}")
+    return parsed.data
+
+
+def extract_obj_from_json(raw: str):
+    """
+    returns the json object if possible, extracting from fence if needed
+    """
+    return parse_response(raw, ResponseKind.OBJECT).data
 
 
 def parse_list(raw, log=None):
@@ -93,69 +272,13 @@ def parse_list(raw, log=None):
     Parse a list from a possibly nested or string-encoded structure.
     Handles cases where the features are nested under 'data', are JSON strings, or are fenced code blocks.
     """
-    work = raw
-    while True:
-        # Unwrap 'data' if present
-        if isinstance(work, dict) and "data" in work:
-            work = work["data"]
-            continue
-        # If it's a string, try to parse it
-        if isinstance(work, str):
-            s = work.strip().replace("[...]", "")
-            if not s:
-                return []
-            if not s.startswith("["):
-                # We'll look for the first occurrence of '[' and the last occurrence of ']' and try to parse that substring
-                start = s.find("[")
-                end = s.rfind("]")
-                if start != -1 and end != -1 and end > start:
-                    json_str = s[start : end + 1]
-                    try:
-                        work = json.loads(json_str)
-                        continue
-                    except Exception as e:
-                        fname = write_bad_payload(s)
-                        if log:
-                            log.error(
-                                f"Failed to parse list from substring, written to {fname}",
-                                error=e,
-                            )
-                        raise ValueError(
-                            f"Failed to parse list from substring, written to {fname}"
-                        )
-                        return []
-                # If not found, try fenced code block
-                if s.find("```") != -1:
-                    work = extract_obj_from_json(s)
-                    continue
-                # Otherwise, try to parse as JSON
-                try:
-                    work = json.loads(s)
-                    continue
-                except json.JSONDecodeError as e:
-                    fname = write_bad_payload(s)
-                    if log:
-                        log.error(
-                            f"Failed to parse list as JSON, written to {fname}", error=e
-                        )
-                    raise ValueError(
-                        f"Failed to parse list as JSON, written to {fname}"
-                    )
-                    return []
-            else:
-                try:
-                    work = json.loads(s)
-                    continue
-                except json.JSONDecodeError as e:
-                    fname = write_bad_payload(s)
-                    if log:
-                        log.error(
-                            f"Failed to parse list as JSON, written to {fname}",
-                            error=e,
-                        )
-                    raise ValueError(
-                        f"Failed to parse list as JSON, written to {fname}"
-                    )
-                    return []
-        break
-    return work
+    if isinstance(raw, str) and not raw.strip().replace("[...]", ""):
+        return []
+    parsed = parse_response(raw, ResponseKind.LIST, save_failures=False)
+    if parsed.data is None:
+        text = raw if isinstance(raw, str) else json.dumps(raw)
+        fname = write_bad_payload(text)
+        if log:
+            log.error(f"Failed to parse list as JSON, written to {fname}")
+        raise ValueError(f"Failed to parse list as JSON, written to {fname}")
+    return parsed.data
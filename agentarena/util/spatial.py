@@ -0,0 +1,215 @@
+"""
+Spatial lookups over the arena grid.
+
+Positions are "x,y" strings throughout the models. A `Board` parses them once
+into cells of a grid sized from the arena, with occupancy and feature layers,
+so validating a position or finding everything near a cell doesn't re-parse
+strings or scan every feature and player.
+"""
+
+import math
+from array import array
+from typing import Dict
+from typing import Generic
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+def parse_position(position: Optional[str]) -> Optional[Tuple[float, float]]:
+    """
+    Parse an "x,y" position, returning None if it isn't one.
+    """
+    if not position:
+        return None
+    parts = position.split(",")
+    if len(parts) != 2:
+        return None
+    try:
+        return float(parts[0]), float(parts[1])
+    except ValueError:
+        return None
+
+
+def format_position(x: int, y: int) -> str:
+    return f"{x},{y}"
+
+
+class Board(Generic[T]):
+    """
+    The arena grid, with the players and features placed on it.
+
+    Coordinates run from 0 to width and 0 to height inclusive, so the board
+    has (width + 1) x (height + 1) cells. Arenas only require a positive
+    width and height, and the prompts give the grid as "width x height"
+    without saying whether it starts at 0 or 1, so positions on either
+    edge are on the board. Cells are stored in flat row-major layers:
+    `occupancy` and `feature_layer` count the players and features in each
+    cell, and the ids in a cell are kept by cell number. Features are keyed
+    by any hashable `T`, players by id.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.cols = width + 1
+        self.rows = height + 1
+        self.occupancy = array("I", [0]) * (self.cols * self.rows)
+        self.feature_layer = array("I", [0]) * (self.cols * self.rows)
+        self.players: Dict[int, List[str]] = {}
+        self.features: Dict[int, List[T]] = {}
+        self.player_cells: Dict[str, int] = {}
+        # items without a valid position, which can't be placed on the board
+        self.unplaced_players: List[str] = []
+        self.unplaced_features: List[T] = []
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.cols and 0 <= y < self.rows
+
+    def cell(self, position: Optional[str]) -> Optional[int]:
+        """
+        The cell number for a position, or None if it is invalid or off the
+        board. Fractional coordinates are floored.
+        """
+        xy = parse_position(position)
+        if xy is None:
+            return None
+        x, y = math.floor(xy[0]), math.floor(xy[1])
+        if not self.in_bounds(x, y):
+            return None
+        return y * self.cols + x
+
+    def coords(self, cell: int) -> Tuple[int, int]:
+        return cell % self.cols, cell // self.cols
+
+    def is_valid(self, position: Optional[str]) -> bool:
+        return self.cell(position) is not None
+
+    def clamp(self, position: Optional[str]) -> Optional[str]:
+        """
+        The position moved onto the board, or None if it isn't a position.
+        """
+        xy = parse_position(position)
+        if xy is None:
+            return None
+        x = min(max(math.floor(xy[0]), 0), self.width)
+        y = min(max(math.floor(xy[1]), 0), self.height)
+        return format_position(x, y)
+
+    def place_player(self, player_id: str, position: Optional[str]) -> bool:
+        """
+        Put a player on the board, moving them if already placed. Returns
+        False if the position is invalid or off the board.
+        """
+        self.remove_player(player_id)
+        cell = self.cell(position)
+        if cell is None:
+            self.unplaced_players.append(player_id)
+            return False
+        self.players.setdefault(cell, []).append(player_id)
+        self.player_cells[player_id] = cell
+        self.occupancy[cell] += 1
+        return True
+
+    def remove_player(self, player_id: str):
+        if player_id in self.unplaced_players:
+            self.unplaced_players.remove(player_id)
+        cell = self.player_cells.pop(player_id, None)
+        if cell is not None:
+            self.players[cell].remove(player_id)
+            self.occupancy[cell] -= 1
+
+    def place_feature(self, key: T, position: Optional[str]) -> bool:
+        """
+        Put a feature on the board. Returns False if the position is invalid
+        or off the board.
+        """
+        cell = self.cell(position)
+        if cell is None:
+            self.unplaced_features.append(key)
+            return False
+        self.features.setdefault(cell, []).append(key)
+        self.feature_layer[cell] += 1
+        return True
+
+    def player_position(self, player_id: str) -> Optional[Tuple[int, int]]:
+        cell = self.player_cells.get(player_id)
+        return None if cell is None else self.coords(cell)
+
+    def players_at(self, position: Optional[str]) -> List[str]:
+        cell = self.cell(position)
+        return [] if cell is None else self.players.get(cell, [])
+
+    def features_at(self, position: Optional[str]) -> List[T]:
+        cell = self.cell(position)
+        return [] if cell is None else self.features.get(cell, [])
+
+    def is_free(self, position: Optional[str]) -> bool:
+        """
+        Whether the position is on the board and no player is there.
+        """
+        cell = self.cell(position)
+        return cell is not None and not self.occupancy[cell]
+
+    def cells_within(self, x: float, y: float, radius: float) -> Iterable[int]:
+        """
+        The cells at most `radius` from (x, y), row by row.
+        """
+        y0 = max(math.ceil(y - radius), 0)
+        y1 = min(math.floor(y + radius), self.rows - 1)
+        for cy in range(y0, y1 + 1):
+            span = math.sqrt(max(radius * radius - (cy - y) ** 2, 0))
+            x0 = max(math.ceil(x - span), 0)
+            x1 = min(math.floor(x + span), self.cols - 1)
+            row = cy * self.cols
+            for cx in range(x0, x1 + 1):
+                yield row + cx
+
+    def features_within(self, x: float, y: float, radius: float) -> List[T]:
+        found: List[T] = []
+        for cell in self.cells_within(x, y, radius):
+            if self.feature_layer[cell]:
+                found.extend(self.features[cell])
+        return found
+
+    def players_within(self, x: float, y: float, radius: float) -> List[str]:
+        found: List[str] = []
+        for cell in self.cells_within(x, y, radius):
+            if self.occupancy[cell]:
+                found.extend(self.players[cell])
+        return found
+
+    def nearest_free(self, position: Optional[str]) -> Optional[str]:
+        """
+        The free cell nearest to a position, by rings of increasing distance,
+        or None if the board is full or the position isn't one.
+        """
+        start = self.clamp(position)
+        if start is None:
+            return None
+        x, y = (int(v) for v in start.split(","))
+        for radius in range(max(self.cols, self.rows)):
+            ring = [
+                (cx, cy)
+                for cy in range(y - radius, y + radius + 1)
+                for cx in range(x - radius, x + radius + 1)
+                if max(abs(cx - x), abs(cy - y)) == radius and self.in_bounds(cx, cy)
+            ]
+            ring.sort(key=lambda c: (c[0] - x) ** 2 + (c[1] - y) ** 2)
+            for cx, cy in ring:
+                if not self.occupancy[cy * self.cols + cx]:
+                    return format_position(cx, cy)
+        return None
+
+    def distance(self, a: Optional[str], b: Optional[str]) -> Optional[float]:
+        """
+        Euclidean distance between two positions, in cells.
+        """
+        pa, pb = parse_position(a), parse_position(b)
+        if pa is None or pb is None:
+            return None
+        return math.hypot(pa[0] - pb[0], pa[1] - pb[1])
@@ -0,0 +1,54 @@
+"""
+Lint checks for the Jinja templates.
+
+The only check so far flags linear scans inside loops: `find_obj_by_id` or
+`get_attr_by_id` applied to a list within a `{% for %}` block, which makes a
+render quadratic. Look the object up in `index` instead, or build a map with
+the `index_by_id` filter before the loop.
+"""
+
+from typing import List
+
+from jinja2 import Environment
+from jinja2 import nodes
+
+SCAN_FILTERS = {"find_obj_by_id", "get_attr_by_id"}
+
+
+def is_indexed(node: nodes.Node) -> bool:
+    """
+    Whether the filtered value is a map, from `index` or `index_by_id`.
+    """
+    while isinstance(node, (nodes.Getattr, nodes.Getitem)):
+        node = node.node
+    if isinstance(node, nodes.Name):
+        return node.name == "index"
+    return isinstance(node, nodes.Filter) and node.name == "index_by_id"
+
+
+def scans_in_loops(source: str, env: Environment) -> List[int]:
+    """
+    Line numbers of scanning filter calls inside loops.
+    """
+    lines = []
+    for loop in env.parse(source).find_all(nodes.For):
+        for body in loop.body:
+            for node in body.find_all(nodes.Filter):
+                if node.name in SCAN_FILTERS and not is_indexed(node.node):
+                    lines.append(node.lineno)
+    return sorted(set(lines))
+
+
+def lint_templates(env: Environment) -> List[str]:
+    """
+    Lint every template the environment can load, returning the problems found.
+    """
+    problems = []
+    assert env.loader is not None
+    for name in env.list_templates():
+        source, _, _ = env.loader.get_source(env, name)
+        for line in scans_in_loops(source, env):
+            problems.append(
+                f"{name}:{line}: linear scan in a loop, look it up in `index`"
+            )
+    return problems
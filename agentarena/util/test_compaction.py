@@ -0,0 +1,99 @@
+from agentarena.models.constants import ContestRoundState
+from agentarena.models.public import ArenaPublic
+from agentarena.models.public import ContestPublic
+from agentarena.models.public import ContestRoundPublic
+from agentarena.models.public import PlayerActionPublic
+from agentarena.models.public import PlayerPublic
+from agentarena.util.compaction import compact_contest
+from agentarena.util.compaction import rolling_summary
+from agentarena.util.compaction import summary_through
+
+
+def make_round(round_no: int, summary: str = "") -> ContestRoundPublic:
+    player = PlayerPublic(
+        id="p1",
+        name="Alice",
+        position="1,1",
+        score=round_no,
+        action=PlayerActionPublic(
+            participant_id="p1",
+            action=f"move {round_no}",
+            narration="",
+            memories="",
+            target="",
+        ),
+    )
+    return ContestRoundPublic(
+        round_no=round_no,
+        narrative=f"Things happened in round {round_no}",
+        players=[player],
+        state=ContestRoundState.COMPLETE,
+        summary=summary,
+    )
+
+
+def make_contest(rounds) -> ContestPublic:
+    arena = ArenaPublic(
+        id="arena1",
+        name="Arena",
+        description="",
+        height=10,
+        width=10,
+        rules="",
+        winning_condition="",
+    )
+    return ContestPublic(
+        id="contest1",
+        arena=arena,
+        auto_advance=True,
+        start_time=0,
+        end_time=0,
+        rounds=rounds,
+    )
+
+
+def test_rolling_summary_appends_and_clips():
+    first = rolling_summary("", make_round(0))
+    assert first.startswith("Round 0: Things happened in round 0")
+    assert "- Alice at 1,1, score 0, move 0" in first
+
+    second = rolling_summary(first, make_round(1), narrative="A new dawn")
+    assert second.startswith(first)
+    assert "Round 1: A new dawn" in second
+
+    clipped = rolling_summary(second, make_round(2), max_chars=50)
+    assert len(clipped) == 50
+    assert clipped.startswith("...")
+
+
+def test_summary_through_builds_missing_summaries():
+    rounds = [make_round(0), make_round(1)]
+    assert summary_through(rounds) == rolling_summary(
+        rolling_summary("", rounds[0]), rounds[1]
+    )
+    rounds.append(make_round(2, summary="stored"))
+    assert summary_through(rounds) == "stored"
+    assert summary_through([]) == ""
+
+
+def test_short_contest_is_unchanged():
+    contest = make_contest([make_round(0), make_round(1)])
+    assert compact_contest(contest, keep_rounds=3, budget_tokens=10000) is contest
+
+
+def test_long_contest_keeps_recent_rounds():
+    rounds = [make_round(i, summary=f"through {i}") for i in range(10)]
+    contest = make_contest(rounds)
+
+    compacted = compact_contest(contest, keep_rounds=3, budget_tokens=10000)
+    assert [r.round_no for r in compacted.rounds] == [7, 8, 9]
+    assert compacted.summary == "through 6"
+    assert len(contest.rounds) == 10
+
+
+def test_tight_budget_keeps_latest_round():
+    rounds = [make_round(i, summary=f"through {i}") for i in range(5)]
+    compacted = compact_contest(make_contest(rounds), keep_rounds=3, budget_tokens=10)
+
+    assert [r.round_no for r in compacted.rounds] == [4]
+    assert compacted.summary == ""
@@ -0,0 +1,35 @@
+from agentarena.util.incremental_json import JsonObjectScanner
+
+
+def feed_all(scanner, chunks):
+    for i, chunk in enumerate(chunks):
+        if scanner.feed(chunk):
+            return i
+    return None
+
+
+def test_object_across_chunks():
+    scanner = JsonObjectScanner(["action"])
+    chunks = ['Sure! ```json\n{"act', 'ion": "move", "tar', 'get": "north"}', "\n```"]
+    assert feed_all(scanner, chunks) == 2
+    assert scanner.obj == {"action": "move", "target": "north"}
+
+
+def test_braces_in_strings_and_nesting():
+    scanner = JsonObjectScanner(["result"])
+    text = '{"result": "a {weird} \\"quoted\\" }", "extra": {"list": [1, {"x": 2}]}}'
+    assert scanner.feed(text)
+    assert scanner.obj["extra"] == {"list": [1, {"x": 2}]}
+
+
+def test_skips_objects_without_required_keys():
+    scanner = JsonObjectScanner(["action"])
+    assert not scanner.feed('{"thinking": "hmm"} and then ')
+    assert scanner.feed('{"action": "wait"} trailing prose')
+    assert scanner.obj == {"action": "wait"}
+
+
+def test_incomplete_object():
+    scanner = JsonObjectScanner()
+    assert not scanner.feed('{"action": "wait"')
+    assert not scanner.complete
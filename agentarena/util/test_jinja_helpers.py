@@ -3,8 +3,11 @@ import datetime
 from pydantic import BaseModel
 from pydantic import Field
 
+from agentarena.util.jinja_helpers import TemplateIndex
 from agentarena.util.jinja_helpers import datetimeformat_filter
 from agentarena.util.jinja_helpers import find_obj_by_id
+from agentarena.util.jinja_helpers import get_attr_by_id
+from agentarena.util.jinja_helpers import index_by_id
 
 
 class DummyModel(BaseModel):
@@ -59,3 +62,33 @@ def test_find_obj_by_id_not_found():
 def test_find_obj_by_id_empty_list():
     result = find_obj_by_id([], "a")
     assert result is None
+
+
+def test_find_obj_by_id_index():
+    objs = [DummyModel("a"), DummyModel("b")]
+    index = index_by_id(objs)
+    assert find_obj_by_id(index, "b") is objs[1]
+    assert get_attr_by_id(index, "a", "test") == "test"
+    assert get_attr_by_id(index, "z", "test") is None
+
+
+def test_template_index():
+    data = {
+        "contest": {
+            "participants": [{"id": "p1", "name": "one"}],
+            "rounds": [
+                {"round_no": 0, "players": [{"id": "p1", "memories": "old"}]},
+                {
+                    "round_no": 1,
+                    "players": [{"id": "p1", "memories": "new"}],
+                    "features": [{"name": "tree"}],
+                },
+            ],
+        }
+    }
+    index = TemplateIndex(data)
+    assert index.participants["p1"]["name"] == "one"
+    assert index.players["p1"]["memories"] == "new"
+    assert index.round_players[0]["p1"]["memories"] == "old"
+    assert "tree" in index.features
+    assert TemplateIndex({}).players == {}
@@ -1,6 +1,11 @@
 import json
 
+import pytest
+
 from agentarena.util import response_parsers
+from agentarena.util.files import find_file_upwards
+from agentarena.util.response_parsers import ResponseKind
+from agentarena.util.response_parsers import parse_response
 
 # Dummy extract_fenced_code_block for test context if needed
 # from llm.utils import extract_fenced_code_block
@@ -175,3 +180,61 @@ def test_extract_list_from_json_string():
             "position": "3,2",
         },
     ]
+
+
+def test_extract_obj_from_envelope():
+    envelope = json.dumps(
+        {"state": "complete", "job_id": "j1", "data": json.dumps({"action": "wait"})}
+    )
+    assert response_parsers.extract_obj_from_json(envelope) == {"action": "wait"}
+
+
+def test_parse_list_from_envelope():
+    envelope = json.dumps({"data": json.dumps([{"name": "rock"}])})
+    assert response_parsers.parse_list(envelope) == [{"name": "rock"}]
+
+
+def test_fail_envelope_not_saved(monkeypatch):
+    saved = []
+    monkeypatch.setattr(response_parsers, "write_bad_payload", saved.append)
+    parse_response(json.dumps({"data": None, "state": "fail", "message": "boom"}))
+    assert saved == []
+    parse_response(json.dumps({"data": None, "state": "complete"}))
+    assert len(saved) == 1
+
+
+def test_parse_response_envelope_fields():
+    raw = json.dumps({"data": None, "job_id": "j1", "message": "boom", "state": "fail"})
+    parsed = parse_response(raw, save_failures=False)
+    assert not parsed.ok
+    assert parsed.state == "fail"
+    assert parsed.job_id == "j1"
+    assert parsed.message == "boom"
+
+
+def test_parse_response_prose_around_object():
+    raw = json.dumps({"data": 'I think {"action": "wait", "note": "}"} is best. {}'})
+    parsed = parse_response(raw)
+    assert parsed.data == {"action": "wait", "note": "}"}
+    assert parsed.repaired
+
+
+def test_json_candidates_bounded():
+    text = "[x] " * 100
+    assert len(list(response_parsers.json_candidates(text, "["))) == (
+        response_parsers.MAX_CANDIDATES
+    )
+
+
+CORPUS = find_file_upwards("etc/parser_corpus.json")
+
+
+@pytest.mark.skipif(CORPUS is None, reason="no parser corpus")
+def test_parser_corpus():
+    with open(CORPUS, "r") as f:
+        cases = json.load(f)
+    for case in cases:
+        parsed = parse_response(
+            case["raw"], ResponseKind(case["kind"]), save_failures=False
+        )
+        assert parsed.data == case["expected"], case["name"]
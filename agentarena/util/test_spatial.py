@@ -0,0 +1,66 @@
+from agentarena.util.spatial import Board
+from agentarena.util.spatial import parse_position
+
+
+def test_parse_position():
+    assert parse_position("3,4") == (3.0, 4.0)
+    assert parse_position(" 3 , 4 ") == (3.0, 4.0)
+    for bad in [None, "", "3", "a,b", "1,2,3"]:
+        assert parse_position(bad) is None
+
+
+def test_board_bounds():
+    board: Board[str] = Board(10, 5)
+    assert board.is_valid("0,0")
+    assert board.is_valid("10,5")
+    assert board.is_valid("2.7,3")
+    for bad in ["11,0", "0,6", "-1,2", "x,y", None]:
+        assert not board.is_valid(bad)
+    assert board.clamp("15,-3") == "10,0"
+    assert board.clamp("nowhere") is None
+
+
+def test_board_layers():
+    board: Board[str] = Board(20, 20)
+    for name, position in [
+        ("here", "5,5"),
+        ("near", "7,5"),
+        ("corner", "8,8"),
+        ("far", "20,20"),
+    ]:
+        assert board.place_feature(name, position)
+    assert not board.place_feature("lost", "30,30")
+    assert board.unplaced_features == ["lost"]
+
+    assert set(board.features_within(5, 5, 3)) == {"here", "near"}
+    assert set(board.features_within(5, 5, 5)) == {"here", "near", "corner"}
+    assert board.features_within(20, 20, 0) == ["far"]
+    assert board.features_at("5,5") == ["here"]
+
+
+def test_board_players():
+    board: Board[str] = Board(3, 3)
+    assert board.place_player("p1", "1,1")
+    assert board.players_at("1,1") == ["p1"]
+    assert not board.is_free("1,1")
+    assert board.nearest_free("1,1") in {"0,1", "1,0", "1,2", "2,1"}
+
+    # moving a player frees their old cell
+    board.place_player("p1", "2,2")
+    assert board.is_free("1,1")
+    assert board.player_position("p1") == (2, 2)
+    assert board.players_within(0, 0, 2) == []
+    assert board.players_within(0, 0, 3) == ["p1"]
+    assert board.distance("0,0", "3,4") == 5.0
+
+
+def test_board_crowded_cell():
+    board: Board[str] = Board(1, 1)
+    for n in range(300):
+        board.place_player(f"p{n}", "1,1")
+    assert len(board.players_at("1,1")) == 300
+    for n in range(299):
+        board.remove_player(f"p{n}")
+    assert not board.is_free("1,1")
+    board.remove_player("p299")
+    assert board.is_free("1,1")
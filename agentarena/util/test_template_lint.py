@@ -0,0 +1,29 @@
+from jinja2 import ChoiceLoader
+from jinja2 import PackageLoader
+
+from agentarena.core.services.jinja_renderer import JinjaRenderer
+from agentarena.util.template_lint import lint_templates
+from agentarena.util.template_lint import scans_in_loops
+
+
+def test_scan_in_loop_flagged():
+    env = JinjaRenderer().env
+    source = """{% for r in contest.rounds %}
+{{ r.players | get_attr_by_id(agent.id, "memories") }}
+{{ index.round_players[r.round_no] | get_attr_by_id(agent.id, "memories") }}
+{% endfor %}
+{{ contest.rounds[-1].players | find_obj_by_id(agent.id) }}"""
+    assert scans_in_loops(source, env) == [2]
+
+
+def test_templates_have_no_scans_in_loops():
+    renderer = JinjaRenderer()
+    renderer.set_loader(
+        ChoiceLoader(
+            [
+                PackageLoader("agentarena.core", "templates"),
+                PackageLoader("agentarena.actors", "templates"),
+            ]
+        )
+    )
+    assert lint_templates(renderer.env) == []
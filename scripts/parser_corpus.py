@@ -0,0 +1,126 @@
+"""
+Build and benchmark the response parser corpus.
+
+The corpus lives in etc/parser_corpus.json. `build` adds payloads the arena
+failed to parse (etc/payloads) and error.json as unreviewed cases, with the
+current parser output as the expected value. `bench` checks every case and
+reports parser throughput.
+"""
+
+import json
+import os
+import sys
+import time
+from glob import glob
+from typing import Any
+from typing import Dict
+from typing import List
+
+import typer
+
+# the project root, so agentarena imports without being installed
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agentarena.util.files import find_directory_of_file  # noqa: E402
+from agentarena.util.response_parsers import ResponseKind  # noqa: E402
+from agentarena.util.response_parsers import parse_response  # noqa: E402
+
+project_root = find_directory_of_file("agent-arena-config.yaml")
+os.chdir(str(project_root))
+
+CORPUS_FILE = "etc/parser_corpus.json"
+
+app = typer.Typer(help="Response parser corpus and benchmark")
+
+
+def read_corpus() -> List[Dict[str, Any]]:
+    if not os.path.exists(CORPUS_FILE):
+        return []
+    with open(CORPUS_FILE, "r") as f:
+        return json.load(f)
+
+
+def write_corpus(cases: List[Dict[str, Any]]):
+    with open(CORPUS_FILE, "w") as f:
+        json.dump(cases, f, indent=2)
+        f.write("\n")
+
+
+def guess_case(name: str, raw: str) -> Dict[str, Any]:
+    """
+    Make an unreviewed case, using the first kind the parser can extract.
+    """
+    for kind in [ResponseKind.OBJECT, ResponseKind.LIST]:
+        parsed = parse_response(raw, kind, save_failures=False)
+        if parsed.ok:
+            return {
+                "name": name,
+                "kind": kind.value,
+                "raw": raw,
+                "expected": parsed.data,
+                "reviewed": False,
+            }
+    parsed = parse_response(raw, ResponseKind.TEXT, save_failures=False)
+    return {
+        "name": name,
+        "kind": "text",
+        "raw": raw,
+        "expected": parsed.data,
+        "reviewed": False,
+    }
+
+
+@app.command()
+def build():
+    """Add new payloads from etc/payloads and error.json to the corpus."""
+    cases = read_corpus()
+    seen = {case["raw"] for case in cases}
+    sources = sorted(glob("etc/payloads/*.json"))
+    if os.path.exists("error.json"):
+        sources.append("error.json")
+    added = 0
+    for source in sources:
+        with open(source, "r") as f:
+            raw = f.read()
+        if raw in seen:
+            continue
+        cases.append(guess_case(os.path.basename(source), raw))
+        seen.add(raw)
+        added += 1
+    write_corpus(cases)
+    typer.echo(f"Added {added} cases, corpus has {len(cases)}")
+
+
+@app.command()
+def bench(rounds: int = typer.Option(200, help="Times to parse each case")):
+    """Check the corpus and report parser throughput."""
+    cases = read_corpus()
+    failures = 0
+    for case in cases:
+        parsed = parse_response(
+            case["raw"], ResponseKind(case["kind"]), save_failures=False
+        )
+        if parsed.data != case["expected"]:
+            failures += 1
+            typer.echo(f"MISMATCH {case['name']}", err=True)
+
+    start = time.perf_counter()
+    total_bytes = 0
+    for _ in range(rounds):
+        for case in cases:
+            parse_response(case["raw"], ResponseKind(case["kind"]), save_failures=False)
+            total_bytes += len(case["raw"])
+    elapsed = time.perf_counter() - start
+    parses = rounds * len(cases)
+    typer.echo(f"{len(cases)} cases, {failures} mismatches")
+    if parses:
+        typer.echo(
+            f"{parses / elapsed:.0f} parses/s, {total_bytes / elapsed / 1e6:.2f} MB/s, "
+            f"{elapsed / parses * 1e6:.1f} us/parse"
+        )
+    if failures:
+        raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":
+    app()
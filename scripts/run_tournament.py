@@ -0,0 +1,83 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+from typing import List
+from typing import Optional
+
+import typer
+import yaml
+
+# the project root, so agentarena imports without being installed
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agentarena.tournament.models import ContestResult  # noqa: E402
+from agentarena.tournament.models import TournamentSpec  # noqa: E402
+from agentarena.tournament.runner import TournamentRunner  # noqa: E402
+from agentarena.tournament.runner import format_standings  # noqa: E402
+from agentarena.util.files import find_directory_of_file  # noqa: E402
+from agentarena.util.files import find_file_upwards  # noqa: E402
+
+project_root = find_directory_of_file("agent-arena-config.yaml")
+
+os.chdir(str(project_root))
+app = typer.Typer(help="Run a tournament against a running arena")
+
+
+def read_config():
+    yamlfile = find_file_upwards("agent-arena-config.yaml")
+    assert yamlfile, "Where is my config file?"
+    with open(yamlfile, "r") as f:
+        yaml_data = yaml.safe_load(f)
+    return yaml_data
+
+
+def print_stage(stage: int, results: List[ContestResult]):
+    typer.echo(f"Stage {stage}: {len(results)} contests")
+    for r in results:
+        players = " vs ".join(r.pairing.player_ids)
+        outcome = r.winner_id or r.error or "no winner"
+        typer.echo(f"  {r.contest_id} {players}: {r.state.value}, {outcome}")
+
+
+@app.command()
+def run(
+    spec_file: Path = typer.Argument(..., help="Tournament spec, YAML"),
+    concurrency: Optional[int] = typer.Option(None, help="Contests at once"),
+    output: Optional[Path] = typer.Option(None, help="Write the report JSON here"),
+):
+    """
+    Play every contest of a tournament, and print the standings.
+
+    The spec lists the players, the staff for every contest, and the arenas:
+
+        name: weekly
+        format: swiss   # round_robin, swiss or bracket
+        rounds: 3
+        arenas: [<arena id>]
+        players: [<player participant ids, in seed order>]
+        staff: [<judge id>, <announcer id>, <arena participant id>]
+        player_positions: ["1,1", "9,9"]
+    """
+    config = read_config()
+    with open(spec_file, "r") as f:
+        spec = TournamentSpec.model_validate(yaml.safe_load(f))
+    tournament = dict(config.get("tournament") or {})
+    if concurrency:
+        tournament["concurrency"] = concurrency
+
+    runner = TournamentRunner(config["arena"], tournament, on_stage=print_stage)
+    try:
+        report = asyncio.run(runner.run(spec))
+    except ValueError as e:
+        typer.echo(f"Invalid tournament: {e}", err=True)
+        raise typer.Exit(code=1)
+
+    typer.echo(format_standings(report))
+    if output:
+        output.write_text(report.model_dump_json(indent=2))
+        typer.echo(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    app()